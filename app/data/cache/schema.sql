@@ -16,7 +16,7 @@ CREATE TABLE IF NOT EXISTS jira_issues (
     resolved_at DATETIME,
     labels TEXT,  -- JSON array as text
     components TEXT,  -- JSON array as text
-    raw_data TEXT,  -- Full JSON response
+    raw_data BLOB,  -- Full JSON response, zstd-compressed
     collected_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     last_synced_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -26,6 +26,8 @@ CREATE INDEX IF NOT EXISTS idx_jira_updated_at ON jira_issues(updated_at);
 CREATE INDEX IF NOT EXISTS idx_jira_status ON jira_issues(status);
 CREATE INDEX IF NOT EXISTS idx_jira_collected_at ON jira_issues(collected_at);
 CREATE INDEX IF NOT EXISTS idx_jira_assignee ON jira_issues(assignee);
+CREATE INDEX IF NOT EXISTS idx_jira_status_updated ON jira_issues(status, updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jira_last_synced ON jira_issues(last_synced_at DESC);
 
 -- Jira Comments Table
 CREATE TABLE IF NOT EXISTS jira_comments (
@@ -78,6 +80,7 @@ CREATE TABLE IF NOT EXISTS confluence_pages (
     url TEXT,
     parent_id TEXT,
     raw_data TEXT,          -- Full JSON response
+    flags INTEGER NOT NULL DEFAULT 0,  -- PAGE_HAS_* bits (content/labels/author)
     collected_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     last_synced_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -86,6 +89,8 @@ CREATE INDEX IF NOT EXISTS idx_confluence_space_key ON confluence_pages(space_ke
 CREATE INDEX IF NOT EXISTS idx_confluence_updated_at ON confluence_pages(updated_at);
 CREATE INDEX IF NOT EXISTS idx_confluence_collected_at ON confluence_pages(collected_at);
 CREATE INDEX IF NOT EXISTS idx_confluence_title ON confluence_pages(title);
+CREATE INDEX IF NOT EXISTS idx_confluence_space_updated ON confluence_pages(space_key, updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_confluence_last_synced ON confluence_pages(last_synced_at);
 
 -- Confluence Spaces Table
 CREATE TABLE IF NOT EXISTS confluence_spaces (
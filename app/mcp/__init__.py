@@ -14,6 +14,7 @@ from .types import (
     JiraIssue,
     ConfluencePage,
     SearchResult,
+    SearchResultRow,
 )
 
 __all__ = [
@@ -27,4 +28,5 @@ __all__ = [
     "JiraIssue",
     "ConfluencePage",
     "SearchResult",
+    "SearchResultRow",
 ]
@@ -3,39 +3,157 @@ Confluence Data Collector
 
 Confluence pages collection from MCP Server to SQLite cache
 """
-import json
 import logging
+import multiprocessing
+import queue
 import sqlite3
 import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from operator import attrgetter
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
+import orjson
 from tqdm import tqdm
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 
 from .mcp_client import MCPClient
-from .types import ConfluencePage
+from ..utils.config import get_config
+from .types import ConfluencePage, PAGE_HAS_CONTENT, PAGE_HAS_LABELS, PAGE_HAS_AUTHOR
 
 logger = logging.getLogger(__name__)
 
+# Page size for new cache files; larger pages suit the HTML page bodies
+_PAGE_SIZE = 32768
+
+# Accepted CACHE_SQLITE_SYNCHRONOUS values
+_SYNCHRONOUS_MODES = frozenset({"OFF", "NORMAL", "FULL", "EXTRA"})
+
+_INSERT_PAGE_SQL = """
+    INSERT OR REPLACE INTO confluence_pages (
+        page_id, space_key, title, body_storage, body_view, body_cleaned,
+        version, creator, last_modifier, created_at, updated_at,
+        labels, url, raw_data, flags, last_synced_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+# Columns returned by get_cached_pages (skips the raw_data/body_view payloads)
+_CACHED_PAGE_COLUMNS = (
+    "page_id, space_key, title, body_storage, body_cleaned, version, "
+    "creator, last_modifier, created_at, updated_at, labels, url, flags, "
+    "collected_at, last_synced_at"
+)
+
+_WS_RE = re.compile(r'\s+')
+
+# Below this many pages, process pool startup costs more than it saves
+_PARALLEL_CLEAN_MIN_PAGES = 200
+
+# Cleaning workers are never fork()ed: saves run alongside a producer thread
+# while the caller holds SQLite, tqdm and logging locks a child could inherit
+_POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Page IDs per "IN (...)" lookup, safely under SQLite's parameter limit
+_ID_LOOKUP_CHUNK = 500
+
+# Prepared row batches buffered between the cleaning thread and the writer
+_ROW_QUEUE_MAX_BATCHES = 8
+
+# get_page_content memo: entries kept and how long they stay fresh (seconds)
+_PAGE_MEMO_MAX_ENTRIES = 1000
+_PAGE_MEMO_TTL = 300
+
+
+def _clean_html(html_content: str) -> str:
+    """Extract normalized text from HTML (module-level so it can be pickled)"""
+    if not html_content:
+        return ""
+
+    # Plain-text bodies (no tags or entities) need no parsing
+    if '<' not in html_content and '&' not in html_content:
+        return _WS_RE.sub(' ', html_content).strip()
+
+    try:
+        # Confluence storage format is a fragment, so wrap it in a parent
+        tree = lxml_html.fragment_fromstring(html_content, create_parent='div')
+
+        # Remove script/style tags and comments
+        etree.strip_elements(tree, etree.Comment, 'script', 'style', with_tail=False)
+
+        # Get text content
+        text = ' '.join(tree.itertext())
+
+        # Clean up whitespace
+        return _WS_RE.sub(' ', text).strip()
+
+    except Exception as e:
+        logger.error(f"Failed to clean HTML: {e}")
+        return html_content
+
+
+def _cleaning_pool() -> ProcessPoolExecutor:
+    """Process pool for HTML cleaning (workers start lazily, on first use)"""
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context(_POOL_START_METHOD))
+
+
+def _is_memory_db(db_path: str) -> bool:
+    """True for ":memory:" and in-memory URIs (file:name?mode=memory&cache=shared)"""
+    return db_path == ":memory:" or (db_path.startswith("file:") and "mode=memory" in db_path)
+
+
+def _synchronous_mode() -> str:
+    """PRAGMA synchronous value for the cache (CACHE_SQLITE_SYNCHRONOUS)"""
+    mode = get_config().CACHE_SQLITE_SYNCHRONOUS.upper()
+    if mode not in _SYNCHRONOUS_MODES:
+        logger.warning(f"Invalid CACHE_SQLITE_SYNCHRONOUS={mode!r}, using NORMAL")
+        return "NORMAL"
+    return mode
+
 
 class ConfluenceCollector:
     """Confluence data collector using MCP Client"""
 
-    def __init__(self, mcp_client: MCPClient, db_path: str = "app/data/cache/confluence_cache.db"):
+    def __init__(
+        self,
+        mcp_client: Optional[MCPClient] = None,
+        db_path: str = "app/data/cache/confluence_cache.db",
+        store_raw: bool = False
+    ):
         """
         Initialize Confluence Collector
 
         Args:
-            mcp_client: MCPClient instance
-            db_path: SQLite database path
+            mcp_client: MCPClient instance, or None for cache-only use
+                (e.g. saving pages fetched by ConfluenceDirectClient)
+            db_path: SQLite database path, ":memory:" or a "file:" URI
+            store_raw: Also store the full page JSON in raw_data
         """
         self.mcp_client = mcp_client
         self.db_path = db_path
         self.batch_size = 50
+        self.store_raw = store_raw
+
+        # One long-lived connection; the lock serializes its transactions
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        # Closes the connection if the collector is collected (or at exit) unclosed
+        self._finalizer: Optional[weakref.finalize] = None
+
+        # Recently fetched pages: page_id -> (expires_at, page), least recent first
+        self._page_memo: "OrderedDict[str, Tuple[float, ConfluencePage]]" = OrderedDict()
+        self._page_memo_lock = threading.Lock()
 
         # Ensure database directory exists
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        if not _is_memory_db(db_path):
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
         # Initialize database
         self._init_database()
@@ -47,7 +165,8 @@ class ConfluenceCollector:
         schema_path = Path(__file__).parent.parent / "data" / "cache" / "schema.sql"
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock:
+                conn = self._connect()
                 if schema_path.exists():
                     with open(schema_path, 'r', encoding='utf-8') as f:
                         schema_sql = f.read()
@@ -57,10 +176,87 @@ class ConfluenceCollector:
                     logger.warning(f"Schema file not found: {schema_path}")
                     self._create_basic_schema(conn)
 
+                self._migrate_flags(conn)
+
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    def _migrate_flags(self, conn: sqlite3.Connection):
+        """Add and backfill the flags column on caches created by older versions"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(confluence_pages)")}
+        if "flags" in columns:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("ALTER TABLE confluence_pages ADD COLUMN flags INTEGER NOT NULL DEFAULT 0")
+            conn.execute(f"""
+                UPDATE confluence_pages SET flags =
+                    (CASE WHEN COALESCE(body_storage, '') != '' THEN {PAGE_HAS_CONTENT} ELSE 0 END)
+                  | (CASE WHEN COALESCE(labels, '[]') != '[]' THEN {PAGE_HAS_LABELS} ELSE 0 END)
+                  | (CASE WHEN COALESCE(creator, '') != '' THEN {PAGE_HAS_AUTHOR} ELSE 0 END)
+            """)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        logger.info("Added flags column to confluence_pages")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return the cache connection, opening and tuning it on first use
+
+        Callers hold self._lock while they use the connection and do not use
+        it as a context manager (Connection.__exit__ would COMMIT whatever
+        transaction is open on it).
+        """
+        with self._lock:
+            if self._conn is None:
+                synchronous = _synchronous_mode()
+
+                # Autocommit mode: transactions are opened explicitly with BEGIN
+                conn = sqlite3.connect(
+                    self.db_path,
+                    isolation_level=None,
+                    check_same_thread=False,
+                    uri=self.db_path.startswith("file:")
+                )
+                # page_size only takes effect on a new file, so it must come first
+                conn.executescript(f"""
+                    PRAGMA page_size={_PAGE_SIZE};
+                    PRAGMA journal_mode=WAL;
+                    PRAGMA synchronous={synchronous};
+                    PRAGMA temp_store=MEMORY;
+                    PRAGMA mmap_size=1073741824;
+                    PRAGMA cache_size=-65536;
+                    PRAGMA busy_timeout=5000;
+                """)
+                self._conn = conn
+                self._finalizer = weakref.finalize(self, conn.close)
+            return self._conn
+
+    def _client(self) -> MCPClient:
+        """Return the MCP client, failing clearly for cache-only collectors"""
+        if self.mcp_client is None:
+            raise RuntimeError("ConfluenceCollector was created without an MCP client")
+        return self.mcp_client
+
+    def close(self):
+        """Close the cache connection"""
+        with self._lock:
+            if self._conn is not None:
+                # Runs conn.close() once and detaches the finalizer
+                self._finalizer()
+                self._conn = None
+
+    def __enter__(self) -> "ConfluenceCollector":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def _create_basic_schema(self, conn: sqlite3.Connection):
         """Create basic schema if schema.sql is not found"""
         conn.execute("""
@@ -79,11 +275,15 @@ class ConfluenceCollector:
                 labels TEXT,
                 url TEXT,
                 raw_data TEXT,
+                flags INTEGER NOT NULL DEFAULT 0,
                 collected_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                 last_synced_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
         conn.execute("CREATE INDEX IF NOT EXISTS idx_confluence_space_key ON confluence_pages(space_key)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_confluence_updated_at ON confluence_pages(updated_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_confluence_space_updated ON confluence_pages(space_key, updated_at DESC)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_confluence_last_synced ON confluence_pages(last_synced_at)")
         logger.info("Basic Confluence schema created")
 
     def list_spaces(self) -> List[Dict[str, Any]]:
@@ -97,24 +297,32 @@ class ConfluenceCollector:
 
         try:
             # Call MCP tool to list spaces
-            response = self.mcp_client.call_tool("confluence_list_spaces", {})
+            response = self._client().call_tool("confluence_list_spaces", {})
 
             if response.isError:
                 logger.error(f"Failed to list spaces: {response.content}")
                 return []
 
-            # Parse response
+            # Parse response; text chunks are usually one JSON document
+            texts = [item["text"] for item in response.content if item.get("type") == "text"]
+            documents = []
+            if texts:
+                try:
+                    documents.append(orjson.loads("".join(texts)))
+                except orjson.JSONDecodeError:
+                    # Chunks are separate documents; parse them one by one
+                    for text in texts:
+                        try:
+                            documents.append(orjson.loads(text))
+                        except Exception as e:
+                            logger.warning(f"Failed to parse space data: {e}")
+
             spaces = []
-            for item in response.content:
-                if item.get("type") == "text":
-                    try:
-                        data = json.loads(item["text"])
-                        if isinstance(data, list):
-                            spaces.extend(data)
-                        elif isinstance(data, dict):
-                            spaces.append(data)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse space data: {e}")
+            for data in documents:
+                if isinstance(data, list):
+                    spaces.extend(data)
+                elif isinstance(data, dict):
+                    spaces.append(data)
 
             logger.info(f"Found {len(spaces)} spaces")
 
@@ -131,20 +339,30 @@ class ConfluenceCollector:
     def _save_spaces_to_cache(self, spaces: List[Dict[str, Any]]):
         """Save spaces to cache"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for space in spaces:
-                    conn.execute("""
+            rows = [
+                (
+                    space.get('key'),
+                    space.get('name'),
+                    space.get('type'),
+                    space.get('description'),
+                    space.get('homepageId')
+                )
+                for space in spaces
+            ]
+
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany("""
                         INSERT OR REPLACE INTO confluence_spaces
                         (space_key, space_name, space_type, description, homepage_id)
                         VALUES (?, ?, ?, ?, ?)
-                    """, (
-                        space.get('key'),
-                        space.get('name'),
-                        space.get('type'),
-                        space.get('description'),
-                        space.get('homepageId')
-                    ))
-                conn.commit()
+                    """, rows)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
                 logger.info(f"Saved {len(spaces)} spaces to cache")
 
         except Exception as e:
@@ -171,7 +389,7 @@ class ConfluenceCollector:
             # Build search query
             query = f"space = {space_key}" if space_key else "type = page"
 
-            pages = self.mcp_client.search_confluence_pages(
+            pages = self._client().search_confluence_pages(
                 query=query,
                 space=space_key,
                 max_results=limit
@@ -185,21 +403,63 @@ class ConfluenceCollector:
             logger.error(f"Failed to list pages: {e}")
             return []
 
+    def list_pages_by_space(
+        self,
+        space_keys: List[str],
+        limit: int = 100,
+        max_workers: int = 8
+    ) -> List[Tuple[str, List[ConfluencePage]]]:
+        """
+        List pages from several spaces concurrently
+
+        Args:
+            space_keys: Space keys to list
+            limit: Maximum pages per space
+            max_workers: Spaces requested from the MCP server at once
+
+        Returns:
+            (space_key, pages) pairs in the order of space_keys
+        """
+        workers = max(1, min(max_workers, len(space_keys)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda space_key: self.list_pages(space_key=space_key, limit=limit),
+                space_keys
+            )
+            return list(zip(space_keys, results))
+
     def get_page_content(self, page_id: str) -> Optional[ConfluencePage]:
         """
         Get detailed content for a specific page
 
+        Pages are remembered for _PAGE_MEMO_TTL seconds, so repeated lookups
+        of the same page skip the MCP round-trip.
+
         Args:
             page_id: Page ID
 
         Returns:
             ConfluencePage object or None
         """
+        now = time.monotonic()
+        with self._page_memo_lock:
+            entry = self._page_memo.get(page_id)
+            if entry is not None:
+                if entry[0] > now:
+                    self._page_memo.move_to_end(page_id)
+                    return entry[1]
+                del self._page_memo[page_id]
+
         try:
-            page = self.mcp_client.get_confluence_page(page_id)
+            page = self._client().get_confluence_page(page_id)
 
             if page:
                 logger.info(f"Retrieved page: {page_id}")
+                with self._page_memo_lock:
+                    self._page_memo[page_id] = (now + _PAGE_MEMO_TTL, page)
+                    self._page_memo.move_to_end(page_id)
+                    if len(self._page_memo) > _PAGE_MEMO_MAX_ENTRIES:
+                        self._page_memo.popitem(last=False)
 
             return page
 
@@ -207,6 +467,19 @@ class ConfluenceCollector:
             logger.error(f"Failed to get page {page_id}: {e}")
             return None
 
+    def invalidate_page(self, page_id: Optional[str] = None):
+        """
+        Forget remembered get_page_content results
+
+        Args:
+            page_id: Page to forget (None = all pages)
+        """
+        with self._page_memo_lock:
+            if page_id is None:
+                self._page_memo.clear()
+            else:
+                self._page_memo.pop(page_id, None)
+
     def collect_pages(
         self,
         space_keys: Optional[List[str]] = None,
@@ -233,11 +506,8 @@ class ConfluenceCollector:
                 space_keys = [s.get('key') for s in spaces if s.get('key')]
                 logger.info(f"Collecting from {len(space_keys)} spaces")
 
-            # Collect pages from each space
-            for space_key in space_keys:
-                logger.info(f"Collecting pages from space: {space_key}")
-
-                pages = self.list_pages(space_key=space_key, limit=max_pages)
+            # Collect pages from the spaces concurrently
+            for space_key, pages in self.list_pages_by_space(space_keys, limit=max_pages):
                 all_pages.extend(pages)
 
                 logger.info(f"Collected {len(pages)} pages from {space_key}")
@@ -253,71 +523,261 @@ class ConfluenceCollector:
             logger.error(f"Failed to collect pages: {e}")
             return all_pages
 
-    def save_to_cache(self, pages: List[ConfluencePage]) -> int:
+    def iter_pages(
+        self,
+        space_keys: Optional[List[str]] = None,
+        limit: int = 100
+    ) -> Iterator[ConfluencePage]:
+        """
+        Yield pages space by space, fetching each space only when needed
+
+        Args:
+            space_keys: Space keys to list (None = all spaces)
+            limit: Maximum pages per space
+
+        Yields:
+            ConfluencePage objects
+        """
+        if not space_keys:
+            space_keys = [s.get('key') for s in self.list_spaces() if s.get('key')]
+
+        for space_key in space_keys:
+            yield from self.list_pages(space_key=space_key, limit=limit)
+
+    def stream_pages(
+        self,
+        space_keys: Optional[List[str]] = None,
+        max_pages: int = 1000,
+        chunk_size: int = 500
+    ) -> int:
+        """
+        Collect Confluence pages straight into the cache without keeping them
+
+        Unlike collect_pages, at most one space's listing plus one chunk of
+        pages is held in memory; spaces are fetched one after another.
+
+        Args:
+            space_keys: Space keys to collect from (None = all spaces)
+            max_pages: Maximum pages per space
+            chunk_size: Pages written per save_to_cache transaction
+
+        Returns:
+            Number of pages saved
+        """
+        logger.info(f"Streaming Confluence pages (max={max_pages} per space)")
+
+        pages = self.iter_pages(space_keys, limit=max_pages)
+        saved_count = 0
+
+        try:
+            # One cleaning pool for the whole stream instead of one per chunk
+            with _cleaning_pool() as executor:
+                while True:
+                    chunk = list(islice(pages, chunk_size))
+                    if not chunk:
+                        break
+                    saved_count += self._save_pages(chunk, executor=executor)
+
+            logger.info(f"Saved {saved_count} pages to cache")
+            return saved_count
+
+        except Exception as e:
+            logger.error(f"Failed to stream pages: {e}")
+            raise
+
+    def save_to_cache(
+        self,
+        pages: List[ConfluencePage],
+        skip_unchanged: bool = False,
+        bulk: bool = False
+    ) -> int:
         """
         Save pages to SQLite cache with batch processing
 
         Args:
             pages: List of ConfluencePage objects
+            skip_unchanged: Skip pages whose cached version is already current
+            bulk: Drop the secondary indexes for the load and rebuild them
+                once afterwards (for initial / full crawls)
 
         Returns:
             Number of pages saved
         """
+        if len(pages) < _PARALLEL_CLEAN_MIN_PAGES:
+            return self._save_pages(pages, skip_unchanged, bulk)
+
+        # The pool is created here, on the calling thread, and shared by the
+        # whole save rather than set up by the producer thread
+        with _cleaning_pool() as executor:
+            return self._save_pages(pages, skip_unchanged, bulk, executor)
+
+    def _save_pages(
+        self,
+        pages: List[ConfluencePage],
+        skip_unchanged: bool = False,
+        bulk: bool = False,
+        executor: Optional[ProcessPoolExecutor] = None
+    ) -> int:
+        """save_to_cache body; executor (if any) cleans large batches of HTML"""
+        if skip_unchanged and pages:
+            pages = self._filter_unchanged(pages)
+
         if not pages:
             return 0
 
+        # Insert in primary-key order so the page_id index is appended to;
+        # the sort is stable, so the last copy of a duplicated page still wins
+        pages = sorted(pages, key=attrgetter("id"))
+
         saved_count = 0
         total_batches = (len(pages) + self.batch_size - 1) // self.batch_size
 
         logger.info(f"Saving {len(pages)} pages in {total_batches} batches")
 
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Process in batches with progress bar
-                for i in tqdm(range(0, len(pages), self.batch_size),
-                             desc="Saving pages",
-                             total=total_batches):
-                    batch = pages[i:i + self.batch_size]
-
-                    for page in batch:
-                        try:
-                            self._save_single_page(conn, page)
-                            saved_count += 1
-                        except Exception as e:
-                            logger.error(f"Failed to save page {page.id}: {e}")
-                            # Continue processing
+        # HTML cleaning runs on a producer thread so it overlaps the inserts
+        rows_queue: queue.Queue = queue.Queue(maxsize=_ROW_QUEUE_MAX_BATCHES)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce_page_rows,
+            args=(pages, rows_queue, stop, executor),
+            name="confluence-page-rows",
+            daemon=True
+        )
+        producer.start()
 
-                conn.commit()
+        try:
+            with self._lock:
+                conn = self._connect()
+                # One write transaction for the whole crawl; IMMEDIATE takes the
+                # write lock up front instead of upgrading mid-save
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # Indexes are rebuilt once, in the same transaction, so a failed
+                    # load rolls back to the original indexes too
+                    index_sql = self._drop_page_indexes(conn) if bulk else []
+
+                    # Write batches as they arrive, with progress bar
+                    with tqdm(total=total_batches, desc="Saving pages") as progress:
+                        while True:
+                            rows = rows_queue.get()
+                            if rows is None:
+                                break
+                            if isinstance(rows, Exception):
+                                raise rows
+
+                            conn.executemany(_INSERT_PAGE_SQL, rows)
+                            saved_count += len(rows)
+                            progress.update(1)
+
+                    for sql in index_sql:
+                        conn.execute(sql)
+
+                    conn.execute("COMMIT")
+                except Exception:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+
+                # Refresh planner statistics after the bulk write
+                conn.execute("PRAGMA optimize")
 
         except Exception as e:
             logger.error(f"Database error during save: {e}")
             raise
 
+        finally:
+            # Unblock the producer if the writer stopped early
+            stop.set()
+            while producer.is_alive():
+                try:
+                    rows_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
         return saved_count
 
-    def _save_single_page(self, conn: sqlite3.Connection, page: ConfluencePage):
-        """Save a single page to database with HTML cleanup"""
-        # Clean HTML content
-        body_cleaned = None
-        if page.content:
-            body_cleaned = self.clean_html(page.content)
+    def _drop_page_indexes(self, conn: sqlite3.Connection) -> List[str]:
+        """Drop the secondary confluence_pages indexes and return their CREATE statements"""
+        indexes = conn.execute("""
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND tbl_name = 'confluence_pages' AND sql IS NOT NULL
+        """).fetchall()
+
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+
+        return [sql for _, sql in indexes]
+
+    def _filter_unchanged(self, pages: List[ConfluencePage]) -> List[ConfluencePage]:
+        """Drop pages whose version is not newer than the cached copy"""
+        cached_versions = {}
+        page_ids = [page.id for page in pages]
+
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(page_ids), _ID_LOOKUP_CHUNK):
+                chunk = page_ids[i:i + _ID_LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"SELECT page_id, version FROM confluence_pages WHERE page_id IN ({placeholders})",
+                    chunk
+                )
+                cached_versions.update(cursor.fetchall())
+
+        changed = [
+            page for page in pages
+            if page.version is None
+            or cached_versions.get(page.id) is None
+            or page.version > cached_versions[page.id]
+        ]
+
+        skipped = len(pages) - len(changed)
+        if skipped:
+            logger.info(f"Skipping {skipped} unchanged pages")
+
+        return changed
+
+    def _produce_page_rows(
+        self,
+        pages: List[ConfluencePage],
+        rows_queue: queue.Queue,
+        stop: threading.Event,
+        executor: Optional[ProcessPoolExecutor] = None
+    ):
+        """Clean pages and queue their insert rows in batch_size chunks"""
+        try:
+            batch = []
+            for page, body_cleaned in zip(pages, self._iter_cleaned_bodies(pages, executor)):
+                batch.append(self._page_to_row(page, body_cleaned))
+
+                if len(batch) >= self.batch_size:
+                    if stop.is_set():
+                        return
+                    rows_queue.put(batch)
+                    batch = []
+
+            if batch and not stop.is_set():
+                rows_queue.put(batch)
 
+        except Exception as e:
+            rows_queue.put(e)
+
+        finally:
+            rows_queue.put(None)
+
+    def _page_to_row(self, page: ConfluencePage, body_cleaned: Optional[str]) -> tuple:
+        """Build the confluence_pages insert parameters for a page"""
         # Convert lists to JSON
-        labels_json = json.dumps(page.labels) if page.labels else "[]"
-        raw_data_json = page.model_dump_json()
+        labels_json = orjson.dumps(page.labels).decode() if page.labels else "[]"
+        # Every field already has a typed column, so raw JSON is opt-in
+        raw_data_json = orjson.dumps(page.model_dump()).decode() if self.store_raw else None
 
-        conn.execute("""
-            INSERT OR REPLACE INTO confluence_pages (
-                page_id, space_key, title, body_storage, body_view, body_cleaned,
-                version, creator, last_modifier, created_at, updated_at,
-                labels, url, raw_data, last_synced_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (
+        return (
             page.id,
             page.space,
             page.title,
             page.content,  # Original HTML (body_storage)
-            page.content,  # View HTML (same as storage for now)
+            None,  # View HTML (not rendered; body_storage holds the source)
             body_cleaned,  # Cleaned text
             page.version,
             page.author,
@@ -327,11 +787,13 @@ class ConfluenceCollector:
             labels_json,
             None,  # url - will be constructed from base URL
             raw_data_json,
-        ))
+            page.flags,
+        )
 
-    def clean_html(self, html_content: str) -> str:
+    @staticmethod
+    def clean_html(html_content: str) -> str:
         """
-        Clean HTML content using BeautifulSoup4
+        Clean HTML content using lxml
 
         Args:
             html_content: Raw HTML string
@@ -339,44 +801,39 @@ class ConfluenceCollector:
         Returns:
             Cleaned text content
         """
-        if not html_content:
-            return ""
+        return _clean_html(html_content)
 
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # Remove script tags
-            for script in soup.find_all('script'):
-                script.decompose()
-
-            # Remove style tags
-            for style in soup.find_all('style'):
-                style.decompose()
-
-            # Remove comments
-            for comment in soup.find_all(string=lambda text: isinstance(text, str) and text.strip().startswith('<!--')):
-                comment.extract()
+    def _iter_cleaned_bodies(
+        self,
+        pages: List[ConfluencePage],
+        executor: Optional[ProcessPoolExecutor] = None
+    ) -> Iterator[Optional[str]]:
+        """
+        Clean HTML bodies for a list of pages, in order
 
-            # Remove unnecessary attributes (keep only essential ones)
-            for tag in soup.find_all(True):
-                # Keep only class, id, href for essential navigation
-                allowed_attrs = ['class', 'id', 'href']
-                attrs_to_remove = [attr for attr in tag.attrs if attr not in allowed_attrs]
-                for attr in attrs_to_remove:
-                    del tag[attr]
+        Large batches are fanned out to the caller's process pool since
+        cleaning is CPU-bound and independent per page.
 
-            # Get text content
-            text = soup.get_text(separator=' ', strip=True)
+        Args:
+            pages: List of ConfluencePage objects
+            executor: Process pool from _cleaning_pool(), or None for serial
 
-            # Clean up whitespace
-            text = re.sub(r'\s+', ' ', text)
-            text = text.strip()
+        Yields:
+            Cleaned text per page (None for pages without content)
+        """
+        contents = [page.content for page in pages]
+        done = 0
 
-            return text
+        if executor is not None and len(contents) >= _PARALLEL_CLEAN_MIN_PAGES:
+            try:
+                for text in executor.map(_clean_html, contents, chunksize=32):
+                    yield text if contents[done] else None
+                    done += 1
+            except Exception as e:
+                logger.warning(f"Parallel HTML cleaning failed, falling back to serial: {e}")
 
-        except Exception as e:
-            logger.error(f"Failed to clean HTML: {e}")
-            return html_content
+        for content in contents[done:]:
+            yield self.clean_html(content) if content else None
 
     def incremental_update(self, since_hours: int = 24) -> List[ConfluencePage]:
         """
@@ -394,7 +851,7 @@ class ConfluenceCollector:
             # Build query for recent updates
             query = f"lastmodified >= now('-{since_hours}h')"
 
-            pages = self.mcp_client.search_confluence_pages(
+            pages = self._client().search_confluence_pages(
                 query=query,
                 max_results=1000
             )
@@ -402,7 +859,7 @@ class ConfluenceCollector:
             logger.info(f"Incremental update: found {len(pages)} updated pages")
 
             if pages:
-                self.save_to_cache(pages)
+                self.save_to_cache(pages, skip_unchanged=True)
 
             return pages
 
@@ -413,8 +870,8 @@ class ConfluenceCollector:
     def get_last_sync_time(self) -> Optional[datetime]:
         """Get the last successful sync time from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
+            with self._lock:
+                cursor = self._connect().execute("""
                     SELECT MAX(last_synced_at) FROM confluence_pages
                 """)
                 result = cursor.fetchone()
@@ -426,10 +883,51 @@ class ConfluenceCollector:
 
         return None
 
+    def get_cached_versions(self, space_key: Optional[str] = None) -> Dict[str, int]:
+        """
+        Get the cached version number of each page
+
+        Args:
+            space_key: Filter by space key
+
+        Returns:
+            Mapping of page ID to cached version
+        """
+        query = "SELECT page_id, version FROM confluence_pages"
+        params = []
+
+        if space_key:
+            query += " WHERE space_key = ?"
+            params.append(space_key)
+
+        try:
+            with self._lock:
+                return dict(self._connect().execute(query, params).fetchall())
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve cached versions: {e}")
+            return {}
+
+    def is_cache_empty(self) -> bool:
+        """
+        Check whether no pages are cached yet
+
+        Unlike the other readers, a database error is raised instead of
+        being logged, so a failed read is never mistaken for an empty cache.
+
+        Returns:
+            True if confluence_pages has no rows
+        """
+        with self._lock:
+            return bool(self._connect().execute(
+                "SELECT NOT EXISTS(SELECT 1 FROM confluence_pages)"
+            ).fetchone()[0])
+
     def get_cached_pages(
         self,
         space_key: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        require_flags: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Retrieve cached pages from database
@@ -437,31 +935,92 @@ class ConfluenceCollector:
         Args:
             space_key: Filter by space key
             limit: Maximum results
+            require_flags: PAGE_HAS_* bits every returned page must have
 
         Returns:
             List of page dictionaries
         """
-        query = "SELECT * FROM confluence_pages"
+        return list(self.iter_cached_pages(
+            space_key=space_key,
+            limit=limit,
+            require_flags=require_flags
+        ))
+
+    def iter_cached_pages(
+        self,
+        space_key: Optional[str] = None,
+        limit: int = 100,
+        chunk_size: int = 1000,
+        require_flags: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream cached pages from database in chunks
+
+        Args:
+            space_key: Filter by space key
+            limit: Maximum results
+            chunk_size: Rows fetched from SQLite per round-trip
+            require_flags: PAGE_HAS_* bits every returned page must have
+
+        Yields:
+            Page dictionaries
+        """
+        conditions = []
         params = []
 
         if space_key:
-            query += " WHERE space_key = ?"
+            conditions.append("space_key = ?")
             params.append(space_key)
 
-        query += " ORDER BY updated_at DESC LIMIT ?"
-        params.append(limit)
+        if require_flags:
+            conditions.append("(flags & ?) = ?")
+            params.extend([require_flags, require_flags])
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
-
-                return [dict(row) for row in rows]
+            # Keyset pagination on (updated_at, rowid): each chunk seeks past the
+            # last row returned through the updated_at index, so chunks cost the
+            # same at any depth and writes between chunks cannot shift them.
+            # NULL updated_at sorts last and has no row-value order, so those
+            # pages are read in a second pass keyed on rowid alone.
+            remaining = limit
+            for null_pass in (False, True):
+                last_row = None
+                while remaining > 0:
+                    keyset = ["updated_at IS NULL" if null_pass else "updated_at IS NOT NULL"]
+                    keyset_params = []
+                    if last_row is not None and null_pass:
+                        keyset.append("rowid < ?")
+                        keyset_params = [last_row["_rowid"]]
+                    elif last_row is not None:
+                        keyset.append("(updated_at, rowid) < (?, ?)")
+                        keyset_params = [last_row["updated_at"], last_row["_rowid"]]
+
+                    query = (
+                        f"SELECT {_CACHED_PAGE_COLUMNS}, rowid AS _rowid FROM confluence_pages"
+                        " WHERE " + " AND ".join(conditions + keyset) +
+                        " ORDER BY updated_at DESC, rowid DESC LIMIT ?"
+                    )
+                    size = min(chunk_size, remaining)
+
+                    # Each chunk is its own query under the lock; no cursor stays
+                    # open on the shared connection while the caller consumes rows
+                    with self._lock:
+                        cursor = self._connect().cursor()
+                        cursor.row_factory = sqlite3.Row
+                        rows = cursor.execute(query, [*params, *keyset_params, size]).fetchall()
+
+                    for row in rows:
+                        page = dict(row)
+                        del page["_rowid"]
+                        yield page
+
+                    remaining -= len(rows)
+                    if len(rows) < size:
+                        break
+                    last_row = rows[-1]
 
         except Exception as e:
             logger.error(f"Failed to retrieve cached pages: {e}")
-            return []
 
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get collection statistics"""
@@ -474,39 +1033,36 @@ class ConfluenceCollector:
         }
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Total pages
-                cursor = conn.execute("SELECT COUNT(*) FROM confluence_pages")
-                stats["total_pages"] = cursor.fetchone()[0]
-
-                # Total spaces
-                cursor = conn.execute("SELECT COUNT(DISTINCT space_key) FROM confluence_pages")
-                stats["total_spaces"] = cursor.fetchone()[0]
-
-                # Last sync
-                cursor = conn.execute("SELECT MAX(last_synced_at) FROM confluence_pages")
-                result = cursor.fetchone()
-                if result[0]:
-                    stats["last_sync"] = result[0]
-
-                # Space distribution
-                cursor = conn.execute("""
-                    SELECT space_key, COUNT(*) as count
-                    FROM confluence_pages
-                    GROUP BY space_key
-                    ORDER BY count DESC
-                """)
-                stats["space_distribution"] = {
-                    row[0]: row[1] for row in cursor.fetchall()
-                }
-
-                # Date range
-                cursor = conn.execute("""
-                    SELECT MIN(created_at), MAX(updated_at)
-                    FROM confluence_pages
-                """)
-                oldest, newest = cursor.fetchone()
-                stats["date_range"] = {"oldest": oldest, "newest": newest}
+            with self._lock:
+                conn = self._connect()
+                # One read transaction so every query sees the same snapshot
+                conn.execute("BEGIN")
+                try:
+                    # Scalar aggregates in a single pass
+                    cursor = conn.execute("""
+                        SELECT COUNT(*), COUNT(DISTINCT space_key), MAX(last_synced_at),
+                               MIN(created_at), MAX(updated_at)
+                        FROM confluence_pages
+                    """)
+                    total, spaces, last_sync, oldest, newest = cursor.fetchone()
+                    stats["total_pages"] = total
+                    stats["total_spaces"] = spaces
+                    if last_sync:
+                        stats["last_sync"] = last_sync
+                    stats["date_range"] = {"oldest": oldest, "newest": newest}
+
+                    # Space distribution
+                    cursor = conn.execute("""
+                        SELECT space_key, COUNT(*) as count
+                        FROM confluence_pages
+                        GROUP BY space_key
+                        ORDER BY count DESC
+                    """)
+                    stats["space_distribution"] = {
+                        row[0]: row[1] for row in cursor.fetchall()
+                    }
+                finally:
+                    conn.execute("COMMIT")
 
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
@@ -516,12 +1072,53 @@ class ConfluenceCollector:
     def clear_cache(self):
         """Clear all cached data"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM confluence_pages")
-                conn.execute("DELETE FROM confluence_spaces")
-                conn.commit()
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.executescript("""
+                        BEGIN;
+                        DELETE FROM confluence_pages;
+                        DELETE FROM confluence_spaces;
+                        COMMIT;
+                        ANALYZE;
+                    """)
+                except Exception:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+            self.invalidate_page()
             logger.info("Confluence cache cleared successfully")
 
         except Exception as e:
             logger.error(f"Failed to clear cache: {e}")
             raise
+
+    def vacuum(self, analyze: bool = True):
+        """
+        Rebuild the cache database file to reclaim space
+
+        Caches created with an older page size are migrated to _PAGE_SIZE.
+
+        Args:
+            analyze: Also refresh query planner statistics
+        """
+        try:
+            with self._lock:
+                conn = self._connect()
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+                if page_size != _PAGE_SIZE:
+                    # page_size only changes on VACUUM, and not while in WAL mode
+                    conn.execute("PRAGMA journal_mode=DELETE")
+                    conn.execute(f"PRAGMA page_size={_PAGE_SIZE}")
+                    conn.execute("VACUUM")
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    logger.info(f"Cache page size changed from {page_size} to {_PAGE_SIZE}")
+                else:
+                    conn.execute("VACUUM")
+                if analyze:
+                    conn.execute("ANALYZE")
+            logger.info("Confluence cache vacuumed successfully")
+
+        except Exception as e:
+            logger.error(f"Failed to vacuum cache: {e}")
+            raise
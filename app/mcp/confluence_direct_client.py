@@ -4,15 +4,36 @@ Direct Confluence REST API Client
 This client connects directly to Confluence server without MCP.
 Works with both Confluence Cloud and self-hosted Confluence Server/Data Center.
 """
+import re
 import requests
 import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 from .types import ConfluencePage
 
 logger = logging.getLogger(__name__)
 
+# Date and time part of an ISO 8601 timestamp, without fraction or timezone
+_ISO_DATETIME_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})')
+
+# Page IDs per CQL "id in (...)" search, matching the page window size
+_CQL_ID_BATCH = 50
+
+
+def _dig(data: Any, *keys: str, default: Any = None) -> Any:
+    """Follow nested keys, returning default at the first missing level"""
+    for key in keys:
+        try:
+            data = data[key]
+        except (KeyError, TypeError):
+            return default
+    return data
+
 
 class ConfluenceDirectClient:
     """Direct Confluence REST API client"""
@@ -22,7 +43,8 @@ class ConfluenceDirectClient:
         base_url: str,
         username: str,
         password: str,
-        verify_ssl: bool = True
+        verify_ssl: bool = True,
+        timeout: int = 30
     ):
         """
         Initialize Confluence Direct Client
@@ -32,15 +54,31 @@ class ConfluenceDirectClient:
             username: Confluence username
             password: Confluence password or API token
             verify_ssl: Verify SSL certificates (set False for self-signed certs)
+            timeout: Request timeout in seconds
         """
         self.base_url = base_url.rstrip('/')
         self.username = username
         self.password = password
         self.verify_ssl = verify_ssl
+        self.timeout = timeout
         self.session = requests.Session()
         self.session.auth = HTTPBasicAuth(username, password)
         self.session.verify = verify_ssl
 
+        # Keep-alive pool sized for paginated fetches, with retry on transient errors
+        retry_strategy = Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=retry_strategy,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # For self-hosted Confluence, API is at /rest/api
         # For Cloud, it's at /wiki/rest/api
         if '/wiki' in base_url:
@@ -50,6 +88,40 @@ class ConfluenceDirectClient:
 
         logger.info(f"ConfluenceDirectClient initialized: {self.api_base}")
 
+    def close(self):
+        """Close the HTTP session and release pooled connections"""
+        self.session.close()
+
+    def __enter__(self) -> "ConfluenceDirectClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get(self, path: str, **params) -> Dict[str, Any]:
+        """
+        GET a REST API resource and decode its JSON body
+
+        Args:
+            path: Path relative to the API base (e.g., 'space')
+            **params: Query parameters
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            requests.exceptions.RequestException: On HTTP or network errors
+            orjson.JSONDecodeError: If the body is not JSON
+        """
+        response = self.session.get(
+            f"{self.api_base}/{path}",
+            params=params,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        # Decode raw bytes directly; skips requests' charset detection
+        return orjson.loads(response.content)
+
     def test_connection(self) -> bool:
         """
         Test connection to Confluence server
@@ -58,12 +130,10 @@ class ConfluenceDirectClient:
             True if connection successful, False otherwise
         """
         try:
-            url = f"{self.api_base}/space"
-            response = self.session.get(url, params={'limit': 1})
-            response.raise_for_status()
+            self._get('space', limit=1)
             logger.info("✓ Confluence connection test successful")
             return True
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"✗ Confluence connection test failed: {e}")
             return False
 
@@ -78,15 +148,7 @@ class ConfluenceDirectClient:
             List of space dictionaries
         """
         try:
-            url = f"{self.api_base}/space"
-            params = {
-                'limit': limit,
-                'expand': 'description,homepage'
-            }
-
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get('space', limit=limit, expand='description,homepage')
 
             spaces = data.get('results', [])
             logger.info(f"Found {len(spaces)} spaces")
@@ -115,16 +177,12 @@ class ConfluenceDirectClient:
             List of page dictionaries
         """
         try:
-            url = f"{self.api_base}/space/{space_key}/content/page"
-            params = {
-                'limit': limit,
-                'start': start,
-                'expand': 'version,body.storage,space,history,metadata.labels'
-            }
-
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get(
+                f"space/{space_key}/content/page",
+                limit=limit,
+                start=start,
+                expand='version,body.storage,space,history,metadata.labels'
+            )
 
             pages = data.get('results', [])
             logger.info(f"Retrieved {len(pages)} pages from space {space_key}")
@@ -146,14 +204,10 @@ class ConfluenceDirectClient:
             Page dictionary or None
         """
         try:
-            url = f"{self.api_base}/content/{page_id}"
-            params = {
-                'expand': 'version,body.storage,space,history,metadata.labels,ancestors'
-            }
-
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            page = response.json()
+            page = self._get(
+                f"content/{page_id}",
+                expand='version,body.storage,space,history,metadata.labels,ancestors'
+            )
 
             logger.info(f"Retrieved page {page_id}: {page.get('title', 'N/A')}")
             return page
@@ -185,17 +239,13 @@ class ConfluenceDirectClient:
             - "type=page AND text ~ 'customer support'"
         """
         try:
-            url = f"{self.api_base}/content/search"
-            params = {
-                'cql': cql,
-                'limit': limit,
-                'start': start,
-                'expand': 'version,body.storage,space,history,metadata.labels'
-            }
-
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get(
+                'content/search',
+                cql=cql,
+                limit=limit,
+                start=start,
+                expand='version,body.storage,space,history,metadata.labels'
+            )
 
             pages = data.get('results', [])
             logger.info(f"Search found {len(pages)} pages")
@@ -219,36 +269,30 @@ class ConfluenceDirectClient:
         # Extract basic info
         page_id = page_data.get('id', '')
         title = page_data.get('title', '')
-        space_key = page_data.get('space', {}).get('key', '')
+        space_key = _dig(page_data, 'space', 'key', default='')
 
         # Extract body content
-        body = page_data.get('body', {})
-        storage = body.get('storage', {})
-        content = storage.get('value', '')
+        content = _dig(page_data, 'body', 'storage', 'value', default='')
 
         # Extract version info
-        version_data = page_data.get('version', {})
-        version = version_data.get('number', 1)
+        version = _dig(page_data, 'version', 'number', default=1)
 
         # Extract history/dates
-        history = page_data.get('history', {})
-        created_by = history.get('createdBy', {}).get('displayName', 'Unknown')
+        created_by = _dig(page_data, 'history', 'createdBy', 'displayName', default='Unknown')
 
         # Parse dates
-        created_date_str = history.get('createdDate')
+        created_date_str = _dig(page_data, 'history', 'createdDate')
         created = self._parse_date(created_date_str) if created_date_str else datetime.now()
 
-        version_when = version_data.get('when')
+        version_when = _dig(page_data, 'version', 'when')
         updated = self._parse_date(version_when) if version_when else created
 
         # Extract labels
-        metadata = page_data.get('metadata', {})
-        labels_data = metadata.get('labels', {}).get('results', [])
-        labels = [label.get('name', '') for label in labels_data if label.get('name')]
+        labels_data = _dig(page_data, 'metadata', 'labels', 'results', default=())
+        labels = [label['name'] for label in labels_data if label.get('name')]
 
         # Extract author
-        version_by = version_data.get('by', {})
-        author = version_by.get('displayName', created_by)
+        author = _dig(page_data, 'version', 'by', 'displayName', default=created_by)
 
         return ConfluencePage(
             id=page_id,
@@ -267,10 +311,10 @@ class ConfluenceDirectClient:
         try:
             # Confluence uses ISO 8601 format
             # Example: "2024-10-04T10:30:00.000Z"
-            if 'T' in date_str:
-                # Remove timezone info for simplicity
-                date_str = date_str.split('+')[0].split('Z')[0].split('.')[0]
-                return datetime.fromisoformat(date_str)
+            # Timezone info and fractional seconds are dropped for simplicity
+            match = _ISO_DATETIME_RE.match(date_str)
+            if match:
+                return datetime.fromisoformat(match.group(1))
             else:
                 return datetime.now()
         except Exception as e:
@@ -280,14 +324,19 @@ class ConfluenceDirectClient:
     def get_all_pages_from_space(
         self,
         space_key: str,
-        max_pages: int = 1000
+        max_pages: int = 1000,
+        max_workers: int = 8
     ) -> List[ConfluencePage]:
         """
         Get all pages from a space with pagination
 
+        The first window is fetched alone; if the space has more pages, the
+        following windows are fetched concurrently in waves of max_workers.
+
         Args:
             space_key: Space key
             max_pages: Maximum pages to retrieve
+            max_workers: Concurrent page-window requests per wave
 
         Returns:
             List of ConfluencePage objects
@@ -296,35 +345,147 @@ class ConfluenceDirectClient:
         start = 0
         limit = 50  # Pages per request
 
-        while len(all_pages) < max_pages:
-            pages_data = self.get_space_pages(
-                space_key=space_key,
-                limit=limit,
-                start=start
-            )
+        def fetch(offset: int) -> List[Dict[str, Any]]:
+            return self.get_space_pages(space_key=space_key, limit=limit, start=offset)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while len(all_pages) < max_pages:
+                remaining_windows = (max_pages - len(all_pages) + limit - 1) // limit
+                wave_size = 1 if start == 0 else min(max_workers, remaining_windows)
+                offsets = [start + n * limit for n in range(wave_size)]
+
+                last_window = False
+                for pages_data in executor.map(fetch, offsets):
+                    # Parse pages
+                    for page_data in pages_data:
+                        try:
+                            page = self._parse_page(page_data)
+                            all_pages.append(page)
+
+                            if len(all_pages) >= max_pages:
+                                break
+                        except Exception as e:
+                            logger.error(f"Failed to parse page: {e}")
+
+                    # Check if there are more pages
+                    if len(pages_data) < limit or len(all_pages) >= max_pages:
+                        last_window = True
+                        break
 
-            if not pages_data:
-                break
+                if last_window:
+                    break
 
-            # Parse pages
-            for page_data in pages_data:
-                try:
-                    page = self._parse_page(page_data)
-                    all_pages.append(page)
+                start += wave_size * limit
 
-                    if len(all_pages) >= max_pages:
-                        break
-                except Exception as e:
-                    logger.error(f"Failed to parse page: {e}")
+        logger.info(f"Retrieved total {len(all_pages)} pages from space {space_key}")
+        return all_pages
+
+    def get_space_page_versions(
+        self,
+        space_key: str,
+        max_pages: int = 1000
+    ) -> Dict[str, int]:
+        """
+        List page IDs and version numbers of a space without page bodies
+
+        Args:
+            space_key: Space key
+            max_pages: Maximum pages to list
 
-            # Check if there are more pages
-            if len(pages_data) < limit:
+        Returns:
+            Mapping of page ID to current version
+        """
+        versions: Dict[str, int] = {}
+        start = 0
+        limit = 100
+
+        while len(versions) < max_pages:
+            try:
+                data = self._get(
+                    f"space/{space_key}/content/page",
+                    limit=limit,
+                    start=start,
+                    expand='version'
+                )
+            except Exception as e:
+                logger.error(f"Failed to list page versions in space {space_key}: {e}")
                 break
 
+            results = data.get('results', [])
+            for page_data in results[:max_pages - len(versions)]:
+                versions[page_data.get('id', '')] = _dig(page_data, 'version', 'number', default=1)
+
+            if len(results) < limit:
+                break
             start += limit
 
-        logger.info(f"Retrieved total {len(all_pages)} pages from space {space_key}")
-        return all_pages
+        return versions
+
+    def get_changed_pages_from_space(
+        self,
+        space_key: str,
+        cached_versions: Dict[str, int],
+        max_pages: int = 1000,
+        max_workers: int = 8
+    ) -> List[ConfluencePage]:
+        """
+        Get only the pages of a space that are new or newer than cached
+
+        Versions are listed first without bodies. When most pages changed
+        (or nothing is cached yet), the space is crawled in full windows and
+        filtered by version; otherwise the changed IDs are fetched in CQL
+        "id in (...)" batches.
+
+        Args:
+            space_key: Space key
+            cached_versions: Mapping of page ID to already cached version
+            max_pages: Maximum pages to consider
+            max_workers: Concurrent page requests
+
+        Returns:
+            List of changed ConfluencePage objects
+        """
+        def is_changed(page_id: str, version: int) -> bool:
+            return cached_versions.get(page_id) is None or version > cached_versions[page_id]
+
+        versions = self.get_space_page_versions(space_key, max_pages=max_pages)
+        changed_ids = [
+            page_id for page_id, version in versions.items()
+            if is_changed(page_id, version)
+        ]
+
+        logger.info(
+            f"Space {space_key}: {len(changed_ids)} of {len(versions)} pages changed since last collection"
+        )
+
+        if not changed_ids:
+            return []
+
+        # A full windowed crawl is fewer requests than fetching most pages by ID
+        if not cached_versions or len(changed_ids) > len(versions) // 2:
+            pages = self.get_all_pages_from_space(
+                space_key, max_pages=max_pages, max_workers=max_workers
+            )
+            return [page for page in pages if is_changed(page.id, page.version)]
+
+        batches = [
+            changed_ids[i:i + _CQL_ID_BATCH]
+            for i in range(0, len(changed_ids), _CQL_ID_BATCH)
+        ]
+
+        def fetch(batch: List[str]) -> List[Dict[str, Any]]:
+            return self.search_pages(f"id in ({','.join(batch)})", limit=len(batch))
+
+        pages = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for pages_data in executor.map(fetch, batches):
+                for page_data in pages_data:
+                    try:
+                        pages.append(self._parse_page(page_data))
+                    except Exception as e:
+                        logger.error(f"Failed to parse page: {e}")
+
+        return pages
 
     def get_all_pages(self, max_pages: int = 1000) -> List[ConfluencePage]:
         """
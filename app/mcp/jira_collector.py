@@ -3,37 +3,159 @@ Jira Data Collector
 
 Jira issues and comments collection from MCP Server to SQLite cache
 """
-import json
 import logging
+import queue
 import sqlite3
+import sys
+import threading
+import weakref
+from collections.abc import Sized
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from itertools import chain, islice
+from operator import attrgetter
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
 from pathlib import Path
+import orjson
+import zstandard as zstd
 from tqdm import tqdm
 
 from .mcp_client import MCPClient
+from ..utils.config import get_config
 from .types import JiraIssue
 
 logger = logging.getLogger(__name__)
 
+# Page size for new cache files; larger pages suit the raw_data blobs
+_PAGE_SIZE = 32768
+
+# Accepted CACHE_SQLITE_SYNCHRONOUS values
+_SYNCHRONOUS_MODES = frozenset({"OFF", "NORMAL", "FULL", "EXTRA"})
+
+# Rows whose updated_at is unchanged are left alone, so repeated syncs
+# of the same issues do not rewrite the row or its indexes
+_INSERT_ISSUE_SQL = """
+    INSERT INTO jira_issues (
+        issue_key, summary, description, status, issue_type, priority,
+        assignee, reporter, created_at, updated_at, resolved_at,
+        labels, components, raw_data, last_synced_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(issue_key) DO UPDATE SET
+        summary = excluded.summary,
+        description = excluded.description,
+        status = excluded.status,
+        issue_type = excluded.issue_type,
+        priority = excluded.priority,
+        assignee = excluded.assignee,
+        reporter = excluded.reporter,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        resolved_at = excluded.resolved_at,
+        labels = excluded.labels,
+        components = excluded.components,
+        raw_data = excluded.raw_data,
+        last_synced_at = CURRENT_TIMESTAMP
+    WHERE jira_issues.updated_at IS NOT excluded.updated_at
+"""
+
+# Default projection for get_cached_issues; leaves out description/raw_data
+_CACHED_ISSUE_COLUMNS = (
+    "issue_key", "summary", "status", "issue_type", "priority",
+    "assignee", "updated_at"
+)
+
+# Smaller saves (e.g. get_issue_details) run without a progress bar
+_PROGRESS_MIN_ISSUES = 200
+
+# Fetched batches buffered ahead of the writer
+_BATCH_QUEUE_MAX = 4
+
+# Above this many keys, lookups join a temp table instead of binding IN (...)
+_KEY_PARAM_LIMIT = 500
+
+# Hot-path serializers bound once at import; the zstd contexts are
+# reused across rows instead of being set up per call.
+# raw_data is stored as zstd-compressed JSON
+_dumps = orjson.dumps
+_compress = zstd.ZstdCompressor(level=3).compress
+_decompress = zstd.ZstdDecompressor().decompress
+
+# PRAGMA user_version once legacy TEXT raw_data rows have been compressed
+_RAW_DATA_BLOB_VERSION = 1
+
+_ISSUE_TABLE_COLUMNS = frozenset((
+    "issue_key", "summary", "description", "status", "issue_type",
+    "priority", "assignee", "reporter", "created_at", "updated_at",
+    "resolved_at", "labels", "components", "raw_data", "collected_at",
+    "last_synced_at"
+))
+
+
+def _encode_raw(data: Dict[str, Any]) -> sqlite3.Binary:
+    """Serialize and compress an issue dump for the raw_data column"""
+    return sqlite3.Binary(_compress(_dumps(data)))
+
+
+def _decode_raw(blob: Optional[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a raw_data value back into a dictionary
+
+    Args:
+        blob: Compressed BLOB, or legacy JSON TEXT from older caches
+
+    Returns:
+        Decoded issue data, or None if the column is empty
+    """
+    if blob is None:
+        return None
+    if isinstance(blob, str):
+        return orjson.loads(blob)
+    return orjson.loads(_decompress(blob))
+
+
+def _is_memory_db(db_path: str) -> bool:
+    """True for ":memory:" and in-memory URIs (file:name?mode=memory&cache=shared)"""
+    return db_path == ":memory:" or (db_path.startswith("file:") and "mode=memory" in db_path)
+
+
+def _synchronous_mode() -> str:
+    """PRAGMA synchronous value for the cache (CACHE_SQLITE_SYNCHRONOUS)"""
+    mode = get_config().CACHE_SQLITE_SYNCHRONOUS.upper()
+    if mode not in _SYNCHRONOUS_MODES:
+        logger.warning(f"Invalid CACHE_SQLITE_SYNCHRONOUS={mode!r}, using NORMAL")
+        return "NORMAL"
+    return mode
+
 
 class JiraCollector:
     """Jira data collector using MCP Client"""
 
-    def __init__(self, mcp_client: MCPClient, db_path: str = "app/data/cache/jira_cache.db"):
+    def __init__(
+        self,
+        mcp_client: Optional[MCPClient] = None,
+        db_path: str = "app/data/cache/jira_cache.db"
+    ):
         """
         Initialize Jira Collector
 
         Args:
-            mcp_client: MCPClient instance
-            db_path: SQLite database path
+            mcp_client: MCPClient instance, or None for cache-only use
+                (e.g. clearing or vacuuming it from scripts/collect_data.py)
+            db_path: SQLite database path, ":memory:" or a "file:" URI
         """
         self.mcp_client = mcp_client
         self.db_path = db_path
         self.batch_size = 50
+        self._conn: Optional[sqlite3.Connection] = None
+        # Guards self._conn: the shared autocommit connection must never see
+        # another thread's statements inside an open BEGIN ... COMMIT
+        self._lock = threading.RLock()
+        # Closes the connection if the collector is collected (or at exit) unclosed
+        self._finalizer: Optional[weakref.finalize] = None
 
         # Ensure database directory exists
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        if not _is_memory_db(db_path):
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
         # Initialize database
         self._init_database()
@@ -45,7 +167,8 @@ class JiraCollector:
         schema_path = Path(__file__).parent.parent / "data" / "cache" / "schema.sql"
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock:
+                conn = self._connect()
                 if schema_path.exists():
                     with open(schema_path, 'r', encoding='utf-8') as f:
                         schema_sql = f.read()
@@ -56,10 +179,65 @@ class JiraCollector:
                     # Fallback: create basic schema
                     self._create_basic_schema(conn)
 
+                self._migrate_raw_data(conn)
+
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return the cache connection, opening and tuning it on first use
+
+        Callers hold self._lock while they use the connection and do not use
+        it as a context manager (Connection.__exit__ would COMMIT whatever
+        transaction is open on it).
+        """
+        with self._lock:
+            if self._conn is None:
+                synchronous = _synchronous_mode()
+
+                # Autocommit mode: transactions are opened explicitly with BEGIN
+                conn = sqlite3.connect(
+                    self.db_path,
+                    isolation_level=None,
+                    check_same_thread=False,
+                    uri=self.db_path.startswith("file:")
+                )
+                # page_size only takes effect on a new file, so it must come first
+                conn.executescript(f"""
+                    PRAGMA page_size={_PAGE_SIZE};
+                    PRAGMA journal_mode=WAL;
+                    PRAGMA synchronous={synchronous};
+                    PRAGMA temp_store=MEMORY;
+                    PRAGMA cache_size=-64000;
+                    PRAGMA mmap_size=268435456;
+                    PRAGMA busy_timeout=5000;
+                """)
+                self._conn = conn
+                self._finalizer = weakref.finalize(self, conn.close)
+            return self._conn
+
+    def _client(self) -> MCPClient:
+        """Return the MCP client, failing clearly for cache-only collectors"""
+        if self.mcp_client is None:
+            raise RuntimeError("JiraCollector was created without an MCP client")
+        return self.mcp_client
+
+    def close(self):
+        """Close the cache connection"""
+        with self._lock:
+            if self._conn is not None:
+                # Runs conn.close() once and detaches the finalizer
+                self._finalizer()
+                self._conn = None
+
+    def __enter__(self) -> "JiraCollector":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def _create_basic_schema(self, conn: sqlite3.Connection):
         """Create basic schema if schema.sql is not found"""
         conn.execute("""
@@ -77,14 +255,42 @@ class JiraCollector:
                 resolved_at DATETIME,
                 labels TEXT,
                 components TEXT,
-                raw_data TEXT,
+                raw_data BLOB,
                 collected_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                 last_synced_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
         conn.execute("CREATE INDEX IF NOT EXISTS idx_jira_updated_at ON jira_issues(updated_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jira_status_updated ON jira_issues(status, updated_at DESC)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jira_last_synced ON jira_issues(last_synced_at DESC)")
         logger.info("Basic schema created")
 
+    def _migrate_raw_data(self, conn: sqlite3.Connection):
+        """Compress raw_data rows written as JSON TEXT by older versions"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= _RAW_DATA_BLOB_VERSION:
+            return
+
+        rows = conn.execute("""
+            SELECT issue_key, raw_data FROM jira_issues
+            WHERE typeof(raw_data) = 'text'
+        """).fetchall()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "UPDATE jira_issues SET raw_data = ? WHERE issue_key = ?",
+                [(_encode_raw(orjson.loads(raw)), key) for key, raw in rows]
+            )
+            conn.execute(f"PRAGMA user_version = {_RAW_DATA_BLOB_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if rows:
+            logger.info(f"Compressed raw_data for {len(rows)} cached issues")
+
     def collect_issues(
         self,
         jql: Optional[str] = None,
@@ -113,18 +319,23 @@ class JiraCollector:
         logger.info(f"Using JQL: {jql}")
 
         try:
-            # Collect issues from MCP
-            issues = self.mcp_client.search_jira_issues(
-                jql=jql,
-                max_results=max_results
-            )
+            issues: List[JiraIssue] = []
 
-            logger.info(f"Collected {len(issues)} issues from MCP")
+            def received(stream: Iterable[JiraIssue]) -> Iterator[JiraIssue]:
+                for issue in stream:
+                    issues.append(issue)
+                    yield issue
 
-            # Save to cache
-            if issues:
-                saved_count = self.save_to_cache(issues)
-                logger.info(f"Saved {saved_count} issues to cache")
+            # Issues are written batch by batch while the MCP response is parsed
+            saved_count = self.save_to_cache(received(
+                self._client().iter_search_jira_issues(
+                    jql=jql,
+                    max_results=max_results
+                )
+            ))
+
+            logger.info(f"Collected {len(issues)} issues from MCP")
+            logger.info(f"Saved {saved_count} issues to cache")
 
             return issues
 
@@ -132,6 +343,47 @@ class JiraCollector:
             logger.error(f"Failed to collect issues: {e}")
             raise
 
+    def stream_issues(
+        self,
+        jql: Optional[str] = None,
+        max_results: int = 1000,
+        project: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> int:
+        """
+        Collect Jira issues straight into the cache without keeping them
+
+        Unlike collect_issues, only one batch of issues is held in memory
+        at a time.
+
+        Args:
+            jql: JQL query string
+            max_results: Maximum results to collect
+            project: Project key filter
+            status: Status filter
+
+        Returns:
+            Number of issues saved
+        """
+        if not jql:
+            jql = self._build_default_jql(project, status)
+
+        logger.info(f"Streaming Jira issues with JQL: {jql}")
+
+        try:
+            saved_count = self.save_to_cache(
+                self._client().iter_search_jira_issues(
+                    jql=jql,
+                    max_results=max_results
+                )
+            )
+            logger.info(f"Saved {saved_count} issues to cache")
+            return saved_count
+
+        except Exception as e:
+            logger.error(f"Failed to stream issues: {e}")
+            raise
+
     def _build_default_jql(
         self,
         project: Optional[str] = None,
@@ -166,7 +418,7 @@ class JiraCollector:
             JiraIssue object or None
         """
         try:
-            issue = self.mcp_client.get_jira_issue(issue_key)
+            issue = self._client().get_jira_issue(issue_key)
 
             if issue:
                 # Save to cache
@@ -179,62 +431,233 @@ class JiraCollector:
             logger.error(f"Failed to get issue {issue_key}: {e}")
             return None
 
-    def save_to_cache(self, issues: List[JiraIssue]) -> int:
+    def get_issue_details_many(
+        self,
+        issue_keys: List[str],
+        max_workers: int = 8
+    ) -> List[JiraIssue]:
+        """
+        Get detailed information for several issues and cache them together
+
+        Issues are fetched concurrently and written in one save_to_cache
+        call instead of one transaction per issue.
+
+        Args:
+            issue_keys: Issue keys (e.g., ['PROJ-1', 'PROJ-2'])
+            max_workers: Concurrent MCP requests
+
+        Returns:
+            List of JiraIssue objects that were found, in key order
+        """
+        if not issue_keys:
+            return []
+
+        client = self._client()
+
+        def fetch(issue_key: str) -> Optional[JiraIssue]:
+            try:
+                return client.get_jira_issue(issue_key)
+            except Exception as e:
+                logger.error(f"Failed to get issue {issue_key}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            issues = [issue for issue in executor.map(fetch, issue_keys) if issue]
+
+        if issues:
+            saved_count = self.save_to_cache(issues)
+            logger.info(f"Retrieved {len(issues)}/{len(issue_keys)} issues, cached {saved_count}")
+
+        return issues
+
+    def save_to_cache(self, issues: Iterable[JiraIssue]) -> int:
         """
         Save issues to SQLite cache with batch processing
 
+        Issues are consumed batch_size at a time on a producer thread, so a
+        generator is persisted as it produces without being materialized
+        first, and its fetching overlaps the SQLite writes.
+
         Args:
-            issues: List of JiraIssue objects
+            issues: JiraIssue objects (list or iterator)
 
         Returns:
             Number of issues saved
         """
-        if not issues:
-            return 0
+        # Progress bar only on an interactive terminal and for larger saves
+        show_progress = sys.stderr.isatty()
+        if isinstance(issues, Sized):
+            if not issues:
+                return 0
+            total_batches = (len(issues) + self.batch_size - 1) // self.batch_size
+            show_progress = show_progress and len(issues) > _PROGRESS_MIN_ISSUES
+            logger.info(f"Saving {len(issues)} issues in {total_batches} batches")
+        else:
+            total_batches = None
+            logger.info(f"Saving streamed issues in batches of {self.batch_size}")
 
         saved_count = 0
-        total_batches = (len(issues) + self.batch_size - 1) // self.batch_size
-
-        logger.info(f"Saving {len(issues)} issues in {total_batches} batches")
+        skipped_count = 0
+
+        # Fetching/parsing runs on a producer thread so it overlaps the inserts
+        batches_queue: queue.Queue = queue.Queue(maxsize=_BATCH_QUEUE_MAX)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce_issue_batches,
+            args=(issues, batches_queue, stop),
+            name="jira-issue-batches",
+            daemon=True
+        )
+        producer.start()
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Process in batches with progress bar
-                for i in tqdm(range(0, len(issues), self.batch_size),
-                             desc="Saving to cache",
-                             total=total_batches):
-                    batch = issues[i:i + self.batch_size]
-
-                    for issue in batch:
-                        try:
-                            self._save_single_issue(conn, issue)
-                            saved_count += 1
-                        except Exception as e:
-                            logger.error(f"Failed to save issue {issue.key}: {e}")
-                            # Continue processing other issues
-
-                conn.commit()
+            # Process batches as they arrive, with progress bar. The lock is
+            # taken per batch only: the producer thread may be running a
+            # generator that itself reads from this collector.
+            for batch in tqdm(iter(batches_queue.get, None),
+                              desc="Saving to cache",
+                              total=total_batches,
+                              disable=not show_progress,
+                              mininterval=0.5,
+                              miniters=max(1, (total_batches or 0) // 100)):
+                if isinstance(batch, Exception):
+                    raise batch
+
+                # One transaction per batch; a failed batch is rolled back
+                with self._lock:
+                    conn = self._connect()
+                    try:
+                        conn.execute("BEGIN IMMEDIATE")
+                        changed = self._filter_unchanged(conn, batch)
+                        conn.executemany(
+                            _INSERT_ISSUE_SQL,
+                            [self._issue_to_row(issue) for issue in changed]
+                        )
+                        conn.execute("COMMIT")
+                        saved_count += len(changed)
+                        skipped_count += len(batch) - len(changed)
+                    except Exception as e:
+                        if conn.in_transaction:
+                            conn.execute("ROLLBACK")
+                        logger.error(f"Failed to save batch starting at {batch[0].key}: {e}")
+                        # Continue processing other batches
+
+            # Refresh planner statistics after the bulk write
+            with self._lock:
+                self._connect().execute("PRAGMA optimize")
+
+            if skipped_count:
+                logger.info(f"Skipped {skipped_count} unchanged issues")
 
         except Exception as e:
             logger.error(f"Database error during save: {e}")
             raise
 
+        finally:
+            # Unblock the producer if the writer stopped early
+            stop.set()
+            while producer.is_alive():
+                try:
+                    batches_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
         return saved_count
 
-    def _save_single_issue(self, conn: sqlite3.Connection, issue: JiraIssue):
-        """Save a single issue to database"""
+    def save_to_cache_many_sources(self, sources: Iterable[Iterable[JiraIssue]]) -> int:
+        """
+        Save issues from several sources (e.g. result pages) in one pipeline
+
+        Each source is pulled on the producer thread in turn, so fetching
+        the next source overlaps writing the previous one.
+
+        Args:
+            sources: Iterables of JiraIssue objects
+
+        Returns:
+            Number of issues saved
+        """
+        return self.save_to_cache(chain.from_iterable(sources))
+
+    def _produce_issue_batches(
+        self,
+        issues: Iterable[JiraIssue],
+        batches_queue: queue.Queue,
+        stop: threading.Event
+    ):
+        """Pull issues and queue them in batch_size chunks"""
+        try:
+            issue_iter = iter(issues)
+            while not stop.is_set():
+                batch = list(islice(issue_iter, self.batch_size))
+                if not batch:
+                    break
+                # Insert in primary-key order so the issue_key index is appended to
+                batch.sort(key=attrgetter("key"))
+                batches_queue.put(batch)
+
+        except Exception as e:
+            batches_queue.put(e)
+
+        finally:
+            batches_queue.put(None)
+
+    def _filter_unchanged(
+        self,
+        conn: sqlite3.Connection,
+        batch: List[JiraIssue]
+    ) -> List[JiraIssue]:
+        """Drop issues whose updated timestamp matches the cached copy"""
+        cached_updated = self._cached_updated_at(conn, [issue.key for issue in batch])
+
+        # Compare in the form sqlite3 stores datetime parameters
+        return [
+            issue for issue in batch
+            if issue.key not in cached_updated
+            or cached_updated[issue.key] != (
+                issue.updated.isoformat(" ") if issue.updated else None
+            )
+        ]
+
+    def _cached_updated_at(
+        self,
+        conn: sqlite3.Connection,
+        issue_keys: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """Look up cached updated_at values for the given issue keys"""
+        if len(issue_keys) <= _KEY_PARAM_LIMIT:
+            placeholders = ",".join("?" * len(issue_keys))
+            cursor = conn.execute(
+                f"SELECT issue_key, updated_at FROM jira_issues WHERE issue_key IN ({placeholders})",
+                issue_keys
+            )
+            return dict(cursor.fetchall())
+
+        # Too many keys for bound parameters: join against a temp key table
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _lookup_keys (k TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM _lookup_keys")
+        conn.executemany(
+            "INSERT OR IGNORE INTO _lookup_keys VALUES (?)",
+            [(key,) for key in issue_keys]
+        )
+        cursor = conn.execute("""
+            SELECT j.issue_key, j.updated_at
+            FROM _lookup_keys k JOIN jira_issues j ON j.issue_key = k.k
+        """)
+        return dict(cursor.fetchall())
+
+    def _issue_to_row(self, issue: JiraIssue) -> tuple:
+        """Build the jira_issues insert parameters for an issue"""
+        # Dump the model once and reuse it for every serialized column;
+        # orjson serializes the datetime fields natively
+        data = issue.model_dump()
+
         # Convert lists to JSON strings
-        labels_json = json.dumps(issue.labels) if issue.labels else "[]"
-        components_json = json.dumps(issue.components) if issue.components else "[]"
-        raw_data_json = issue.model_dump_json()
+        labels_json = _dumps(data["labels"]).decode() if data["labels"] else "[]"
+        components_json = _dumps(data["components"]).decode() if data["components"] else "[]"
+        raw_data = _encode_raw(data)
 
-        conn.execute("""
-            INSERT OR REPLACE INTO jira_issues (
-                issue_key, summary, description, status, issue_type, priority,
-                assignee, reporter, created_at, updated_at, resolved_at,
-                labels, components, raw_data, last_synced_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (
+        return (
             issue.key,
             issue.summary,
             issue.description,
@@ -248,8 +671,8 @@ class JiraCollector:
             None,  # resolved_at - not in current model
             labels_json,
             components_json,
-            raw_data_json,
-        ))
+            raw_data,
+        )
 
     def incremental_update(self, since_hours: int = 24) -> List[JiraIssue]:
         """
@@ -278,9 +701,13 @@ class JiraCollector:
     def get_last_sync_time(self) -> Optional[datetime]:
         """Get the last successful sync time from database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock:
+                conn = self._connect()
+                # Index seek on idx_jira_last_synced
                 cursor = conn.execute("""
-                    SELECT MAX(last_synced_at) FROM jira_issues
+                    SELECT last_synced_at FROM jira_issues
+                    ORDER BY last_synced_at DESC
+                    LIMIT 1
                 """)
                 result = cursor.fetchone()
                 if result and result[0]:
@@ -294,19 +721,34 @@ class JiraCollector:
     def get_cached_issues(
         self,
         status: Optional[str] = None,
-        limit: int = 100
-    ) -> List[Dict[str, Any]]:
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None
+    ) -> Union[List[Dict[str, Any]], List[Tuple]]:
         """
         Retrieve cached issues from database
 
         Args:
             status: Filter by status
             limit: Maximum results
+            fields: Columns to select. When given, rows are returned as
+                tuples in this order instead of dictionaries
 
         Returns:
-            List of issue dictionaries
+            List of issue dictionaries (summary columns only), or list of
+            tuples when fields is given
+
+        Raises:
+            ValueError: If fields contains an unknown column
         """
-        query = "SELECT * FROM jira_issues"
+        if fields:
+            unknown = [f for f in fields if f not in _ISSUE_TABLE_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown jira_issues columns: {unknown}")
+            columns = tuple(fields)
+        else:
+            columns = _CACHED_ISSUE_COLUMNS
+
+        query = f"SELECT {', '.join(columns)} FROM jira_issues"
         params = []
 
         if status:
@@ -317,12 +759,12 @@ class JiraCollector:
         params.append(limit)
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
+            with self._lock:
+                rows = self._connect().execute(query, params).fetchall()
 
-                return [dict(row) for row in rows]
+                if fields:
+                    return rows
+                return [dict(zip(columns, row)) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to retrieve cached issues: {e}")
@@ -338,50 +780,115 @@ class JiraCollector:
         }
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Total count
-                cursor = conn.execute("SELECT COUNT(*) FROM jira_issues")
-                stats["total_issues"] = cursor.fetchone()[0]
-
-                # Last sync
-                cursor = conn.execute("SELECT MAX(last_synced_at) FROM jira_issues")
-                result = cursor.fetchone()
-                if result[0]:
-                    stats["last_sync"] = result[0]
-
-                # Status distribution
-                cursor = conn.execute("""
-                    SELECT status, COUNT(*) as count
-                    FROM jira_issues
-                    GROUP BY status
-                    ORDER BY count DESC
-                """)
-                stats["status_distribution"] = {
-                    row[0]: row[1] for row in cursor.fetchall()
-                }
-
-                # Date range
-                cursor = conn.execute("""
-                    SELECT MIN(created_at), MAX(updated_at)
-                    FROM jira_issues
-                """)
-                oldest, newest = cursor.fetchone()
-                stats["date_range"] = {"oldest": oldest, "newest": newest}
+            with self._lock:
+                conn = self._connect()
+                # One read transaction so every query sees the same snapshot
+                conn.execute("BEGIN")
+                try:
+                    # Scalar aggregates in a single pass
+                    cursor = conn.execute("""
+                        SELECT COUNT(*), MAX(last_synced_at),
+                               MIN(created_at), MAX(updated_at)
+                        FROM jira_issues
+                    """)
+                    total, last_sync, oldest, newest = cursor.fetchone()
+                    stats["total_issues"] = total
+                    if last_sync:
+                        stats["last_sync"] = last_sync
+                    stats["date_range"] = {"oldest": oldest, "newest": newest}
+
+                    # Status distribution
+                    cursor = conn.execute("""
+                        SELECT status, COUNT(*) as count
+                        FROM jira_issues
+                        GROUP BY status
+                        ORDER BY count DESC
+                    """)
+                    stats["status_distribution"] = {
+                        row[0]: row[1] for row in cursor.fetchall()
+                    }
+                finally:
+                    conn.execute("COMMIT")
 
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
 
         return stats
 
+    def get_label_distribution(self, limit: int = 20) -> Dict[str, int]:
+        """
+        Count cached issues per label
+
+        Labels are aggregated in SQLite with json_each over the stored JSON
+        arrays, without decoding rows in Python.
+
+        Args:
+            limit: Maximum labels to return (most frequent first)
+
+        Returns:
+            Dictionary of label -> issue count
+        """
+        try:
+            with self._lock:
+                rows = self._connect().execute("""
+                    SELECT label.value, COUNT(*) AS count
+                    FROM jira_issues, json_each(jira_issues.labels) AS label
+                    WHERE jira_issues.labels IS NOT NULL AND jira_issues.labels != '[]'
+                    GROUP BY label.value
+                    ORDER BY count DESC, label.value
+                    LIMIT ?
+                """, (limit,)).fetchall()
+                return dict(rows)
+
+        except Exception as e:
+            logger.error(f"Failed to get label distribution: {e}")
+            return {}
+
     def clear_cache(self):
         """Clear all cached data"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM jira_comments")
-                conn.execute("DELETE FROM jira_issues")
-                conn.commit()
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN")
+                try:
+                    conn.execute("DELETE FROM jira_comments")
+                    conn.execute("DELETE FROM jira_issues")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
             logger.info("Cache cleared successfully")
 
         except Exception as e:
             logger.error(f"Failed to clear cache: {e}")
             raise
+
+    def vacuum(self, analyze: bool = True):
+        """
+        Rebuild the cache database file to reclaim space
+
+        Caches created with an older page size are migrated to _PAGE_SIZE.
+
+        Args:
+            analyze: Also refresh query planner statistics
+        """
+        try:
+            with self._lock:
+                conn = self._connect()
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+                if page_size != _PAGE_SIZE:
+                    # page_size only changes on VACUUM, and not while in WAL mode
+                    conn.execute("PRAGMA journal_mode=DELETE")
+                    conn.execute(f"PRAGMA page_size={_PAGE_SIZE}")
+                    conn.execute("VACUUM")
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    logger.info(f"Cache page size changed from {page_size} to {_PAGE_SIZE}")
+                else:
+                    conn.execute("VACUUM")
+                if analyze:
+                    conn.execute("ANALYZE")
+            logger.info("Jira cache vacuumed successfully")
+
+        except Exception as e:
+            logger.error(f"Failed to vacuum cache: {e}")
+            raise
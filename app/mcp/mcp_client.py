@@ -8,18 +8,18 @@ Atlassian MCP Server와 통신하는 클라이언트 모듈
 - 연결 관리 및 에러 핸들링
 """
 import os
-import json
 import uuid
 import logging
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
+import orjson
 import requests
+from pydantic import TypeAdapter, ValidationError
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from .types import (
-    MCPRequest,
     MCPResponse,
     Tool,
     Resource,
@@ -30,6 +30,9 @@ from .types import (
 
 logger = logging.getLogger(__name__)
 
+# Validates a whole list of issue dicts in one pydantic-core call
+_JIRA_ISSUES_ADAPTER = TypeAdapter(List[JiraIssue])
+
 
 class MCPClient:
     """MCP Protocol Client for Atlassian"""
@@ -57,6 +60,7 @@ class MCPClient:
         self.connected = False
         self.server_capabilities: Optional[Dict[str, Any]] = None
         self.session_id: Optional[str] = None  # ← 헤더로 주고받는 세션 ID
+        self._tools_cache: Optional[List[Tool]] = None  # 연결(세션)당 한 번만 tools/list
 
         # Load configuration from environment or parameters
         if server_url:
@@ -108,6 +112,52 @@ class MCPClient:
         Returns:
             MCPResponse object
         """
+        data = self._post(self._request_data(method, params), method, params)
+        mcp_response = MCPResponse.model_validate(data)
+
+        if mcp_response.error:
+            logger.error("MCP Error: %s", mcp_response.error)
+            raise Exception(f"MCP Error: {mcp_response.error.get('message', mcp_response.error)}")
+
+        return mcp_response
+
+    def _send_batch(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[MCPResponse]:
+        """
+        Send several MCP requests as one JSON-RPC batch (a single HTTP round-trip)
+
+        Args:
+            calls: (method, params) pairs
+
+        Returns:
+            MCPResponse per call, in call order. Per-call errors are left in
+            ``error`` rather than raised.
+        """
+        batch = [self._request_data(method, params) for method, params in calls]
+        methods = [method for method, _ in calls]
+        data = self._post(batch, "batch", methods)
+
+        if not isinstance(data, list):
+            # 배치 자체를 거절한 경우 단일 에러 객체가 온다
+            error = (data or {}).get("error") or data
+            logger.error("MCP batch rejected: %s", error)
+            raise Exception(f"MCP Error: batch rejected: {error}")
+
+        # 응답 순서는 보장되지 않으므로 id로 매칭
+        by_id = {item.get("id"): item for item in data}
+        responses: List[MCPResponse] = []
+        for request_data in batch:
+            item = by_id.get(request_data["id"])
+            if item is None:
+                item = {
+                    "id": request_data["id"],
+                    "error": {"code": -32603, "message": "No response in batch"},
+                }
+            responses.append(MCPResponse.model_validate(item))
+        return responses
+
+    @staticmethod
+    def _request_data(method: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """JSON-RPC request object (params omitted when None)"""
         request_data: Dict[str, Any] = {
             "jsonrpc": "2.0",
             "id": str(uuid.uuid4()),
@@ -115,9 +165,22 @@ class MCPClient:
         }
         if params is not None:
             request_data["params"] = params
+        # Built with only non-None fields, so it is already the MCPRequest wire form
+        return request_data
+
+    def _post(self, payload: Any, method: str, params: Any = None) -> Any:
+        """
+        POST a JSON-RPC message or batch and return the decoded response body
+
+        Args:
+            payload: Request object or list of request objects
+            method: Method name, for logging
+            params: Parameters, for logging
 
-        request_model = MCPRequest(**request_data)
-        request_json = request_model.model_dump(exclude_none=True)
+        Returns:
+            Decoded JSON response (object, or list for batches)
+        """
+        request_body = orjson.dumps(payload)
 
         try:
             headers = self._make_headers()
@@ -127,7 +190,7 @@ class MCPClient:
             # requests가 자동 따름. 여기서는 원 URL 유지.
             resp = self.session.post(
                 self.server_url,
-                json=request_json,
+                data=request_body,
                 timeout=self.timeout,
                 headers=headers,
             )
@@ -146,18 +209,13 @@ class MCPClient:
                 logger.debug("SSE response head (200 chars): %r", resp.text[:200])
                 data = self._parse_sse_response(resp.text)
             else:
-                data = resp.json()
+                # Decode the raw body bytes; skips requests' charset detection
+                data = orjson.loads(resp.content)
 
             logger.debug("<- response: %s", data)
-            mcp_response = MCPResponse(**data)
-
-            if mcp_response.error:
-                logger.error("MCP Error: %s", mcp_response.error)
-                raise Exception(f"MCP Error: {mcp_response.error.get('message', mcp_response.error)}")
+            return data
 
-            return mcp_response
-
-        except requests.exceptions.JSONDecodeError as e:
+        except (requests.exceptions.JSONDecodeError, orjson.JSONDecodeError) as e:
             logger.error(
                 "Non-JSON response | status=%s | headers=%s | text=%r",
                 getattr(resp, "status_code", "?"),
@@ -179,15 +237,21 @@ class MCPClient:
             if line.lower().startswith("data:"):
                 payload = line[5:].lstrip()  # remove "data:" and following space
                 try:
-                    data_obj = json.loads(payload)
+                    data_obj = orjson.loads(payload)
                 except Exception:
                     # 혹시 단일 JSON이 아닌 경우를 대비해 마지막 data만 사용
                     pass
         if data_obj is None:
             # 혹시 통째로 JSON일 수 있으니 한 번 더 시도
-            data_obj = json.loads(sse_text)
+            data_obj = orjson.loads(sse_text)
         return data_obj
 
+    @staticmethod
+    def _first_text(content: List[Dict[str, Any]]) -> Optional[str]:
+        """Return the text of the first `text` content item, if any"""
+        item = next((i for i in content if i.get("type") == "text"), None)
+        return item["text"] if item is not None else None
+
     def _send_notification(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
         """Send a notification (no response expected)"""
         notification: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
@@ -198,7 +262,7 @@ class MCPClient:
             headers = self._make_headers()
             self.session.post(
                 self.server_url,
-                json=notification,
+                data=orjson.dumps(notification),
                 timeout=self.timeout,
                 headers=headers,
             )
@@ -240,6 +304,7 @@ class MCPClient:
 
                 # 서버 capabilities 저장
                 self.server_capabilities = resp.result or {}
+                self._tools_cache = None
 
                 # 초기화 완료 알림 (필요한 서버가 있음)
                 self._send_notification("notifications/initialized")
@@ -270,6 +335,7 @@ class MCPClient:
                     logger.warning("MCP Error on shutdown: %s", e)
                 finally:
                     self.connected = False
+                    self._tools_cache = None
                     logger.info("MCP connection closed")
         finally:
             try:
@@ -315,37 +381,28 @@ class MCPClient:
     # -----------------------------
     # Tools/Resources
     # -----------------------------
-    def list_tools(self) -> List[Tool]:
-        """List available tools from MCP server"""
+    def list_tools(self, refresh: bool = False) -> List[Tool]:
+        """
+        List available tools from MCP server
+
+        The result is cached for the current connection.
+
+        Args:
+            refresh: Ignore the cached list and ask the server again
+
+        Returns:
+            List of Tool objects
+        """
+        if self._tools_cache is not None and not refresh:
+            return list(self._tools_cache)
+
         try:
             # tools/list 는 params 없음
             resp = self._send_request("tools/list", None)
-            tools_data = resp.result.get("tools", []) if resp.result else []
-            tools: List[Tool] = []
-
-            for t in tools_data:
-                schema = t.get("inputSchema", {}) or {}
-                properties = schema.get("properties", {}) or {}
-                required = schema.get("required", []) or []
-
-                parameters = []
-                for name, info in properties.items():
-                    parameters.append({
-                        "name": name,
-                        "type": info.get("type", "string"),
-                        "description": info.get("description", ""),
-                        "required": name in required,
-                        "enum": info.get("enum"),
-                    })
-
-                tools.append(Tool(
-                    name=t["name"],
-                    description=t.get("description", ""),
-                    parameters=parameters,
-                ))
-
+            tools = self._parse_tools(resp.result)
             logger.info("Retrieved %d tools from MCP server", len(tools))
-            return tools
+            self._tools_cache = tools
+            return list(tools)
         except Exception as e:
             logger.error("Failed to list tools: %s", e)
             return []
@@ -354,14 +411,89 @@ class MCPClient:
         """List available resources from MCP server"""
         try:
             resp = self._send_request("resources/list", None)
-            resources_data = resp.result.get("resources", []) if resp.result else []
-            resources = [Resource(**r) for r in resources_data]
+            resources = self._parse_resources(resp.result)
             logger.info("Retrieved %d resources from MCP server", len(resources))
             return resources
         except Exception as e:
             logger.error("Failed to list resources: %s", e)
             return []
 
+    def list_tools_and_resources(self) -> Tuple[List[Tool], List[Resource]]:
+        """
+        List tools and resources in one batched round-trip
+
+        Servers that reject JSON-RPC batches fall back to two requests.
+
+        Returns:
+            (tools, resources)
+        """
+        try:
+            tools_resp, resources_resp = self._send_batch([
+                ("tools/list", None),
+                ("resources/list", None),
+            ])
+        except Exception as e:
+            logger.warning("Batched discovery failed, falling back to single requests: %s", e)
+            return self.list_tools(refresh=True), self.list_resources()
+
+        tools: List[Tool] = []
+        if tools_resp.error:
+            logger.error("Failed to list tools: %s", tools_resp.error)
+        else:
+            try:
+                tools = self._parse_tools(tools_resp.result)
+                self._tools_cache = tools
+                logger.info("Retrieved %d tools from MCP server", len(tools))
+            except Exception as e:
+                logger.error("Failed to list tools: %s", e)
+
+        resources: List[Resource] = []
+        if resources_resp.error:
+            logger.error("Failed to list resources: %s", resources_resp.error)
+        else:
+            try:
+                resources = self._parse_resources(resources_resp.result)
+                logger.info("Retrieved %d resources from MCP server", len(resources))
+            except Exception as e:
+                logger.error("Failed to list resources: %s", e)
+
+        return list(tools), resources
+
+    @staticmethod
+    def _parse_tools(result: Optional[Dict[str, Any]]) -> List[Tool]:
+        """Convert a tools/list result into Tool objects"""
+        tools_data = result.get("tools", []) if result else []
+        tools: List[Tool] = []
+
+        for t in tools_data:
+            schema = t.get("inputSchema", {}) or {}
+            properties = schema.get("properties", {}) or {}
+            required = schema.get("required", []) or []
+
+            parameters = []
+            for name, info in properties.items():
+                parameters.append({
+                    "name": name,
+                    "type": info.get("type", "string"),
+                    "description": info.get("description", ""),
+                    "required": name in required,
+                    "enum": info.get("enum"),
+                })
+
+            tools.append(Tool(
+                name=t["name"],
+                description=t.get("description", ""),
+                parameters=parameters,
+            ))
+
+        return tools
+
+    @staticmethod
+    def _parse_resources(result: Optional[Dict[str, Any]]) -> List[Resource]:
+        """Convert a resources/list result into Resource objects"""
+        resources_data = result.get("resources", []) if result else []
+        return [Resource.model_validate(r) for r in resources_data]
+
     def call_tool(self, name: str, arguments: Dict[str, Any]) -> ToolCallResponse:
         """Call a tool on MCP server"""
         try:
@@ -396,6 +528,18 @@ class MCPClient:
         max_results: int = 50,
     ) -> List[JiraIssue]:
         """Search Jira issues"""
+        return list(self.iter_search_jira_issues(
+            jql=jql, project=project, status=status, max_results=max_results
+        ))
+
+    def iter_search_jira_issues(
+        self,
+        jql: Optional[str] = None,
+        project: Optional[str] = None,
+        status: Optional[str] = None,
+        max_results: int = 50,
+    ) -> Iterator[JiraIssue]:
+        """Search Jira issues, yielding each issue as soon as it is parsed"""
         args: Dict[str, Any] = {"maxResults": max_results}
 
         if jql:
@@ -411,26 +555,30 @@ class MCPClient:
         resp = self.call_tool("jira_search", args)
         if resp.isError:
             logger.error("Jira search failed: %s", resp.content)
-            return []
+            return
 
-        issues: List[JiraIssue] = []
         for item in resp.content:
             if item.get("type") == "text":
                 try:
-                    data = json.loads(item["text"])
-                    if isinstance(data, list):
-                        for d in data:
-                            issues.append(JiraIssue(**d))
-                    elif isinstance(data, dict):
+                    data = orjson.loads(item["text"])
+                    if isinstance(data, dict):
                         # Handle both direct issue objects and search results with 'issues' field
-                        if "issues" in data:
-                            for issue_data in data["issues"]:
-                                issues.append(JiraIssue(**issue_data))
-                        else:
-                            issues.append(JiraIssue(**data))
+                        data = data["issues"] if "issues" in data else [data]
+                    if not isinstance(data, list):
+                        continue
                 except Exception as e:
                     logger.warning("Failed to parse Jira issue: %s", e)
-        return issues
+                    continue
+
+                try:
+                    yield from _JIRA_ISSUES_ADAPTER.validate_python(data)
+                except ValidationError:
+                    # Fall back to one model at a time, skipping invalid entries
+                    for d in data:
+                        try:
+                            yield JiraIssue.model_validate(d)
+                        except ValidationError as e:
+                            logger.warning("Failed to parse Jira issue: %s", e)
 
     def get_jira_issue(self, issue_key: str) -> Optional[JiraIssue]:
         """Get a specific Jira issue"""
@@ -438,14 +586,15 @@ class MCPClient:
         if resp.isError:
             logger.error("Failed to get Jira issue %s", issue_key)
             return None
-        for item in resp.content:
-            if item.get("type") == "text":
-                try:
-                    data = json.loads(item["text"])
-                    return JiraIssue(**data)
-                except Exception as e:
-                    logger.warning("Failed to parse Jira issue: %s", e)
-        return None
+        text = self._first_text(resp.content)
+        if text is None:
+            return None
+        try:
+            # Parse and validate straight from the JSON text
+            return JiraIssue.model_validate_json(text)
+        except Exception as e:
+            logger.warning("Failed to parse Jira issue: %s", e)
+            return None
 
     def search_confluence_pages(
         self,
@@ -467,7 +616,7 @@ class MCPClient:
         for item in resp.content:
             if item.get("type") == "text":
                 try:
-                    data = json.loads(item["text"])
+                    data = orjson.loads(item["text"])
                     if isinstance(data, list):
                         for d in data:
                             pages.append(ConfluencePage(**d))
@@ -488,14 +637,15 @@ class MCPClient:
         if resp.isError:
             logger.error("Failed to get Confluence page %s", page_id)
             return None
-        for item in resp.content:
-            if item.get("type") == "text":
-                try:
-                    data = json.loads(item["text"])
-                    return ConfluencePage(**data)
-                except Exception as e:
-                    logger.warning("Failed to parse Confluence page: %s", e)
-        return None
+        text = self._first_text(resp.content)
+        if text is None:
+            return None
+        try:
+            # Parse and validate straight from the JSON text
+            return ConfluencePage.model_validate_json(text)
+        except Exception as e:
+            logger.warning("Failed to parse Confluence page: %s", e)
+            return None
 
     def close(self) -> None:
         """Close HTTP session"""
@@ -3,6 +3,7 @@ MCP Protocol Data Types
 
 MCP(Model Context Protocol) 통신에 사용되는 데이터 타입 정의
 """
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
@@ -93,6 +94,12 @@ class JiraIssue(BaseModel):
     components: List[str] = []
 
 
+# ConfluencePage.flags 비트 (캐시의 flags 컬럼에 저장)
+PAGE_HAS_CONTENT = 1
+PAGE_HAS_LABELS = 1 << 1
+PAGE_HAS_AUTHOR = 1 << 2
+
+
 class ConfluencePage(BaseModel):
     """Confluence Page 데이터"""
     id: str
@@ -105,6 +112,15 @@ class ConfluencePage(BaseModel):
     author: Optional[str] = None
     labels: List[str] = []
 
+    @property
+    def flags(self) -> int:
+        """내용/라벨/작성자 유무 비트마스크 (PAGE_HAS_*)"""
+        return (
+            (PAGE_HAS_CONTENT if self.content else 0)
+            | (PAGE_HAS_LABELS if self.labels else 0)
+            | (PAGE_HAS_AUTHOR if self.author else 0)
+        )
+
 
 class SearchResult(BaseModel):
     """검색 결과"""
@@ -115,3 +131,32 @@ class SearchResult(BaseModel):
     score: float
     metadata: Dict[str, Any] = {}
     url: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResultRow:
+    """
+    내부 처리용 검색 결과 (cache → ranker → prompt)
+
+    SearchResult와 같은 필드를 갖지만 검증 없이 생성되는 경량 객체.
+    외부 입력 경계에서는 SearchResult를 사용한다.
+    """
+    source: Literal["jira", "confluence"]
+    item_id: str
+    title: str
+    content: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    url: Optional[str] = None
+
+    def to_model(self) -> SearchResult:
+        """검증된 SearchResult로 변환"""
+        return SearchResult(
+            source=self.source,
+            item_id=self.item_id,
+            title=self.title,
+            content=self.content,
+            score=self.score,
+            metadata=self.metadata,
+            url=self.url,
+        )
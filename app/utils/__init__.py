@@ -3,6 +3,6 @@ Utilities Module
 
 공통 유틸리티 함수 및 설정 관리
 """
-from .config import Config, config
+from .config import Config, config, get_config
 
-__all__ = ["Config", "config"]
+__all__ = ["Config", "config", "get_config"]
@@ -4,73 +4,95 @@ Configuration Management
 환경변수 및 설정 중앙 관리 모듈
 """
 import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from typing import Optional
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from dotenv import find_dotenv, load_dotenv
 
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application Configuration"""
+    """
+    Application Configuration
+
+    Field values below are defaults; get_config() overrides each one from
+    the environment variable of the same name. Read settings from that
+    instance: fields are slots, so class-level reads such as
+    Config.MCP_SERVER_HOST give a slot descriptor, not the setting.
+    """
 
     # Azure OpenAI Configuration
-    AOAI_API_KEY: str = os.getenv("AOAI_API_KEY", "")
-    AOAI_ENDPOINT: str = os.getenv("AOAI_ENDPOINT", "")
-    AOAI_API_VERSION: str = os.getenv("AOAI_API_VERSION", "2024-05-01-preview")
-    AOAI_DEPLOY_GPT4O: str = os.getenv("AOAI_DEPLOY_GPT4O", "")
-    AOAI_EMBEDDING_DEPLOYMENT: str = os.getenv("AOAI_EMBEDDING_DEPLOYMENT", "text-embedding-3-large")
+    AOAI_API_KEY: str = ""
+    AOAI_ENDPOINT: str = ""
+    AOAI_API_VERSION: str = "2024-05-01-preview"
+    AOAI_DEPLOY_GPT4O: str = ""
+    AOAI_EMBEDDING_DEPLOYMENT: str = "text-embedding-3-large"
 
     # MCP Server Configuration
-    MCP_SERVER_HOST: str = os.getenv("MCP_SERVER_HOST", "localhost")
-    MCP_SERVER_PORT: str = os.getenv("MCP_SERVER_PORT", "9000")
-    MCP_SERVER_PROTOCOL: str = os.getenv("MCP_SERVER_PROTOCOL", "http")
-    MCP_BASE_PATH: str = os.getenv("MCP_BASE_PATH", "/mcp")
-    MCP_TIMEOUT: int = int(os.getenv("MCP_TIMEOUT", "30"))
+    MCP_SERVER_HOST: str = "localhost"
+    MCP_SERVER_PORT: str = "9000"
+    MCP_SERVER_PROTOCOL: str = "http"
+    MCP_BASE_PATH: str = "/mcp"
+    MCP_TIMEOUT: int = 30
 
     # Atlassian Configuration
-    ATLASSIAN_URL: str = os.getenv("ATLASSIAN_URL", "")
-    ATLASSIAN_EMAIL: str = os.getenv("ATLASSIAN_EMAIL", "")
-    ATLASSIAN_API_TOKEN: str = os.getenv("ATLASSIAN_API_TOKEN", "")
+    ATLASSIAN_URL: str = ""
+    ATLASSIAN_EMAIL: str = ""
+    ATLASSIAN_API_TOKEN: str = ""
 
     # Database Configuration
-    DB_PATH: str = os.getenv("DB_PATH", "history.db")
+    DB_PATH: str = "history.db"
+    # synchronous mode for the regenerable collector caches (OFF/NORMAL/FULL/EXTRA)
+    CACHE_SQLITE_SYNCHRONOUS: str = "NORMAL"
 
     # RAG Configuration
-    RAG_TOP_K: int = int(os.getenv("RAG_TOP_K", "5"))
-    RAG_SCORE_THRESHOLD: float = float(os.getenv("RAG_SCORE_THRESHOLD", "0.7"))
-    CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "800"))
-    CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "200"))
+    RAG_TOP_K: int = 5
+    RAG_SCORE_THRESHOLD: float = 0.7
+    CHUNK_SIZE: int = 800
+    CHUNK_OVERLAP: int = 200
 
     # Data Collection Schedule
-    COLLECTION_SCHEDULE_JIRA: str = os.getenv("COLLECTION_SCHEDULE_JIRA", "0 */6 * * *")
-    COLLECTION_SCHEDULE_CONFLUENCE: str = os.getenv("COLLECTION_SCHEDULE_CONFLUENCE", "0 0 * * *")
+    COLLECTION_SCHEDULE_JIRA: str = "0 */6 * * *"
+    COLLECTION_SCHEDULE_CONFLUENCE: str = "0 0 * * *"
 
     # Logging Configuration
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "app/logs/system.log")
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: str = "app/logs/system.log"
 
     # Langfuse Configuration (Optional)
-    LANGFUSE_PUBLIC_KEY: Optional[str] = os.getenv("LANGFUSE_PUBLIC_KEY")
-    LANGFUSE_SECRET_KEY: Optional[str] = os.getenv("LANGFUSE_SECRET_KEY")
-    LANGFUSE_HOST: Optional[str] = os.getenv("LANGFUSE_HOST")
+    LANGFUSE_PUBLIC_KEY: Optional[str] = None
+    LANGFUSE_SECRET_KEY: Optional[str] = None
+    LANGFUSE_HOST: Optional[str] = None
 
     # Support Configuration
-    SUPPORT_EMAIL: str = os.getenv("SUPPORT_EMAIL", "support@company.com")
-    SUPPORT_PHONE: str = os.getenv("SUPPORT_PHONE", "1234-5678")
+    SUPPORT_EMAIL: str = "support@company.com"
+    SUPPORT_PHONE: str = "1234-5678"
 
     @classmethod
-    def get_mcp_server_url(cls) -> str:
+    def from_env(cls) -> "Config":
+        """Build a Config, reading each environment variable once"""
+        values = {}
+        for f in fields(cls):
+            raw = os.environ.get(f.name)
+            if raw is not None:
+                values[f.name] = _FIELD_CASTS.get(f.type, str)(raw)
+        return cls(**values)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop the cached config so the next get_config() re-reads the environment"""
+        get_config.cache_clear()
+
+    def get_mcp_server_url(self) -> str:
         """Get full MCP server URL"""
-        return f"{cls.MCP_SERVER_PROTOCOL}://{cls.MCP_SERVER_HOST}:{cls.MCP_SERVER_PORT}{cls.MCP_BASE_PATH}"
+        return f"{self.MCP_SERVER_PROTOCOL}://{self.MCP_SERVER_HOST}:{self.MCP_SERVER_PORT}{self.MCP_BASE_PATH}"
 
-    @classmethod
-    def validate(cls) -> bool:
+    def validate(self) -> bool:
         """Validate required configuration"""
         required_fields = [
-            ("AOAI_API_KEY", cls.AOAI_API_KEY),
-            ("AOAI_ENDPOINT", cls.AOAI_ENDPOINT),
-            ("AOAI_DEPLOY_GPT4O", cls.AOAI_DEPLOY_GPT4O),
+            ("AOAI_API_KEY", self.AOAI_API_KEY),
+            ("AOAI_ENDPOINT", self.AOAI_ENDPOINT),
+            ("AOAI_DEPLOY_GPT4O", self.AOAI_DEPLOY_GPT4O),
         ]
 
         missing = [name for name, value in required_fields if not value]
@@ -81,5 +103,30 @@ class Config:
         return True
 
 
-# Singleton instance
-config = Config()
+_FIELD_CASTS = {int: int, float: float}
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load .env (if any) and build the process-wide Config once"""
+    dotenv_path = find_dotenv()
+    if dotenv_path:
+        load_dotenv(dotenv_path)
+    return Config.from_env()
+
+
+class _ConfigProxy:
+    """Forwards attribute reads to the current get_config() instance"""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str):
+        return getattr(get_config(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_config())
+
+
+# Singleton instance; a proxy rather than a get_config() result, so every
+# import of it follows Config.clear_cache() instead of keeping the old instance
+config = _ConfigProxy()
@@ -0,0 +1,81 @@
+"""
+Shared MCP client pool for the test/demo scripts
+
+One connected MCPClient per (host, port, timeout), so scripts that run several
+checks share a single session instead of repeating connect/initialize.
+Clients are disconnected at interpreter exit.
+"""
+import atexit
+import os
+import sys
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.mcp.mcp_client import MCPClient
+from app.mcp.types import Tool
+
+# tools/list 결과 유효 시간 (초) — 세션 중 도구 목록은 거의 바뀌지 않음
+TOOLS_TTL_SECONDS = 60.0
+
+# id(client) -> monotonic deadline after which tools/list is re-fetched
+_tools_deadlines: Dict[int, float] = {}
+
+
+@lru_cache(maxsize=8)
+def get_client(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    timeout: int = 30,
+) -> MCPClient:
+    """
+    Return an already-connected MCPClient for the given server
+
+    Args:
+        host: MCP server host (default: from env MCP_SERVER_HOST)
+        port: MCP server port (default: from env MCP_SERVER_PORT)
+        timeout: Request timeout in seconds
+
+    Returns:
+        Connected MCPClient, shared by every caller with the same arguments
+    """
+    client = MCPClient(host=host, port=port, timeout=timeout)
+    client.connect()
+    atexit.register(client.disconnect)
+    return client
+
+
+def cached_list_tools(client: MCPClient, ttl: float = TOOLS_TTL_SECONDS) -> List[Tool]:
+    """
+    List tools, re-fetching from the server at most once per ``ttl`` seconds
+
+    Within the TTL the client's per-session tools cache answers without a
+    JSON-RPC round-trip.
+
+    Args:
+        client: Connected MCPClient
+        ttl: Seconds a fetched tool list stays valid
+
+    Returns:
+        List of available tools
+    """
+    now = time.monotonic()
+    deadline = _tools_deadlines.get(id(client))
+    refresh = deadline is not None and now >= deadline
+    if deadline is None or refresh:
+        _tools_deadlines[id(client)] = now + ttl
+    return client.list_tools(refresh=refresh)
+
+
+def invalidate_tools_cache(client: Optional[MCPClient] = None) -> None:
+    """
+    Force the next cached_list_tools() call to hit the server
+
+    Args:
+        client: Client to invalidate (default: all clients)
+    """
+    keys = list(_tools_deadlines) if client is None else [id(client)]
+    for key in keys:
+        _tools_deadlines[key] = 0.0
@@ -4,31 +4,50 @@ Data Collection Script
 CLI tool for collecting Jira and Confluence data from MCP Server
 """
 import argparse
+import atexit
 import logging
+import queue
+import re
+import sqlite3
 import sys
 from pathlib import Path
 from datetime import datetime
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.mcp.mcp_client import MCPClient
-from app.mcp.jira_collector import JiraCollector
-from app.mcp.confluence_collector import ConfluenceCollector
-from app.utils.config import config
-
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('app/logs/collection.log', mode='a')
-    ]
-)
+# MCP client and collectors are imported inside the commands that need them,
+# so --stats / --clear-cache don't pay for the requests/pydantic import graph
+from app.utils.config import get_config
+
+# Configure logging: callers only enqueue records, a listener thread does
+# the console/file writes so logging never blocks the collection loop
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler('app/logs/collection.log', mode='a')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
+# Default JQL: closed issues in the last 180 days
+_DEFAULT_JQL = "status IN (Done, Resolved, Closed) AND resolved >= -180d ORDER BY updated DESC"
+
+# Separator for --spaces, trimming whitespace around the commas
+_SPACE_SPLIT = re.compile(r"\s*,\s*")
+
 
 def collect_jira_data(args):
     """Collect Jira issues"""
@@ -36,6 +55,9 @@ def collect_jira_data(args):
     logger.info("Starting Jira Data Collection")
     logger.info("=" * 80)
 
+    from app.mcp.mcp_client import MCPClient
+    from app.mcp.jira_collector import JiraCollector
+
     # Initialize MCP Client
     logger.info("Connecting to MCP Server...")
     mcp_client = MCPClient(
@@ -87,7 +109,7 @@ def collect_jira_data(args):
         # Show sample issues
         if issues and args.verbose:
             logger.info("\nSample issues:")
-            for issue in issues[:5]:
+            for issue in islice(issues, 5):
                 logger.info(f"  [{issue.key}] {issue.summary} ({issue.status})")
 
         logger.info("=" * 80)
@@ -106,6 +128,9 @@ def collect_confluence_data(args):
     logger.info("Starting Confluence Data Collection")
     logger.info("=" * 80)
 
+    from app.mcp.mcp_client import MCPClient
+    from app.mcp.confluence_collector import ConfluenceCollector
+
     # Initialize MCP Client
     logger.info("Connecting to MCP Server...")
     mcp_client = MCPClient(
@@ -133,7 +158,7 @@ def collect_confluence_data(args):
         # Parse space keys if provided
         space_keys = None
         if args.spaces:
-            space_keys = [s.strip() for s in args.spaces.split(',')]
+            space_keys = _SPACE_SPLIT.split(args.spaces.strip())
             logger.info(f"\nCollecting from specific spaces: {space_keys}")
         elif args.space:
             space_keys = [args.space]
@@ -166,7 +191,7 @@ def collect_confluence_data(args):
         # Show sample pages
         if pages and args.verbose:
             logger.info("\nSample pages:")
-            for page in pages[:5]:
+            for page in islice(pages, 5):
                 logger.info(f"  [{page.id}] {page.title} (space: {page.space})")
 
         logger.info("=" * 80)
@@ -192,19 +217,31 @@ def show_stats(args):
         logger.info("Run collection first: python scripts/collect_data.py --source jira")
         return
 
-    # Initialize collector (no MCP client needed for stats)
-    from app.mcp.jira_collector import JiraCollector
-    mcp_client = MCPClient()  # Dummy client
-    collector = JiraCollector(mcp_client, db_path)
-
-    stats = collector.get_collection_stats()
+    # Read the cache directly (read-only); no MCP client or collector needed
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        total, last_sync, oldest, newest = conn.execute("""
+            SELECT COUNT(*), MAX(last_synced_at), MIN(created_at), MAX(updated_at)
+            FROM jira_issues
+        """).fetchone()
+        status_distribution = conn.execute("""
+            SELECT status, COUNT(*) as count
+            FROM jira_issues
+            GROUP BY status
+            ORDER BY count DESC
+        """).fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"Failed to read cache: {e}")
+        return
+    finally:
+        conn.close()
 
     logger.info(f"\nJira Issues Cache: {db_path}")
-    logger.info(f"  Total issues: {stats['total_issues']}")
-    logger.info(f"  Last sync: {stats['last_sync']}")
-    logger.info(f"  Date range: {stats['date_range']['oldest']} to {stats['date_range']['newest']}")
+    logger.info(f"  Total issues: {total}")
+    logger.info(f"  Last sync: {last_sync}")
+    logger.info(f"  Date range: {oldest} to {newest}")
     logger.info(f"\n  Status distribution:")
-    for status, count in stats['status_distribution'].items():
+    for status, count in status_distribution:
         logger.info(f"    {status}: {count}")
 
     logger.info("=" * 80)
@@ -226,16 +263,54 @@ def clear_cache(args):
 
     logger.info(f"Clearing cache: {db_path}")
 
+    # No MCP client needed to clear the cache
     from app.mcp.jira_collector import JiraCollector
-    mcp_client = MCPClient()
-    collector = JiraCollector(mcp_client, db_path)
-    collector.clear_cache()
+    with JiraCollector(db_path=db_path) as collector:
+        collector.clear_cache()
 
     logger.info("Cache cleared successfully")
 
 
+def vacuum_cache(args):
+    """Rebuild the cache file (also migrates it to the current page size)"""
+    db_path = args.db_path or "app/data/cache/jira_cache.db"
+
+    if not Path(db_path).exists():
+        logger.warning(f"Database not found: {db_path}")
+        return
+
+    logger.info(f"Vacuuming cache: {db_path}")
+
+    # No MCP client needed to vacuum the cache
+    from app.mcp.jira_collector import JiraCollector
+    with JiraCollector(db_path=db_path) as collector:
+        collector.vacuum()
+
+
+# (action, source) -> command; --stats / --clear-cache take precedence over --source
+_DISPATCH = {
+    ("stats", None): show_stats,
+    ("clear", None): clear_cache,
+    ("vacuum", None): vacuum_cache,
+    (None, "jira"): collect_jira_data,
+    (None, "confluence"): collect_confluence_data,
+}
+
+
+def _command_key(args) -> tuple:
+    """Build the _DISPATCH key for parsed CLI arguments"""
+    if args.stats:
+        return ("stats", None)
+    if args.clear_cache:
+        return ("clear", None)
+    if args.vacuum:
+        return ("vacuum", None)
+    return (None, args.source)
+
+
 def main():
     """Main CLI entry point"""
+    config = get_config()
     parser = argparse.ArgumentParser(
         description="Collect Jira/Confluence data from MCP Server",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -267,6 +342,9 @@ Examples:
 
   # Clear cache
   python scripts/collect_data.py --clear-cache --force
+
+  # Compact cache (and migrate older caches to 32K pages)
+  python scripts/collect_data.py --vacuum
         """
     )
 
@@ -277,11 +355,13 @@ Examples:
                        help='Show cache statistics')
     parser.add_argument('--clear-cache', action='store_true',
                        help='Clear cache data')
+    parser.add_argument('--vacuum', action='store_true',
+                       help='Compact the cache file and migrate it to the current page size')
 
     # Jira-specific arguments
     jira_group = parser.add_argument_group('Jira options')
     jira_group.add_argument('--jql', type=str,
-                           default="status IN (Done, Resolved, Closed) AND resolved >= -180d ORDER BY updated DESC",
+                           default=_DEFAULT_JQL,
                            help='JQL query string (default: closed issues in last 180 days)')
     jira_group.add_argument('--project', type=str,
                            help='Project key to filter')
@@ -326,18 +406,13 @@ Examples:
         logging.getLogger().setLevel(logging.DEBUG)
 
     # Route to appropriate function
-    if args.stats:
-        show_stats(args)
-    elif args.clear_cache:
-        clear_cache(args)
-    elif args.source == 'jira':
-        collect_jira_data(args)
-    elif args.source == 'confluence':
-        collect_confluence_data(args)
-    else:
+    command = _DISPATCH.get(_command_key(args))
+    if command is None:
         parser.print_help()
         sys.exit(1)
 
+    command(args)
+
 
 if __name__ == "__main__":
     main()
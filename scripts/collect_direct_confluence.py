@@ -12,6 +12,8 @@ import os
 from pathlib import Path
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -34,7 +36,9 @@ def collect_from_local_confluence(
     password: str,
     spaces: list = None,
     max_pages: int = 100,
-    verify_ssl: bool = True
+    verify_ssl: bool = True,
+    space_workers: int = 8,
+    incremental: bool = False
 ):
     """
     Collect pages from local Confluence server
@@ -46,6 +50,8 @@ def collect_from_local_confluence(
         spaces: List of space keys to collect (None = all spaces)
         max_pages: Maximum pages per space
         verify_ssl: Verify SSL certificates
+        space_workers: Spaces fetched concurrently over the shared session
+        incremental: Only fetch pages that are new or newer than the cache
     """
     logger.info("="*80)
     logger.info("Direct Confluence Data Collection")
@@ -66,121 +72,147 @@ def collect_from_local_confluence(
         verify_ssl=verify_ssl
     )
 
-    # Test connection
-    logger.info("\n2. Testing Connection...")
-    if not client.test_connection():
-        logger.error("✗ Connection failed!")
-        logger.info("\nTroubleshooting:")
-        logger.info("1. Check if Confluence is running:")
-        logger.info(f"   curl {base_url}")
-        logger.info("2. Verify credentials are correct")
-        logger.info("3. Check if REST API is enabled")
-        logger.info("4. For local server, try: username='admin', password='admin'")
-        return
-
-    logger.info("✓ Connection successful!")
-
-    # List spaces
-    logger.info("\n3. Listing Spaces...")
-    all_spaces = client.list_spaces()
-
-    if not all_spaces:
-        logger.warning("✗ No spaces found!")
-        logger.info("\nThis could mean:")
-        logger.info("1. Confluence is empty (no spaces created)")
-        logger.info("2. User doesn't have permission to view spaces")
-        logger.info(f"3. Go to {base_url} and create a space first")
-        return
-
-    logger.info(f"✓ Found {len(all_spaces)} space(s):")
-    for space in all_spaces:
-        space_key = space.get('key', 'N/A')
-        space_name = space.get('name', 'N/A')
-        space_type = space.get('type', 'N/A')
-        logger.info(f"  - {space_key}: {space_name} ({space_type})")
-
-    # Determine target spaces
-    if spaces:
-        target_spaces = spaces
-    else:
-        target_spaces = [s.get('key') for s in all_spaces if s.get('key')]
-
-    logger.info(f"\n4. Collecting Pages from {len(target_spaces)} space(s)...")
-
-    all_pages = []
-    for space_key in target_spaces:
-        logger.info(f"\n→ Space: {space_key}")
-
-        try:
-            pages = client.get_all_pages_from_space(
-                space_key=space_key,
-                max_pages=max_pages
-            )
-
-            if pages:
-                logger.info(f"  ✓ Collected {len(pages)} pages")
-                all_pages.extend(pages)
-
-                # Show sample pages
-                for i, page in enumerate(pages[:5], 1):
-                    logger.info(f"    {i}. {page.title} (ID: {page.id}, Version: {page.version})")
-
-                if len(pages) > 5:
-                    logger.info(f"    ... and {len(pages) - 5} more pages")
-            else:
-                logger.warning(f"  ✗ No pages found in {space_key}")
-
-        except Exception as e:
-            logger.error(f"  ✗ Error: {e}")
-
-    if not all_pages:
-        logger.warning("\n⚠ No pages collected!")
-        logger.info(f"\nGo to {base_url} and create some pages first.")
-        return
-
-    # Save to database
-    logger.info("\n5. Saving to Database...")
-
-    # Create a mock MCP client (not used, but required by ConfluenceCollector)
-    from unittest.mock import Mock
-    mock_mcp_client = Mock()
-
-    db_path = str(project_root / "app" / "data" / "cache" / "confluence_direct.db")
-    collector = ConfluenceCollector(mock_mcp_client, db_path)
-
-    try:
-        saved_count = collector.save_to_cache(all_pages)
-        logger.info(f"✓ Saved {saved_count} pages")
-    except Exception as e:
-        logger.error(f"✗ Failed to save: {e}")
-        return
-
-    # Show statistics
-    logger.info("\n6. Collection Statistics...")
-    stats = collector.get_collection_stats()
-
-    logger.info(f"\n📊 Summary:")
-    logger.info(f"  Total pages: {stats['total_pages']}")
-    logger.info(f"  Total spaces: {stats['total_spaces']}")
-    logger.info(f"  Last sync: {stats['last_sync']}")
-
-    if stats['space_distribution']:
-        logger.info(f"\n  Pages per space:")
-        for space, count in stats['space_distribution'].items():
-            logger.info(f"    {space}: {count} pages")
-
-    if stats['date_range']['oldest']:
-        logger.info(f"\n  Date range:")
-        logger.info(f"    Oldest: {stats['date_range']['oldest']}")
-        logger.info(f"    Newest: {stats['date_range']['newest']}")
-
-    logger.info("\n" + "="*80)
-    logger.info("✓ Collection Completed Successfully!")
-    logger.info("="*80)
-    logger.info(f"\nDatabase: {db_path}")
-    logger.info("You can now use this data for RAG indexing.")
-    logger.info("\nNext steps:")
-    logger.info("  python scripts/build_index.py --source confluence")
+    # The session (and its pooled connections) is closed when collection ends
+    with client:
+        # Test connection
+        logger.info("\n2. Testing Connection...")
+        if not client.test_connection():
+            logger.error("✗ Connection failed!")
+            logger.info("\nTroubleshooting:")
+            logger.info("1. Check if Confluence is running:")
+            logger.info(f"   curl {base_url}")
+            logger.info("2. Verify credentials are correct")
+            logger.info("3. Check if REST API is enabled")
+            logger.info("4. For local server, try: username='admin', password='admin'")
+            return
+
+        logger.info("✓ Connection successful!")
+
+        # List spaces
+        logger.info("\n3. Listing Spaces...")
+        all_spaces = client.list_spaces()
+
+        if not all_spaces:
+            logger.warning("✗ No spaces found!")
+            logger.info("\nThis could mean:")
+            logger.info("1. Confluence is empty (no spaces created)")
+            logger.info("2. User doesn't have permission to view spaces")
+            logger.info(f"3. Go to {base_url} and create a space first")
+            return
+
+        logger.info(f"✓ Found {len(all_spaces)} space(s):")
+        if logger.isEnabledFor(logging.INFO):
+            for space in all_spaces:
+                space_key = space.get('key', 'N/A')
+                space_name = space.get('name', 'N/A')
+                space_type = space.get('type', 'N/A')
+                logger.info(f"  - {space_key}: {space_name} ({space_type})")
+
+        # Determine target spaces
+        if spaces:
+            target_spaces = spaces
+        else:
+            target_spaces = [s.get('key') for s in all_spaces if s.get('key')]
+
+        logger.info(f"\n4. Collecting Pages from {len(target_spaces)} space(s)...")
+
+        db_path = str(project_root / "app" / "data" / "cache" / "confluence_direct.db")
+
+        # Cached versions decide which pages need their bodies fetched again
+        cached_versions = {}
+        if incremental:
+            with ConfluenceCollector(db_path=db_path) as cache:
+                cached_versions = cache.get_cached_versions()
+            logger.info(f"Incremental mode: {len(cached_versions)} pages already cached")
+
+        def fetch_space(space_key: str):
+            try:
+                if incremental:
+                    return client.get_changed_pages_from_space(
+                        space_key=space_key,
+                        cached_versions=cached_versions,
+                        max_pages=max_pages
+                    ), None
+                return client.get_all_pages_from_space(
+                    space_key=space_key,
+                    max_pages=max_pages
+                ), None
+            except Exception as e:
+                return [], e
+
+        # Spaces are fetched concurrently; results are reported in space order
+        all_pages = []
+        with ThreadPoolExecutor(max_workers=max(1, min(space_workers, len(target_spaces)))) as executor:
+            results = executor.map(fetch_space, target_spaces)
+
+            for space_key, (pages, error) in zip(target_spaces, results):
+                logger.info(f"\n→ Space: {space_key}")
+
+                if error:
+                    logger.error(f"  ✗ Error: {error}")
+                elif pages:
+                    logger.info(f"  ✓ Collected {len(pages)} pages")
+                    all_pages.extend(pages)
+
+                    # Show sample pages (skip formatting when INFO is filtered out)
+                    if logger.isEnabledFor(logging.INFO):
+                        for i, page in enumerate(islice(pages, 5), 1):
+                            logger.info(f"    {i}. {page.title} (ID: {page.id}, Version: {page.version})")
+
+                        if len(pages) > 5:
+                            logger.info(f"    ... and {len(pages) - 5} more pages")
+                elif incremental:
+                    logger.info(f"  ✓ No changed pages in {space_key}")
+                else:
+                    logger.warning(f"  ✗ No pages found in {space_key}")
+
+        if not all_pages and incremental:
+            logger.info("\n✓ Cache is up to date, nothing to save")
+            return
+
+        if not all_pages:
+            logger.warning("\n⚠ No pages collected!")
+            logger.info(f"\nGo to {base_url} and create some pages first.")
+            return
+
+        # Save to database
+        logger.info("\n5. Saving to Database...")
+
+        # One connection and one transaction for the whole save; closed on exit
+        with ConfluenceCollector(db_path=db_path) as collector:
+            try:
+                saved_count = collector.save_to_cache(all_pages)
+                logger.info(f"✓ Saved {saved_count} pages")
+            except Exception as e:
+                logger.error(f"✗ Failed to save: {e}")
+                return
+
+            # Show statistics
+            logger.info("\n6. Collection Statistics...")
+            stats = collector.get_collection_stats()
+
+            logger.info(f"\n📊 Summary:")
+            logger.info(f"  Total pages: {stats['total_pages']}")
+            logger.info(f"  Total spaces: {stats['total_spaces']}")
+            logger.info(f"  Last sync: {stats['last_sync']}")
+
+            if stats['space_distribution'] and logger.isEnabledFor(logging.INFO):
+                logger.info(f"\n  Pages per space:")
+                for space, count in stats['space_distribution'].items():
+                    logger.info(f"    {space}: {count} pages")
+
+            if stats['date_range']['oldest']:
+                logger.info(f"\n  Date range:")
+                logger.info(f"    Oldest: {stats['date_range']['oldest']}")
+                logger.info(f"    Newest: {stats['date_range']['newest']}")
+
+            logger.info("\n" + "="*80)
+            logger.info("✓ Collection Completed Successfully!")
+            logger.info("="*80)
+            logger.info(f"\nDatabase: {db_path}")
+            logger.info("You can now use this data for RAG indexing.")
+            logger.info("\nNext steps:")
+            logger.info("  python scripts/build_index.py --source confluence")
 
 
 def main():
@@ -209,6 +241,13 @@ Examples:
     --password admin \\
     --max-pages 200
 
+  # Only fetch pages changed since the last run
+  python scripts/collect_direct_confluence.py \\
+    --url http://localhost:8090 \\
+    --username admin \\
+    --password admin \\
+    --incremental
+
   # For self-signed SSL certificates
   python scripts/collect_direct_confluence.py \\
     --url https://confluence.example.com \\
@@ -259,6 +298,19 @@ Default Confluence Setup:
         help="Maximum pages per space (default: 100)"
     )
 
+    parser.add_argument(
+        "--space-workers",
+        type=int,
+        default=8,
+        help="Number of spaces to fetch concurrently (default: 8)"
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch pages that are new or changed since the last collection"
+    )
+
     parser.add_argument(
         "--no-verify-ssl",
         action="store_true",
@@ -274,7 +326,9 @@ Default Confluence Setup:
         password=args.password,
         spaces=args.spaces,
         max_pages=args.max_pages,
-        verify_ssl=not args.no_verify_ssl
+        verify_ssl=not args.no_verify_ssl,
+        space_workers=args.space_workers,
+        incremental=args.incremental
     )
 
 
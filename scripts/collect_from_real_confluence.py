@@ -10,6 +10,7 @@ Prerequisites:
 """
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 import logging
 
@@ -28,6 +29,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Cache database written by this script
+_DB_PATH = str(project_root / "app" / "data" / "cache" / "confluence_real.db")
+
+
+@lru_cache(maxsize=4)
+def _get_client(host: str, port: int) -> MCPClient:
+    """MCP client per server, reused (with its HTTP session) across calls"""
+    return MCPClient(host=host, port=port, timeout=30)
+
+
+@lru_cache(maxsize=4)
+def _get_collector(host: str, port: int, db_path: str = _DB_PATH) -> ConfluenceCollector:
+    """Collector per server and database, reused so the cache connection opens once"""
+    return ConfluenceCollector(_get_client(host, port), db_path)
+
 
 def test_mcp_connection(client: MCPClient) -> bool:
     """Test MCP server connection"""
@@ -81,8 +97,8 @@ def collect_confluence_data(
     logger.info(f"Target spaces: {spaces if spaces else 'ALL'}")
     logger.info("="*80)
 
-    # Initialize MCP client
-    client = MCPClient(host=host, port=port, timeout=30)
+    # Initialize MCP client (reused if this is called again in-process)
+    client = _get_client(host, port)
 
     # Test connection first
     if not test_mcp_connection(client):
@@ -97,8 +113,8 @@ def collect_confluence_data(
         return
 
     # Initialize collector
-    db_path = str(project_root / "app" / "data" / "cache" / "confluence_real.db")
-    collector = ConfluenceCollector(client, db_path)
+    db_path = _DB_PATH
+    collector = _get_collector(host, port, db_path)
 
     logger.info(f"\n✓ Collector initialized with database: {db_path}")
 
@@ -135,28 +151,29 @@ def collect_confluence_data(
 
     logger.info(f"Collecting from {len(target_spaces)} space(s): {', '.join(target_spaces)}")
 
+    # Spaces are requested concurrently; results are reported in space order
     all_pages = []
-    for space_key in target_spaces:
-        logger.info(f"\n→ Collecting from space: {space_key}")
-
-        try:
-            pages = collector.list_pages(space_key=space_key, limit=max_pages)
+    try:
+        results = collector.list_pages_by_space(target_spaces, limit=max_pages)
+    except Exception as e:
+        logger.error(f"  ✗ Error collecting pages: {e}")
+        results = []
 
-            if pages:
-                logger.info(f"  ✓ Found {len(pages)} pages")
-                all_pages.extend(pages)
+    for space_key, pages in results:
+        logger.info(f"\n→ Collecting from space: {space_key}")
 
-                # Show sample pages
-                for i, page in enumerate(pages[:3], 1):
-                    logger.info(f"    {i}. {page.title} (ID: {page.id})")
+        if pages:
+            logger.info(f"  ✓ Found {len(pages)} pages")
+            all_pages.extend(pages)
 
-                if len(pages) > 3:
-                    logger.info(f"    ... and {len(pages) - 3} more pages")
-            else:
-                logger.warning(f"  ✗ No pages found in {space_key}")
+            # Show sample pages
+            for i, page in enumerate(pages[:3], 1):
+                logger.info(f"    {i}. {page.title} (ID: {page.id})")
 
-        except Exception as e:
-            logger.error(f"  ✗ Error collecting from {space_key}: {e}")
+            if len(pages) > 3:
+                logger.info(f"    ... and {len(pages) - 3} more pages")
+        else:
+            logger.warning(f"  ✗ No pages found in {space_key}")
 
     if not all_pages:
         logger.warning("\n⚠ No pages collected!")
@@ -172,7 +189,10 @@ def collect_confluence_data(
     logger.info("="*80)
 
     try:
-        saved_count = collector.save_to_cache(all_pages)
+        # First load into an empty cache: rebuild the indexes once instead of per row.
+        # Re-runs over a populated cache keep the indexes and upsert normally.
+        bulk = collector.is_cache_empty()
+        saved_count = collector.save_to_cache(all_pages, bulk=bulk)
         logger.info(f"✓ Saved {saved_count} pages to database")
     except Exception as e:
         logger.error(f"✗ Failed to save pages: {e}")
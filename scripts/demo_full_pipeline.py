@@ -22,15 +22,11 @@ def print_header(title):
     print(f"  {title}")
     print("=" * 80)
 
-def demo_jira_collection():
+def demo_jira_collection(client: MCPClient):
     """Demo Jira data collection"""
     print_header("JIRA DATA COLLECTION DEMO")
 
-    # Connect to mock MCP server
-    print("\n1. Connecting to Mock MCP Server (port 9001)...")
-    client = MCPClient(host="localhost", port=9001, timeout=30)
-    client.connect()
-    print("   [OK] Connected")
+    print("\n1. Using shared connection to Mock MCP Server (port 9001)")
 
     # List tools
     print("\n2. Listing available tools...")
@@ -76,21 +72,16 @@ def demo_jira_collection():
     for status, count in statuses.items():
         print(f"     * {status}: {count}")
 
-    client.disconnect()
     print("\n[SUCCESS] Jira collection completed")
     return len(issues)
 
-def demo_confluence_collection():
+def demo_confluence_collection(client: MCPClient):
     """Demo Confluence data collection"""
     print_header("CONFLUENCE DATA COLLECTION DEMO")
 
-    # Connect
-    print("\n1. Connecting to Mock MCP Server (port 9001)...")
-    client = MCPClient(host="localhost", port=9001, timeout=30)
-    client.connect()
-    print("   [OK] Connected")
+    print("\n1. Using shared connection to Mock MCP Server (port 9001)")
 
-    # List tools
+    # List tools (served from the client's cache after the Jira demo)
     print("\n2. Listing available tools...")
     tools = client.list_tools()
     conf_tools = [t for t in tools if 'confluence' in t.name]
@@ -134,7 +125,6 @@ def demo_confluence_collection():
     print(f"   - Total pages:  {len(pages)}")
     print(f"   - Space: MOCK")
 
-    client.disconnect()
     print("\n[SUCCESS] Confluence collection completed")
     return len(pages)
 
@@ -154,9 +144,17 @@ def main():
         print("\n\nDemo cancelled")
         return
 
-    # Run demos
-    jira_count = demo_jira_collection()
-    confluence_count = demo_confluence_collection()
+    # Both demos share one connection (one initialize, one tools/list)
+    print("\nConnecting to Mock MCP Server (port 9001)...")
+    client = MCPClient(host="localhost", port=9001, timeout=30)
+    client.connect()
+    print("[OK] Connected")
+
+    try:
+        jira_count = demo_jira_collection(client)
+        confluence_count = demo_confluence_collection(client)
+    finally:
+        client.disconnect()
 
     # Summary
     print_header("DEMO SUMMARY")
@@ -4,16 +4,124 @@ Mock MCP Server for Testing (Pure Python - No Dependencies)
 Simulates Atlassian MCP server responses for Jira and Confluence tools
 when the actual MCP server is not available or not properly configured.
 """
+import gzip
 import json
-import uuid
+from os import urandom
 from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from typing import Dict, Any
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Union
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # keep the mock runnable without the project requirements
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode('utf-8')
+
+# Static results, serialized once at import; only the JSON-RPC id varies
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "experimental": {},
+        "prompts": {"listChanged": False},
+        "resources": {"subscribe": False, "listChanged": False},
+        "tools": {"listChanged": False}
+    },
+    "serverInfo": {
+        "name": "Mock Atlassian MCP",
+        "version": "1.0.0-mock"
+    }
+}
+
+_TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": "jira_search",
+            "description": "Search Jira issues using JQL",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "jql": {"type": "string"},
+                    "max_results": {"type": "integer", "default": 50}
+                }
+            }
+        },
+        {
+            "name": "jira_get_issue",
+            "description": "Get details of a specific Jira issue",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "issue_key": {"type": "string"}
+                },
+                "required": ["issue_key"]
+            }
+        },
+        {
+            "name": "confluence_search",
+            "description": "Search Confluence pages",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "cql": {"type": "string"},
+                    "limit": {"type": "integer", "default": 25}
+                }
+            }
+        },
+        {
+            "name": "confluence_get_page",
+            "description": "Get details of a specific Confluence page",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "page_id": {"type": "string"}
+                },
+                "required": ["page_id"]
+            }
+        }
+    ]
+}
+
+_ID_PLACEHOLDER = b'"__ID__"'
+
+_DAY_SECONDS = 86400
+
+# Bodies smaller than this are sent uncompressed even if the client accepts gzip
+_GZIP_MIN_BYTES = 1024
+
+
+def _response_template(result: Dict[str, Any]) -> bytes:
+    """Serialize a JSON-RPC result with a placeholder in the id slot"""
+    return _dumps({"jsonrpc": "2.0", "id": "__ID__", "result": result})
+
+
+def _with_request_id(template: bytes, request_id: Any) -> bytes:
+    """Fill the request id into a pre-serialized response"""
+    return template.replace(_ID_PLACEHOLDER, _dumps(request_id), 1)
+
+
+def _iso_dates(base_ts: int, count: int, step_days: int, offset_days: int = 0) -> list:
+    """ISO dates at base + offset + i * step days, from integer epoch seconds"""
+    start = base_ts + offset_days * _DAY_SECONDS
+    step = step_days * _DAY_SECONDS
+    return [datetime.fromtimestamp(start + i * step).isoformat() for i in range(count)]
+
+
+_INITIALIZE_TEMPLATE = _response_template(_INITIALIZE_RESULT)
+_TOOLS_LIST_TEMPLATE = _response_template(_TOOLS_LIST_RESULT)
 
 
 class MCPHandler(BaseHTTPRequestHandler):
     """HTTP request handler for MCP protocol"""
 
+    # HTTP/1.1 keeps the client's pooled connection open between MCP calls
+    protocol_version = "HTTP/1.1"
+
+    # Buffer the response stream so headers and body leave in one send() on flush
+    wbufsize = -1
+
     # Session storage (shared across requests)
     sessions: Dict[str, Dict[str, Any]] = {}
 
@@ -35,157 +143,83 @@ class MCPHandler(BaseHTTPRequestHandler):
             return
 
         # Get or create session
-        session_id = self.headers.get('mcp-session-id')
-        if not session_id:
-            session_id = str(uuid.uuid4()).replace("-", "")
-            self.sessions[session_id] = {"initialized": False}
+        session_id = self.headers.get('mcp-session-id') or urandom(16).hex()
+        self.sessions.setdefault(session_id, {"initialized": False})
+
+        # JSON-RPC batch: one response array for all requests (notifications get no entry)
+        if isinstance(body, list):
+            responses = []
+            for message in body:
+                if "id" not in message:
+                    continue
+                result = self._dispatch(message, session_id)
+                responses.append(result if isinstance(result, bytes) else _dumps(result))
+            response_data = b"[" + b",".join(responses) + b"]"
+        else:
+            response_data = self._dispatch(body, session_id)
+
+        # SSE only for clients that accept it; otherwise a plain JSON body
+        if self._wants_sse():
+            self.send_sse_response(response_data, session_id)
+        else:
+            self.send_json_response(response_data, session_id)
 
-        # Process MCP request
-        method = body.get("method")
-        request_id = body.get("id")
-        params = body.get("params", {})
+    def _dispatch(self, message: Dict[str, Any], session_id: str) -> Union[Dict[str, Any], bytes]:
+        """Route one JSON-RPC message to its handler"""
+        method = message.get("method")
+        request_id = message.get("id")
+        params = message.get("params", {})
 
-        # Route to appropriate handler
         if method == "initialize":
-            response_data = self.handle_initialize(request_id, params, session_id)
+            return self.handle_initialize(request_id, params, session_id)
         elif method == "notifications/initialized":
-            response_data = {"jsonrpc": "2.0", "id": request_id, "result": {}}
+            return {"jsonrpc": "2.0", "id": request_id, "result": {}}
         elif method == "tools/list":
-            response_data = self.handle_tools_list(request_id)
+            return self.handle_tools_list(request_id)
         elif method == "tools/call":
-            response_data = self.handle_tool_call(request_id, params)
+            return self.handle_tool_call(request_id, params)
         elif method == "resources/list":
-            response_data = {"jsonrpc": "2.0", "id": request_id, "result": {"resources": []}}
+            return {"jsonrpc": "2.0", "id": request_id, "result": {"resources": []}}
         else:
-            response_data = {
+            return {
                 "jsonrpc": "2.0",
                 "id": request_id,
                 "error": {"code": -32601, "message": f"Method not found: {method}"}
             }
 
-        # Send SSE response
-        self.send_sse_response(response_data, session_id)
+    def _wants_sse(self) -> bool:
+        """Whether the client's Accept header allows an SSE response"""
+        return 'text/event-stream' in self.headers.get('Accept', '')
 
-    def handle_initialize(self, request_id: str, params: Dict, session_id: str) -> Dict[str, Any]:
+    def handle_initialize(self, request_id: str, params: Dict, session_id: str) -> bytes:
         """Handle initialize request"""
         self.sessions[session_id]["initialized"] = True
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "experimental": {},
-                    "prompts": {"listChanged": False},
-                    "resources": {"subscribe": False, "listChanged": False},
-                    "tools": {"listChanged": False}
-                },
-                "serverInfo": {
-                    "name": "Mock Atlassian MCP",
-                    "version": "1.0.0-mock"
-                }
-            }
-        }
+        return _with_request_id(_INITIALIZE_TEMPLATE, request_id)
 
-    def handle_tools_list(self, request_id: str) -> Dict[str, Any]:
+    def handle_tools_list(self, request_id: str) -> bytes:
         """Handle tools/list request"""
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "tools": [
-                    {
-                        "name": "jira_search",
-                        "description": "Search Jira issues using JQL",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "jql": {"type": "string"},
-                                "max_results": {"type": "integer", "default": 50}
-                            }
-                        }
-                    },
-                    {
-                        "name": "jira_get_issue",
-                        "description": "Get details of a specific Jira issue",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "issue_key": {"type": "string"}
-                            },
-                            "required": ["issue_key"]
-                        }
-                    },
-                    {
-                        "name": "confluence_search",
-                        "description": "Search Confluence pages",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "cql": {"type": "string"},
-                                "limit": {"type": "integer", "default": 25}
-                            }
-                        }
-                    },
-                    {
-                        "name": "confluence_get_page",
-                        "description": "Get details of a specific Confluence page",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "page_id": {"type": "string"}
-                            },
-                            "required": ["page_id"]
-                        }
-                    }
-                ]
-            }
-        }
+        return _with_request_id(_TOOLS_LIST_TEMPLATE, request_id)
 
-    def handle_tool_call(self, request_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    def handle_tool_call(self, request_id: str, params: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Handle tools/call request"""
         tool_name = params.get("name")
         tool_args = params.get("arguments", {})
 
         if tool_name == "jira_search":
             mock_data = self.generate_mock_jira_issues(tool_args.get("maxResults", 10))
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "content": [{"type": "text", "text": json.dumps(mock_data, indent=2)}]
-                }
-            }
+            return self._tool_result(request_id, mock_data)
 
         elif tool_name == "jira_get_issue":
             mock_data = self.generate_mock_jira_issue(tool_args.get("issue_key"))
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "content": [{"type": "text", "text": json.dumps(mock_data, indent=2)}]
-                }
-            }
+            return self._tool_result(request_id, mock_data)
 
         elif tool_name == "confluence_search":
             mock_data = self.generate_mock_confluence_pages(tool_args.get("limit", 10))
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "content": [{"type": "text", "text": json.dumps(mock_data, indent=2)}]
-                }
-            }
+            return self._tool_result(request_id, mock_data)
 
         elif tool_name == "confluence_get_page":
             mock_data = self.generate_mock_confluence_page(tool_args.get("page_id"))
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "content": [{"type": "text", "text": json.dumps(mock_data, indent=2)}]
-                }
-            }
+            return self._tool_result(request_id, mock_data)
 
         else:
             return {
@@ -194,42 +228,73 @@ class MCPHandler(BaseHTTPRequestHandler):
                 "error": {"code": -32601, "message": f"Tool not found: {tool_name}"}
             }
 
-    def send_sse_response(self, data: Dict[str, Any], session_id: str):
-        """Send Server-Sent Events formatted response"""
-        json_str = json.dumps(data)
-        sse_data = f"event: message\ndata: {json_str}\n\n"
-        sse_bytes = sse_data.encode('utf-8')
+    @staticmethod
+    def _tool_result(request_id: Any, mock_data: Dict[str, Any]) -> bytes:
+        """Encode a tool result; the payload is compact JSON inside content[].text"""
+        return _dumps({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "result": {
+                "content": [{"type": "text", "text": _dumps(mock_data).decode('utf-8')}]
+            }
+        })
+
+    def send_sse_response(self, data: Union[Dict[str, Any], bytes], session_id: str):
+        """Send Server-Sent Events formatted response (dict, or already-encoded JSON)"""
+        if not isinstance(data, bytes):
+            data = _dumps(data)
+        self._send_body('text/event-stream', b"event: message\ndata: " + data + b"\n\n", session_id)
+
+    def send_json_response(self, data: Union[Dict[str, Any], bytes], session_id: str):
+        """Send a plain JSON response (dict, or already-encoded JSON)"""
+        if not isinstance(data, bytes):
+            data = _dumps(data)
+        self._send_body('application/json', data, session_id)
+
+    def _send_body(self, content_type: str, body: bytes, session_id: str):
+        """Write a 200 response with the given body, gzipped when the client allows it"""
+        compress = (
+            len(body) >= _GZIP_MIN_BYTES
+            and 'gzip' in self.headers.get('Accept-Encoding', '')
+        )
+        if compress:
+            # Level 1: JSON still shrinks several-fold at the lowest CPU cost
+            body = gzip.compress(body, compresslevel=1, mtime=0)
 
         self.send_response(200)
-        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Type', content_type)
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
         self.send_header('mcp-session-id', session_id)
-        self.send_header('Content-Length', str(len(sse_bytes)))
-        self.send_header('Connection', 'close')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Connection', 'keep-alive')
         self.end_headers()
 
-        self.wfile.write(sse_bytes)
+        self.wfile.write(body)
         self.wfile.flush()
 
     def generate_mock_jira_issues(self, count: int = 10) -> Dict[str, Any]:
         """Generate mock Jira search results"""
-        issues = []
-        base_date = datetime.now() - timedelta(days=180)
+        base_ts = int((datetime.now() - timedelta(days=180)).timestamp())
+        created = _iso_dates(base_ts, count, step_days=5)
+        updated = _iso_dates(base_ts, count, step_days=5, offset_days=2)
 
-        for i in range(count):
-            issue_date = base_date + timedelta(days=i*5)
-            # Flatten structure to match JiraIssue model
-            issues.append({
+        # Flatten structure to match JiraIssue model
+        issues = [
+            {
                 "key": f"MOCK-{1000 + i}",
                 "summary": f"Mock Issue {i+1}: Customer support request",
                 "description": f"This is a mock issue for testing purposes. Issue #{i+1}",
                 "status": "Done" if i % 3 == 0 else "Resolved",
-                "created": issue_date.isoformat(),
-                "updated": (issue_date + timedelta(days=2)).isoformat(),
+                "created": created[i],
+                "updated": updated[i],
                 "assignee": f"User {i % 5 + 1}",
                 "reporter": "Mock Reporter",
                 "priority": "Medium",
                 "labels": ["support", "mock-data"]
-            })
+            }
+            for i in range(count)
+        ]
 
         return {"total": count, "issues": issues}
 
@@ -250,46 +315,49 @@ class MCPHandler(BaseHTTPRequestHandler):
 
     def generate_mock_confluence_pages(self, count: int = 10) -> Dict[str, Any]:
         """Generate mock Confluence search results"""
-        pages = []
-        base_date = datetime.now() - timedelta(days=365)
-
-        for i in range(count):
-            page_date = base_date + timedelta(days=i*10)
-            pages.append({
-                "id": f"mock-page-{i+1}",
-                "type": "page",
-                "status": "current",
-                "title": f"Mock Documentation Page {i+1}",
-                "space": "MOCK",  # Simplified to match ConfluencePage model
-                "content": f"<p>This is mock page content for page {i+1}. Contains important information.</p>",
-                "version": i % 5 + 1,
-                "created": page_date.isoformat(),
-                "updated": (page_date + timedelta(days=5)).isoformat(),
-                "author": "Mock Author",
-                "labels": ["documentation", "mock-data"],
-                # Keep original structure for compatibility
-                "_original": {
-                    "space": {"key": "MOCK", "name": "Mock Space"},
-                    "version": {"number": i % 5 + 1},
-                    "body": {
-                        "storage": {
-                            "value": f"<p>This is mock page content for page {i+1}. Contains important information.</p>",
-                            "representation": "storage"
-                        },
-                        "view": {
-                            "value": f"<p>This is mock page content for page {i+1}. Contains important information.</p>",
-                            "representation": "view"
-                        }
-                    },
-                    "_links": {
-                        "webui": f"/pages/viewpage.action?pageId=mock-page-{i+1}",
-                        "self": f"https://mock.atlassian.net/wiki/rest/api/content/mock-page-{i+1}"
-                    }
-                }
-            })
+        base_ts = int((datetime.now() - timedelta(days=365)).timestamp())
+        created = _iso_dates(base_ts, count, step_days=10)
+        updated = _iso_dates(base_ts, count, step_days=10, offset_days=5)
+
+        pages = [
+            self._mock_confluence_page(i, created[i], updated[i])
+            for i in range(count)
+        ]
 
         return {"results": pages, "size": count}
 
+    @staticmethod
+    def _mock_confluence_page(i: int, created: str, updated: str) -> Dict[str, Any]:
+        """Build one mock search result; the body string is shared by both formats"""
+        body = f"<p>This is mock page content for page {i+1}. Contains important information.</p>"
+        version = i % 5 + 1
+        return {
+            "id": f"mock-page-{i+1}",
+            "type": "page",
+            "status": "current",
+            "title": f"Mock Documentation Page {i+1}",
+            "space": "MOCK",  # Simplified to match ConfluencePage model
+            "content": body,
+            "version": version,
+            "created": created,
+            "updated": updated,
+            "author": "Mock Author",
+            "labels": ["documentation", "mock-data"],
+            # Keep original structure for compatibility
+            "_original": {
+                "space": {"key": "MOCK", "name": "Mock Space"},
+                "version": {"number": version},
+                "body": {
+                    "storage": {"value": body, "representation": "storage"},
+                    "view": {"value": body, "representation": "view"}
+                },
+                "_links": {
+                    "webui": f"/pages/viewpage.action?pageId=mock-page-{i+1}",
+                    "self": f"https://mock.atlassian.net/wiki/rest/api/content/mock-page-{i+1}"
+                }
+            }
+        }
+
     def generate_mock_confluence_page(self, page_id: str) -> Dict[str, Any]:
         """Generate a single mock Confluence page"""
         return {
@@ -314,7 +382,9 @@ class MCPHandler(BaseHTTPRequestHandler):
 def run_server(host='localhost', port=9001):
     """Run the mock MCP server"""
     server_address = (host, port)
-    httpd = HTTPServer(server_address, MCPHandler)
+    # One thread per request so concurrent MCP calls don't queue behind each other
+    httpd = ThreadingHTTPServer(server_address, MCPHandler)
+    httpd.daemon_threads = True
 
     print("=" * 80)
     print(f"Mock MCP Server Starting")
@@ -3,19 +3,20 @@ Quick test of mock MCP server
 """
 import sys
 import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app.mcp.mcp_client import MCPClient
+import orjson
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# Connect to mock server on port 9001
-client = MCPClient(host="localhost", port=9001, timeout=30)
+from _mcp_pool import cached_list_tools, get_client
 
+# Connect to mock server on port 9001 (pooled; disconnected at exit)
 print("Connecting to mock MCP server...")
-client.connect()
+client = get_client("localhost", 9001)
 print("[OK] Connected")
 
 print("\nListing tools...")
-tools = client.list_tools()
+tools = cached_list_tools(client)
 print(f"[OK] Found {len(tools)} tools:")
 for tool in tools:
     print(f"  - {tool.name}: {tool.description}")
@@ -25,11 +26,9 @@ response = client.call_tool("jira_search", {"max_results": 5})
 if response.isError:
     print(f"[ERROR] {response.content[0]['text']}")
 else:
-    import json
-    data = json.loads(response.content[0]['text'])
+    data = orjson.loads(response.content[0]['text'])
     print(f"[OK] Found {data['total']} issues")
     if data['issues']:
         print(f"  Sample: {data['issues'][0]['key']} - {data['issues'][0]['fields']['summary']}")
 
 print("\n[SUCCESS] Mock server test completed!")
-client.disconnect()
@@ -13,10 +13,14 @@ sys.path.insert(0, str(project_root))
 
 from app.mcp.confluence_direct_client import ConfluenceDirectClient
 import logging
+import requests
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the reachability probe before giving up
+PROBE_TIMEOUT = 2
+
 
 def test_connection(base_url: str, username: str, password: str):
     """Test Confluence direct connection"""
@@ -31,6 +35,19 @@ def test_connection(base_url: str, username: str, password: str):
     print()
     print("="*80)
 
+    # Fail fast if nothing is listening, instead of waiting out the client's
+    # full timeout and retries
+    print("\n0. Checking server is reachable...")
+    try:
+        requests.head(base_url, timeout=PROBE_TIMEOUT, verify=False, allow_redirects=True)
+    except requests.RequestException as e:
+        print(f"   [FAILED] Server unreachable: {e}")
+        print("\nTroubleshooting:")
+        print("1. Is Confluence running?")
+        print(f"   Try: curl {base_url}")
+        return False
+    print("   [OK] Server reachable")
+
     # Initialize client
     print("\n1. Initializing client...")
     client = ConfluenceDirectClient(
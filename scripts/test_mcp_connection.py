@@ -8,19 +8,17 @@ import json
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.mcp.mcp_client import MCPClient
+from _mcp_pool import get_client
 
 def main():
     print("=" * 80)
     print("MCP Server Connection Test")
     print("=" * 80)
 
-    client = MCPClient()
-
     try:
-        # Connect
+        # Connect (pooled client; disconnected at exit)
         print("\n1. Connecting to MCP Server...")
-        client.connect()
+        client = get_client()
         print("   [OK] Connected")
         print(f"   Session ID: {client.session_id}")
 
@@ -29,26 +27,22 @@ def main():
         if client.server_capabilities:
             print(json.dumps(client.server_capabilities, indent=2))
 
-        # List tools
+        # Tools and resources in one batched round-trip
+        tools, resources = client.list_tools_and_resources()
+
         print("\n3. Available Tools:")
-        tools = client.list_tools()
         if tools:
             for tool in tools:
                 print(f"   - {tool.name}: {tool.description}")
         else:
             print("   [WARN] No tools available!")
 
-        # List resources
         print("\n4. Available Resources:")
-        try:
-            resources = client.list_resources()
-            if resources:
-                for res in resources:
-                    print(f"   - {res.name} ({res.uri})")
-            else:
-                print("   [INFO] No resources available")
-        except Exception as e:
-            print(f"   [ERROR] Failed to list resources: {e}")
+        if resources:
+            for res in resources:
+                print(f"   - {res.name} ({res.uri})")
+        else:
+            print("   [INFO] No resources available")
 
         # Try to call a tool (if any)
         if tools:
@@ -69,8 +63,6 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
-    finally:
-        client.disconnect()
 
     return 0
 
@@ -0,0 +1,51 @@
+"""
+pytest configuration shared by the test modules
+"""
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# 테스트 모듈이 app 패키지를 import할 수 있도록 프로젝트 루트를 한 번만 추가
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+
+def pytest_configure(config):
+    """Register the markers used to select test groups (-m connection / -m retry)"""
+    config.addinivalue_line("markers", "connection: MCP client connection tests")
+    config.addinivalue_line("markers", "retry: MCP client retry/backoff tests")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config():
+    """Drop the lru_cached get_config() around each test so env changes don't leak"""
+    from app.utils.config import Config
+
+    Config.clear_cache()
+    yield
+    Config.clear_cache()
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Database path in a per-test temporary directory (cleaned up by pytest)"""
+    return str(tmp_path / "test.db")
+
+
+@pytest.fixture
+def mock_client():
+    """Bare MCP client mock; tests set call_tool behaviour themselves"""
+    return Mock()
+
+
+@pytest.fixture(scope="session")
+def mcp_client():
+    """Unconnected MCPClient for localhost:9000, built once per session (no network)"""
+    from app.mcp.mcp_client import MCPClient
+
+    client = MCPClient(host="localhost", port=9000, timeout=30)
+    yield client
+    client.disconnect()
@@ -3,7 +3,7 @@
 
 의존성 설치 후 이 스크립트를 실행하여 테스트를 검증할 수 있습니다.
 """
-import subprocess
+import importlib.util
 import sys
 
 def main():
@@ -27,21 +27,22 @@ def main():
 
     print()
 
-    # Run tests
+    # 전체 실행이 연결/재시도 테스트를 이미 포함하므로 한 번만 실행
+    # (개별 실행은 -m connection / -m retry), pytest-xdist가 있으면 코어 수만큼 병렬
+    parallel = ["-n", "auto"] if importlib.util.find_spec("xdist") else []
     test_commands = [
-        ("All tests", ["pytest", "tests/test_mcp_client.py", "-v"]),
-        ("Connection tests", ["pytest", "tests/test_mcp_client.py::TestMCPClientConnection", "-v"]),
-        ("Retry logic tests", ["pytest", "tests/test_mcp_client.py::TestMCPClientRetryLogic", "-v"]),
+        ("All tests", [*parallel, "tests/test_mcp_client.py", "-v"]),
     ]
 
-    for name, cmd in test_commands:
+    for name, args in test_commands:
         print(f"\n{'=' * 80}")
         print(f"Running: {name}")
         print(f"{'=' * 80}")
-        result = subprocess.run(cmd, capture_output=False)
-        if result.returncode != 0:
+        # 별도 인터프리터 없이 현재 프로세스에서 실행 (pytest는 위에서 이미 import)
+        returncode = pytest.main(args)
+        if returncode != 0:
             print(f"\n❌ {name} failed")
-            return result.returncode
+            return int(returncode)
         print(f"\n✅ {name} passed")
 
     print("\n" + "=" * 80)
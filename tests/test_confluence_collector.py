@@ -3,56 +3,63 @@ Unit Tests for Confluence Collector
 
 Tests for Confluence page collection and HTML cleanup
 """
+import gc
 import pytest
 import sqlite3
 import json
-import tempfile
 import os
+import weakref
 from datetime import datetime
+from uuid import uuid4
+from concurrent.futures import ProcessPoolExecutor
 from unittest.mock import Mock, patch, MagicMock
 
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.mcp import confluence_collector
+from app.mcp.confluence_collector import ConfluenceCollector, _INSERT_PAGE_SQL
+from app.mcp.types import ConfluencePage, PAGE_HAS_CONTENT, PAGE_HAS_LABELS, PAGE_HAS_AUTHOR
 
-from app.mcp.confluence_collector import ConfluenceCollector
-from app.mcp.types import ConfluencePage
+
+@pytest.fixture
+def memory_db():
+    """Fresh in-memory cache per test, shared by every connection that opens the URI"""
+    uri = f"file:confluence_{uuid4().hex}?mode=memory&cache=shared"
+    # The database lives only while a connection is open; this one also
+    # serves the tests' verification queries
+    conn = sqlite3.connect(uri, uri=True)
+    yield uri, conn
+    conn.close()
+
+
+@pytest.fixture
+def temp_db(memory_db):
+    """Overrides conftest's file-backed temp_db with the in-memory URI"""
+    return memory_db[0]
+
+
+@pytest.fixture
+def db_conn(memory_db):
+    return memory_db[1]
 
 
 class TestConfluenceCollectorInitialization:
     """ConfluenceCollector initialization tests"""
 
-    def test_init_creates_database(self):
+    def test_init_creates_database(self, tmp_path):
         """Database is created on initialization"""
-        tmpdir = tempfile.mkdtemp()
-        try:
-            db_path = os.path.join(tmpdir, "test.db")
-            mock_client = Mock()
-
-            collector = ConfluenceCollector(mock_client, db_path)
+        db_path = str(tmp_path / "test.db")
+        mock_client = Mock()
 
+        with ConfluenceCollector(mock_client, db_path) as collector:
             assert os.path.exists(db_path)
             assert collector.db_path == db_path
             assert collector.batch_size == 50
 
-            del collector
-        finally:
-            import shutil
-            import time
-            time.sleep(0.1)
-            try:
-                shutil.rmtree(tmpdir, ignore_errors=True)
-            except:
-                pass
-
-    def test_init_creates_schema(self):
+    def test_init_creates_schema(self, tmp_path):
         """Schema tables are created"""
-        tmpdir = tempfile.mkdtemp()
-        try:
-            db_path = os.path.join(tmpdir, "test.db")
-            mock_client = Mock()
-
-            collector = ConfluenceCollector(mock_client, db_path)
+        db_path = str(tmp_path / "test.db")
+        mock_client = Mock()
 
+        with ConfluenceCollector(mock_client, db_path):
             # Verify tables exist
             with sqlite3.connect(db_path) as conn:
                 cursor = conn.execute("""
@@ -63,36 +70,60 @@ class TestConfluenceCollectorInitialization:
                 assert result is not None
                 assert result[0] == 'confluence_pages'
 
-            del collector
-        finally:
-            import shutil
-            import time
-            time.sleep(0.1)
-            try:
-                shutil.rmtree(tmpdir, ignore_errors=True)
-            except:
-                pass
+    def test_init_accepts_memory_database(self, temp_db, db_conn):
+        """In-memory URIs are opened as URIs, not created as files"""
+        with ConfluenceCollector(Mock(), temp_db):
+            assert not os.path.exists(temp_db)
 
+            tables = {row[0] for row in db_conn.execute("SELECT name FROM sqlite_master")}
+            assert 'confluence_pages' in tables
 
-class TestConfluenceCollectorSpaces:
-    """Space listing tests"""
+    def test_connection_is_reused_until_closed(self, tmp_path):
+        """A single connection is kept open and released by close()"""
+        collector = ConfluenceCollector(Mock(), str(tmp_path / "test.db"))
 
-    @pytest.fixture
-    def temp_db(self):
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
+        conn = collector._connect()
+        assert collector._connect() is conn
 
-    @pytest.fixture
-    def mock_client(self):
-        return Mock()
+        collector.close()
+        assert collector._conn is None
+        assert collector._connect() is not conn
+
+        collector.close()
+
+    def test_unclosed_collector_is_garbage_collected(self, tmp_path):
+        """Nothing process-wide keeps a collector (or its connection) alive"""
+        collector = ConfluenceCollector(Mock(), str(tmp_path / "test.db"))
+        ref = weakref.ref(collector)
+        finalizer = collector._finalizer
+
+        del collector
+        gc.collect()
+
+        assert ref() is None
+        assert not finalizer.alive
+
+    def test_init_enables_wal(self, tmp_path):
+        """Database is switched to WAL journal mode"""
+        db_path = str(tmp_path / "test.db")
+        mock_client = Mock()
+
+        with ConfluenceCollector(mock_client, db_path):
+            with sqlite3.connect(db_path) as conn:
+                mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                assert mode == "wal"
+
+
+# MCP space listing payloads, encoded once for the module
+_SPACES_JSON = json.dumps([
+    {"key": "CS", "name": "Customer Support", "type": "global"},
+    {"key": "TECH", "name": "Technical Docs", "type": "global"}
+])
+_TEST_SPACE_JSON = json.dumps([{"key": "TEST", "name": "Test Space", "type": "global"}])
+
+
+class TestConfluenceCollectorSpaces:
+    """Space listing tests"""
 
     def test_list_spaces_success(self, temp_db, mock_client):
         """Successfully list Confluence spaces"""
@@ -102,10 +133,7 @@ class TestConfluenceCollectorSpaces:
         mock_response.content = [
             {
                 "type": "text",
-                "text": json.dumps([
-                    {"key": "CS", "name": "Customer Support", "type": "global"},
-                    {"key": "TECH", "name": "Technical Docs", "type": "global"}
-                ])
+                "text": _SPACES_JSON
             }
         ]
         mock_client.call_tool.return_value = mock_response
@@ -119,14 +147,37 @@ class TestConfluenceCollectorSpaces:
 
         mock_client.call_tool.assert_called_once()
 
-    def test_list_spaces_saves_to_cache(self, temp_db, mock_client):
+    def test_list_spaces_multiple_chunks(self, temp_db, mock_client):
+        """Split and separate JSON text chunks are both parsed"""
+        mock_response = Mock()
+        mock_response.isError = False
+        mock_client.call_tool.return_value = mock_response
+        collector = ConfluenceCollector(mock_client, temp_db)
+
+        # One document split across chunks
+        mock_response.content = [
+            {"type": "text", "text": '[{"key": "CS", "name": "Customer'},
+            {"type": "text", "text": ' Support"}]'},
+        ]
+        spaces = collector.list_spaces()
+        assert [s["key"] for s in spaces] == ["CS"]
+
+        # Independent documents per chunk
+        mock_response.content = [
+            {"type": "text", "text": '[{"key": "CS", "name": "Customer Support"}]'},
+            {"type": "text", "text": '{"key": "TECH", "name": "Technical Docs"}'},
+        ]
+        spaces = collector.list_spaces()
+        assert [s["key"] for s in spaces] == ["CS", "TECH"]
+
+    def test_list_spaces_saves_to_cache(self, temp_db, mock_client, db_conn):
         """Spaces are saved to cache"""
         mock_response = Mock()
         mock_response.isError = False
         mock_response.content = [
             {
                 "type": "text",
-                "text": json.dumps([{"key": "TEST", "name": "Test Space", "type": "global"}])
+                "text": _TEST_SPACE_JSON
             }
         ]
         mock_client.call_tool.return_value = mock_response
@@ -135,58 +186,44 @@ class TestConfluenceCollectorSpaces:
         collector.list_spaces()
 
         # Verify space is in database
-        with sqlite3.connect(temp_db) as conn:
-            cursor = conn.execute("SELECT * FROM confluence_spaces WHERE space_key = ?", ("TEST",))
-            row = cursor.fetchone()
-            assert row is not None
+        cursor = db_conn.execute("SELECT * FROM confluence_spaces WHERE space_key = ?", ("TEST",))
+        row = cursor.fetchone()
+        assert row is not None
+
+
+# Page collection fixture data, built once for the module (the tests only read it)
+_SAMPLE_PAGES = [
+    ConfluencePage(
+        id="12345",
+        title="Test Page 1",
+        space="CS",
+        content="<p>Test content</p>",
+        version=1,
+        created=datetime(2024, 1, 1),
+        updated=datetime(2024, 1, 15),
+        author="user1",
+        labels=["test", "docs"]
+    ),
+    ConfluencePage(
+        id="67890",
+        title="Test Page 2",
+        space="TECH",
+        content="<h1>Header</h1><p>More content</p>",
+        version=2,
+        created=datetime(2024, 1, 2),
+        updated=datetime(2024, 1, 16),
+        author="user2",
+        labels=["technical"]
+    )
+]
 
 
 class TestConfluenceCollectorPages:
     """Page collection tests"""
 
-    @pytest.fixture
-    def temp_db(self):
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
-
-    @pytest.fixture
-    def mock_client(self):
-        return Mock()
-
     @pytest.fixture
     def sample_pages(self):
-        return [
-            ConfluencePage(
-                id="12345",
-                title="Test Page 1",
-                space="CS",
-                content="<p>Test content</p>",
-                version=1,
-                created=datetime(2024, 1, 1),
-                updated=datetime(2024, 1, 15),
-                author="user1",
-                labels=["test", "docs"]
-            ),
-            ConfluencePage(
-                id="67890",
-                title="Test Page 2",
-                space="TECH",
-                content="<h1>Header</h1><p>More content</p>",
-                version=2,
-                created=datetime(2024, 1, 2),
-                updated=datetime(2024, 1, 16),
-                author="user2",
-                labels=["technical"]
-            )
-        ]
+        return _SAMPLE_PAGES
 
     def test_list_pages_success(self, temp_db, mock_client, sample_pages):
         """Successfully list pages"""
@@ -198,6 +235,35 @@ class TestConfluenceCollectorPages:
         assert len(pages) == 2
         mock_client.search_confluence_pages.assert_called_once()
 
+    def test_collect_pages_from_spaces_concurrently(self, temp_db, mock_client, sample_pages):
+        """Each space is listed and results are merged in space order"""
+        by_space = {page.space: [page] for page in sample_pages}
+        mock_client.search_confluence_pages.side_effect = (
+            lambda query, space, max_results: by_space[space]
+        )
+
+        collector = ConfluenceCollector(mock_client, temp_db)
+        pages = collector.collect_pages(space_keys=["TECH", "CS"], max_pages=10)
+
+        assert [page.id for page in pages] == ["67890", "12345"]
+        assert mock_client.search_confluence_pages.call_count == 2
+        assert collector.get_collection_stats()['total_pages'] == 2
+
+    def test_stream_pages_saves_in_chunks(self, temp_db, mock_client, sample_pages):
+        """Pages are saved chunk by chunk without returning them"""
+        by_space = {page.space: [page] for page in sample_pages}
+        mock_client.search_confluence_pages.side_effect = (
+            lambda query, space, max_results: by_space[space]
+        )
+
+        collector = ConfluenceCollector(mock_client, temp_db)
+        with patch.object(collector, '_save_pages', wraps=collector._save_pages) as save:
+            saved = collector.stream_pages(space_keys=["CS", "TECH"], chunk_size=1)
+
+        assert saved == 2
+        assert save.call_count == 2
+        assert collector.get_collection_stats()['total_pages'] == 2
+
     def test_get_page_content(self, temp_db, mock_client, sample_pages):
         """Get single page content"""
         mock_client.get_confluence_page.return_value = sample_pages[0]
@@ -209,23 +275,22 @@ class TestConfluenceCollectorPages:
         assert page.id == "12345"
         assert page.title == "Test Page 1"
 
+    def test_get_page_content_is_memoized(self, temp_db, mock_client, sample_pages):
+        """Repeated lookups reuse the fetched page until invalidated"""
+        mock_client.get_confluence_page.return_value = sample_pages[0]
+
+        collector = ConfluenceCollector(mock_client, temp_db)
+        assert collector.get_page_content("12345") is collector.get_page_content("12345")
+        assert mock_client.get_confluence_page.call_count == 1
+
+        collector.invalidate_page("12345")
+        collector.get_page_content("12345")
+        assert mock_client.get_confluence_page.call_count == 2
+
 
 class TestConfluenceCollectorCaching:
     """Caching tests"""
 
-    @pytest.fixture
-    def temp_db(self):
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
-
     @pytest.fixture
     def collector(self, temp_db):
         mock_client = Mock()
@@ -247,19 +312,75 @@ class TestConfluenceCollectorCaching:
             )
         ]
 
-    def test_save_to_cache(self, collector, sample_pages):
+    def test_cache_only_collector_without_client(self, temp_db, sample_pages):
+        """A collector without an MCP client can still save and read the cache"""
+        with ConfluenceCollector(db_path=temp_db) as collector:
+            assert collector.save_to_cache(sample_pages) == 1
+            assert len(collector.get_cached_pages()) == 1
+            assert collector.list_spaces() == []
+
+    def test_save_to_cache(self, collector, sample_pages, db_conn):
         """Pages are saved to cache"""
         saved_count = collector.save_to_cache(sample_pages)
 
         assert saved_count == 1
 
         # Verify data in database
-        with sqlite3.connect(collector.db_path) as conn:
-            cursor = conn.execute("SELECT * FROM confluence_pages WHERE page_id = ?", ("PAGE-100",))
-            row = cursor.fetchone()
-            assert row is not None
+        cursor = db_conn.execute("SELECT * FROM confluence_pages WHERE page_id = ?", ("PAGE-100",))
+        row = cursor.fetchone()
+        assert row is not None
+
+    def test_save_to_cache_stores_flags(self, collector, sample_pages):
+        """Content/label/author flags are stored and filterable in SQLite"""
+        empty_page = ConfluencePage(id="PAGE-101", title="Empty page", space="CS", version=1)
+        collector.save_to_cache(sample_pages + [empty_page])
+
+        assert sample_pages[0].flags == PAGE_HAS_CONTENT | PAGE_HAS_LABELS | PAGE_HAS_AUTHOR
+        assert empty_page.flags == 0
+
+        pages = collector.get_cached_pages(require_flags=PAGE_HAS_CONTENT)
+        assert [page['page_id'] for page in pages] == ["PAGE-100"]
+
+    def test_flags_column_added_to_existing_cache(self, temp_db, sample_pages, db_conn):
+        """Caches created before the flags column are migrated and backfilled"""
+        with ConfluenceCollector(db_path=temp_db) as collector:
+            collector.save_to_cache(sample_pages)
+
+        db_conn.execute("ALTER TABLE confluence_pages DROP COLUMN flags")
 
-    def test_save_to_cache_batch_processing(self, collector):
+        with ConfluenceCollector(db_path=temp_db) as collector:
+            pages = collector.get_cached_pages(require_flags=PAGE_HAS_CONTENT | PAGE_HAS_AUTHOR)
+            assert len(pages) == 1
+            assert pages[0]['flags'] == sample_pages[0].flags
+
+    def test_save_to_cache_skip_unchanged(self, collector, sample_pages, db_conn):
+        """Pages whose version did not increase are not rewritten"""
+        collector.save_to_cache(sample_pages)
+
+        assert collector.save_to_cache(sample_pages, skip_unchanged=True) == 0
+
+        sample_pages[0].version = 2
+        sample_pages[0].title = "Edited page"
+        assert collector.save_to_cache(sample_pages, skip_unchanged=True) == 1
+
+        row = db_conn.execute("SELECT title, version FROM confluence_pages").fetchone()
+        assert row == ("Edited page", 2)
+
+    def test_save_to_cache_raw_data_opt_in(self, temp_db, sample_pages, db_conn):
+        """raw_data is only stored when store_raw is enabled"""
+        collector = ConfluenceCollector(Mock(), temp_db)
+        collector.save_to_cache(sample_pages)
+
+        row = db_conn.execute("SELECT body_view, raw_data FROM confluence_pages").fetchone()
+        assert row == (None, None)
+
+        raw_collector = ConfluenceCollector(Mock(), temp_db, store_raw=True)
+        raw_collector.save_to_cache(sample_pages)
+
+        raw_data = db_conn.execute("SELECT raw_data FROM confluence_pages").fetchone()[0]
+        assert json.loads(raw_data)["id"] == "PAGE-100"
+
+    def test_save_to_cache_batch_processing(self, collector, db_conn):
         """Batch processing works correctly"""
         # Create 150 pages (3 batches of 50)
         pages = [
@@ -282,93 +403,170 @@ class TestConfluenceCollectorCaching:
         assert saved_count == 150
 
         # Verify all saved
-        with sqlite3.connect(collector.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM confluence_pages")
-            count = cursor.fetchone()[0]
-            assert count == 150
+        cursor = db_conn.execute("SELECT COUNT(*) FROM confluence_pages")
+        count = cursor.fetchone()[0]
+        assert count == 150
+
+    def test_save_to_cache_producer_error_rolls_back(self, collector, sample_pages, db_conn):
+        """A failure while preparing rows aborts the save without partial writes"""
+        pages = sample_pages * 120
+
+        with patch.object(collector, '_page_to_row', side_effect=ValueError("bad page")):
+            with pytest.raises(ValueError):
+                collector.save_to_cache(pages)
+
+        assert db_conn.execute("SELECT COUNT(*) FROM confluence_pages").fetchone()[0] == 0
+
+    def test_readers_do_not_commit_open_transaction(self, collector, sample_pages, db_conn):
+        """Readers on the shared connection leave a writer's transaction open"""
+        conn = collector._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(_INSERT_PAGE_SQL, collector._page_to_row(sample_pages[0], "Test"))
+
+        collector.get_last_sync_time()
+        collector.get_cached_versions()
+        collector.get_cached_pages()
+        collector.save_to_cache(sample_pages, skip_unchanged=True)
+
+        assert conn.in_transaction
+        conn.execute("ROLLBACK")
+        assert db_conn.execute("SELECT COUNT(*) FROM confluence_pages").fetchone()[0] == 0
+
+    def test_save_to_cache_bulk_rebuilds_indexes(self, collector, sample_pages, db_conn):
+        """Bulk saves drop and recreate the secondary indexes"""
+        def page_indexes():
+            return sorted(row[0] for row in db_conn.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type = 'index' AND tbl_name = 'confluence_pages' AND sql IS NOT NULL
+            """))
+
+        before = page_indexes()
+        assert collector.save_to_cache(sample_pages, bulk=True) == 1
+        assert page_indexes() == before
+
+        with patch.object(collector, '_page_to_row', side_effect=ValueError("bad page")):
+            with pytest.raises(ValueError):
+                collector.save_to_cache(sample_pages, bulk=True)
+        assert page_indexes() == before
+
+    def test_save_to_cache_parallel_cleaning(self, collector, db_conn):
+        """Large batches are cleaned in a process pool"""
+        pages = [
+            ConfluencePage(
+                id=f"PAGE-{i}",
+                title=f"Page {i}",
+                space="CS",
+                content=f"<p>Content</p><script>x()</script><p>{i}</p>" if i % 2 else None,
+                version=1,
+                created=datetime(2024, 1, 1),
+                updated=datetime(2024, 1, 10),
+                author="user1",
+                labels=[]
+            )
+            for i in range(250)
+        ]
+
+        with patch.object(ProcessPoolExecutor, 'map', autospec=True,
+                          side_effect=ProcessPoolExecutor.map) as pool_map, \
+                patch('app.mcp.confluence_collector.logger') as log:
+            saved_count = collector.save_to_cache(pages)
+
+        assert saved_count == 250
+
+        # The pool really cleaned the batch (no silent serial fallback), with
+        # workers that are not fork()ed from this multi-threaded process
+        pool_map.assert_called_once()
+        log.warning.assert_not_called()
+        assert pool_map.call_args.args[0]._mp_context.get_start_method() != "fork"
+
+        rows = dict(db_conn.execute("SELECT page_id, body_cleaned FROM confluence_pages"))
+        assert rows["PAGE-1"] == "Content 1"
+        assert rows["PAGE-0"] is None
+
+    def test_stream_pages_shares_one_cleaning_pool(self, collector):
+        """stream_pages creates one process pool for all of its chunks"""
+        pages = [
+            ConfluencePage(id=f"PAGE-{i}", title=f"Page {i}", space="CS",
+                           content=f"<p>{i}</p>", version=1)
+            for i in range(400)
+        ]
+
+        with patch.object(collector, 'iter_pages', return_value=iter(pages)), \
+                patch('app.mcp.confluence_collector._cleaning_pool',
+                      wraps=confluence_collector._cleaning_pool) as make_pool:
+            saved = collector.stream_pages(chunk_size=200)
+
+        assert saved == 400
+        make_pool.assert_called_once()
 
 
 class TestConfluenceCollectorHTMLCleaning:
     """HTML cleanup tests"""
 
-    @pytest.fixture
-    def temp_db(self):
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
-
-    def test_clean_html_removes_scripts(self, temp_db):
+    def test_clean_html_removes_scripts(self):
         """Scripts are removed from HTML"""
-        mock_client = Mock()
-        collector = ConfluenceCollector(mock_client, temp_db)
-
         html = "<p>Text</p><script>alert('test')</script><p>More text</p>"
-        cleaned = collector.clean_html(html)
+        cleaned = ConfluenceCollector.clean_html(html)
 
         assert "script" not in cleaned.lower()
         assert "alert" not in cleaned.lower()
         assert "Text" in cleaned
         assert "More text" in cleaned
 
-    def test_clean_html_removes_styles(self, temp_db):
+    def test_clean_html_removes_styles(self):
         """Styles are removed from HTML"""
-        mock_client = Mock()
-        collector = ConfluenceCollector(mock_client, temp_db)
-
         html = "<p>Text</p><style>.class { color: red; }</style><p>More</p>"
-        cleaned = collector.clean_html(html)
+        cleaned = ConfluenceCollector.clean_html(html)
 
         assert "style" not in cleaned.lower()
         assert "color" not in cleaned.lower()
         assert "Text" in cleaned
 
-    def test_clean_html_normalizes_whitespace(self, temp_db):
+    def test_clean_html_normalizes_whitespace(self):
         """Whitespace is normalized"""
-        mock_client = Mock()
-        collector = ConfluenceCollector(mock_client, temp_db)
-
         html = "<p>Text   with    multiple     spaces</p>"
-        cleaned = collector.clean_html(html)
+        cleaned = ConfluenceCollector.clean_html(html)
 
         # Multiple spaces should be collapsed
         assert "   " not in cleaned
 
-    def test_clean_html_extracts_text(self, temp_db):
+    def test_clean_html_extracts_text(self):
         """Text is extracted from HTML"""
-        mock_client = Mock()
-        collector = ConfluenceCollector(mock_client, temp_db)
-
         html = "<div><h1>Title</h1><p>Paragraph with <b>bold</b> text</p></div>"
-        cleaned = collector.clean_html(html)
+        cleaned = ConfluenceCollector.clean_html(html)
 
         assert "Title" in cleaned
         assert "Paragraph" in cleaned
         assert "bold" in cleaned
 
+    def test_clean_html_removes_comments(self):
+        """Comments are removed and adjacent blocks stay separated"""
+        html = "<!-- hidden note --><h1>Title</h1><p>Body</p>"
+        cleaned = ConfluenceCollector.clean_html(html)
+
+        assert cleaned == "Title Body"
+
+
+# Stats fixture data, built once for the module (save_to_cache does not modify pages)
+_STATS_PAGES = [
+    ConfluencePage(
+        id=f"PAGE-{i}",
+        title=f"Page {i}",
+        space="CS" if i % 2 == 0 else "TECH",
+        content=f"<p>Content {i}</p>",
+        version=1,
+        created=datetime(2024, 1, i % 28 + 1),
+        updated=datetime(2024, 1, i % 28 + 1),
+        author="user1",
+        labels=[]
+    )
+    for i in range(10)
+]
+
 
 class TestConfluenceCollectorStats:
     """Statistics tests"""
 
-    @pytest.fixture
-    def temp_db(self):
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
-
     @pytest.fixture
     def collector_with_data(self, temp_db):
         """Collector with test data"""
@@ -376,21 +574,7 @@ class TestConfluenceCollectorStats:
         collector = ConfluenceCollector(mock_client, temp_db)
 
         # Add test data
-        pages = [
-            ConfluencePage(
-                id=f"PAGE-{i}",
-                title=f"Page {i}",
-                space="CS" if i % 2 == 0 else "TECH",
-                content=f"<p>Content {i}</p>",
-                version=1,
-                created=datetime(2024, 1, i % 28 + 1),
-                updated=datetime(2024, 1, i % 28 + 1),
-                author="user1",
-                labels=[]
-            )
-            for i in range(10)
-        ]
-        collector.save_to_cache(pages)
+        collector.save_to_cache(_STATS_PAGES)
 
         return collector
 
@@ -419,6 +603,59 @@ class TestConfluenceCollectorStats:
         assert len(pages) == 5
         assert all(page['space_key'] == 'CS' for page in pages)
 
+    def test_get_cached_versions(self, collector_with_data):
+        """Cached versions are keyed by page ID"""
+        versions = collector_with_data.get_cached_versions(space_key="CS")
+
+        assert len(versions) == 5
+        assert versions["PAGE-0"] == 1
+        assert "PAGE-1" not in versions
+
+    def test_is_cache_empty(self, collector_with_data):
+        """Emptiness is a cheap check that raises on errors instead of reporting empty"""
+        assert not collector_with_data.is_cache_empty()
+
+        collector_with_data.clear_cache()
+        assert collector_with_data.is_cache_empty()
+
+        with collector_with_data._lock:
+            collector_with_data._connect().execute("DROP TABLE confluence_pages")
+        with pytest.raises(sqlite3.Error):
+            collector_with_data.is_cache_empty()
+
+    def test_iter_cached_pages_streams_in_chunks(self, collector_with_data):
+        """Cached pages are streamed across multiple fetch chunks"""
+        pages = collector_with_data.iter_cached_pages(limit=10, chunk_size=3)
+
+        assert not isinstance(pages, list)
+        page_ids = [page['page_id'] for page in pages]
+        assert len(page_ids) == 10
+        assert len(set(page_ids)) == 10
+
+    def test_iter_cached_pages_is_stable_across_writes(self, collector_with_data):
+        """Writes between chunks neither skip nor repeat rows (ties and NULL dates included)"""
+        extra = [
+            _STATS_PAGES[0].model_copy(update={"id": f"TIE-{i}", "updated": datetime(2024, 1, 3)})
+            for i in range(3)
+        ] + [
+            _STATS_PAGES[0].model_copy(update={"id": f"UNDATED-{i}", "updated": None})
+            for i in range(3)
+        ]
+        collector_with_data.save_to_cache(extra)
+
+        pages = collector_with_data.iter_cached_pages(limit=100, chunk_size=2)
+        page_ids = [next(pages)["page_id"] for _ in range(2)]
+
+        # A newer page lands ahead of the read position after the first chunk
+        collector_with_data.save_to_cache([
+            _STATS_PAGES[0].model_copy(update={"id": "NEWEST", "updated": datetime(2025, 1, 1)})
+        ])
+        page_ids += [page["page_id"] for page in pages]
+
+        assert "NEWEST" not in page_ids
+        assert len(page_ids) == len(set(page_ids)) == 16
+        assert page_ids[-3:] == ["UNDATED-2", "UNDATED-1", "UNDATED-0"]
+
     def test_clear_cache(self, collector_with_data):
         """Clear cache removes all data"""
         stats = collector_with_data.get_collection_stats()
@@ -429,6 +666,16 @@ class TestConfluenceCollectorStats:
         stats = collector_with_data.get_collection_stats()
         assert stats['total_pages'] == 0
 
+    def test_vacuum(self, collector_with_data, db_conn):
+        """Vacuum keeps data and records planner statistics"""
+        collector_with_data.vacuum()
+
+        stats = collector_with_data.get_collection_stats()
+        assert stats['total_pages'] == 10
+
+        cursor = db_conn.execute("SELECT COUNT(*) FROM sqlite_stat1")
+        assert cursor.fetchone()[0] > 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
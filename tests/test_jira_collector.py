@@ -3,61 +3,66 @@ Unit Tests for Jira Collector
 
 Tests for Jira data collection and SQLite caching
 """
+import gc
 import pytest
 import sqlite3
 import json
-import tempfile
 import os
+import threading
+import weakref
 from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from app.mcp.jira_collector import JiraCollector
+from app.mcp.jira_collector import JiraCollector, _decode_raw, _INSERT_ISSUE_SQL
 from app.mcp.types import JiraIssue
 
 
+# Shared seed timestamps (datetimes are immutable, so sharing is safe)
+_CREATED = datetime(2024, 1, 1)
+_UPDATED = datetime(2024, 1, 10)
+_DATES = tuple(datetime(2024, 1, d + 1) for d in range(28))
+
+# Bulk seed issues are copies of this template (model_copy skips validation)
+_TEMPLATE_ISSUE = JiraIssue(
+    key="PROJ-0",
+    summary="",
+    status="Done",
+    created=_CREATED,
+    updated=_UPDATED,
+    issue_type="Bug",
+    labels=[],
+    components=[]
+)
+
+
+def _template_issues(count):
+    """count issues PROJ-0..PROJ-{count-1} built from _TEMPLATE_ISSUE"""
+    return [
+        _TEMPLATE_ISSUE.model_copy(update={"key": f"PROJ-{i}", "summary": f"Issue {i}"})
+        for i in range(count)
+    ]
+
+
 class TestJiraCollectorInitialization:
     """JiraCollector initialization tests"""
 
-    def test_init_creates_database(self):
+    def test_init_creates_database(self, temp_db):
         """Database is created on initialization"""
-        tmpdir = tempfile.mkdtemp()
-        try:
-            db_path = os.path.join(tmpdir, "test.db")
-            mock_client = Mock()
-
-            collector = JiraCollector(mock_client, db_path)
+        mock_client = Mock()
 
-            assert os.path.exists(db_path)
-            assert collector.db_path == db_path
+        with JiraCollector(mock_client, temp_db) as collector:
+            assert os.path.exists(temp_db)
+            assert collector.db_path == temp_db
             assert collector.batch_size == 50
 
-            # Close any open connections
-            del collector
-        finally:
-            # Cleanup
-            import shutil
-            import time
-            time.sleep(0.1)  # Give time for file handles to close
-            try:
-                shutil.rmtree(tmpdir, ignore_errors=True)
-            except:
-                pass
-
-    def test_init_creates_schema(self):
+    def test_init_creates_schema(self, temp_db):
         """Schema tables are created"""
-        tmpdir = tempfile.mkdtemp()
-        try:
-            db_path = os.path.join(tmpdir, "test.db")
-            mock_client = Mock()
-
-            collector = JiraCollector(mock_client, db_path)
+        mock_client = Mock()
 
+        with JiraCollector(mock_client, temp_db):
             # Verify tables exist
-            with sqlite3.connect(db_path) as conn:
+            with sqlite3.connect(temp_db) as conn:
                 cursor = conn.execute("""
                     SELECT name FROM sqlite_master
                     WHERE type='table' AND name='jira_issues'
@@ -66,41 +71,38 @@ class TestJiraCollectorInitialization:
                 assert result is not None
                 assert result[0] == 'jira_issues'
 
-            # Close collector
-            del collector
-        finally:
-            import shutil
-            import time
-            time.sleep(0.1)
-            try:
-                shutil.rmtree(tmpdir, ignore_errors=True)
-            except:
-                pass
+    def test_init_enables_wal(self, temp_db):
+        """Database is switched to WAL journal mode"""
+        mock_client = Mock()
 
+        with JiraCollector(mock_client, temp_db):
+            with sqlite3.connect(temp_db) as conn:
+                mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                assert mode == "wal"
 
-class TestJiraCollectorDataCollection:
-    """Data collection tests"""
+    def test_context_manager_closes_connection(self, temp_db):
+        """A single connection is reused and released on exit"""
+        with JiraCollector(Mock(), temp_db) as collector:
+            conn = collector._connect()
+            assert collector._connect() is conn
 
-    @pytest.fixture
-    def temp_db(self):
-        """Create temporary database"""
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        # Cleanup after test
-        import shutil
-        import time
-        time.sleep(0.1)  # Give time for connections to close
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
+        assert collector._conn is None
 
-    @pytest.fixture
-    def mock_client(self):
-        """Create mock MCP client"""
-        client = Mock()
-        return client
+    def test_unclosed_collector_is_garbage_collected(self, temp_db):
+        """Nothing process-wide keeps a collector (or its connection) alive"""
+        collector = JiraCollector(Mock(), temp_db)
+        ref = weakref.ref(collector)
+        finalizer = collector._finalizer
+
+        del collector
+        gc.collect()
+
+        assert ref() is None
+        assert not finalizer.alive
+
+
+class TestJiraCollectorDataCollection:
+    """Data collection tests"""
 
     @pytest.fixture
     def sample_issues(self):
@@ -114,7 +116,7 @@ class TestJiraCollectorDataCollection:
                 priority="High",
                 assignee="user1",
                 reporter="user2",
-                created=datetime(2024, 1, 1),
+                created=_CREATED,
                 updated=datetime(2024, 1, 15),
                 issue_type="Bug",
                 labels=["bug", "critical"],
@@ -138,7 +140,7 @@ class TestJiraCollectorDataCollection:
 
     def test_collect_issues_success(self, temp_db, mock_client, sample_issues):
         """Successfully collect and save issues"""
-        mock_client.search_jira_issues.return_value = sample_issues
+        mock_client.iter_search_jira_issues.return_value = iter(sample_issues)
 
         collector = JiraCollector(mock_client, temp_db)
         issues = collector.collect_issues(jql="project = PROJ", max_results=100)
@@ -148,11 +150,11 @@ class TestJiraCollectorDataCollection:
         assert issues[1].key == "PROJ-2"
 
         # Verify MCP client was called
-        mock_client.search_jira_issues.assert_called_once()
+        mock_client.iter_search_jira_issues.assert_called_once()
 
     def test_collect_issues_with_project_filter(self, temp_db, mock_client, sample_issues):
         """Collect issues with project filter"""
-        mock_client.search_jira_issues.return_value = sample_issues
+        mock_client.iter_search_jira_issues.return_value = iter(sample_issues)
 
         collector = JiraCollector(mock_client, temp_db)
         issues = collector.collect_issues(project="PROJ", max_results=100)
@@ -160,7 +162,7 @@ class TestJiraCollectorDataCollection:
         assert len(issues) == 2
 
         # Verify JQL was built correctly
-        call_args = mock_client.search_jira_issues.call_args
+        call_args = mock_client.iter_search_jira_issues.call_args
         assert "project = PROJ" in call_args.kwargs['jql']
 
     def test_get_issue_details(self, temp_db, mock_client, sample_issues):
@@ -176,29 +178,39 @@ class TestJiraCollectorDataCollection:
 
         mock_client.get_jira_issue.assert_called_once_with("PROJ-1")
 
+    def test_get_issue_details_many(self, temp_db, mock_client, sample_issues):
+        """Several issues are fetched and cached in one save"""
+        by_key = {issue.key: issue for issue in sample_issues}
+        mock_client.get_jira_issue.side_effect = lambda key: by_key.get(key)
+
+        collector = JiraCollector(mock_client, temp_db)
+        with patch.object(collector, 'save_to_cache', wraps=collector.save_to_cache) as mock_save:
+            issues = collector.get_issue_details_many(["PROJ-1", "MISSING-1", "PROJ-2"])
+
+        assert [issue.key for issue in issues] == ["PROJ-1", "PROJ-2"]
+        mock_save.assert_called_once()
+        assert len(collector.get_cached_issues()) == 2
+
+    def test_stream_issues_saves_without_list(self, temp_db, mock_client, sample_issues):
+        """Streamed issues are saved from a generator"""
+        mock_client.iter_search_jira_issues.return_value = (i for i in sample_issues)
+
+        collector = JiraCollector(mock_client, temp_db)
+        saved_count = collector.stream_issues(jql="project = PROJ")
+
+        assert saved_count == 2
+        assert len(collector.get_cached_issues()) == 2
+
 
 class TestJiraCollectorCaching:
     """SQLite caching tests"""
 
-    @pytest.fixture
-    def temp_db(self):
-        """Create temporary database"""
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
-
     @pytest.fixture
     def collector(self, temp_db):
         """Create collector with temp database"""
         mock_client = Mock()
-        return JiraCollector(mock_client, temp_db)
+        with JiraCollector(mock_client, temp_db) as collector:
+            yield collector
 
     @pytest.fixture
     def sample_issues(self):
@@ -208,14 +220,25 @@ class TestJiraCollectorCaching:
                 key="PROJ-100",
                 summary="Cached issue",
                 status="Done",
-                created=datetime(2024, 1, 1),
-                updated=datetime(2024, 1, 10),
+                created=_CREATED,
+                updated=_UPDATED,
                 issue_type="Bug",
                 labels=["test"],
                 components=[]
             )
         ]
 
+    def test_cache_only_collector_without_client(self, temp_db, sample_issues):
+        """A collector without an MCP client can use the cache but not fetch"""
+        with JiraCollector(db_path=temp_db) as collector:
+            assert collector.save_to_cache(sample_issues) == 1
+            assert len(collector.get_cached_issues()) == 1
+
+            with pytest.raises(RuntimeError, match="without an MCP client"):
+                collector.collect_issues(jql="project = PROJ")
+            with pytest.raises(RuntimeError, match="without an MCP client"):
+                collector.get_issue_details_many(["PROJ-100"])
+
     def test_save_to_cache(self, collector, sample_issues):
         """Issues are saved to cache"""
         saved_count = collector.save_to_cache(sample_issues)
@@ -234,19 +257,7 @@ class TestJiraCollectorCaching:
     def test_save_to_cache_batch_processing(self, collector):
         """Batch processing works correctly"""
         # Create 150 issues (3 batches of 50)
-        issues = [
-            JiraIssue(
-                key=f"PROJ-{i}",
-                summary=f"Issue {i}",
-                status="Done",
-                created=datetime(2024, 1, 1),
-                updated=datetime(2024, 1, 10),
-                issue_type="Bug",
-                labels=[],
-                components=[]
-            )
-            for i in range(150)
-        ]
+        issues = _template_issues(150)
 
         saved_count = collector.save_to_cache(issues)
 
@@ -265,6 +276,7 @@ class TestJiraCollectorCaching:
 
         # Modify and save again
         sample_issues[0].summary = "Updated summary"
+        sample_issues[0].updated = datetime(2024, 2, 1)
         collector.save_to_cache(sample_issues)
 
         # Verify only one record exists with updated data
@@ -278,59 +290,158 @@ class TestJiraCollectorCaching:
             cursor = conn.execute("SELECT COUNT(*) FROM jira_issues")
             assert cursor.fetchone()[0] == 1
 
-    def test_save_to_cache_error_handling(self, collector):
-        """Errors in single issue don't stop batch"""
-        issues = [
-            JiraIssue(
-                key=f"PROJ-{i}",
-                summary=f"Issue {i}",
-                status="Done",
-                created=datetime(2024, 1, 1),
-                updated=datetime(2024, 1, 10),
-                issue_type="Bug",
-                labels=[],
-                components=[]
-            )
-            for i in range(5)
-        ]
+    def test_save_to_cache_upsert_skips_unchanged(self, collector, sample_issues):
+        """Re-saving an issue with the same updated timestamp is a no-op"""
+        collector.save_to_cache(sample_issues)
+
+        sample_issues[0].summary = "Stale summary"
+        collector.save_to_cache(sample_issues)
+
+        with sqlite3.connect(collector.db_path) as conn:
+            row = conn.execute("SELECT summary FROM jira_issues WHERE issue_key = ?", ("PROJ-100",)).fetchone()
+
+        assert row[0] != "Stale summary"
+
+    def test_save_to_cache_counts_only_changed(self, collector, sample_issues):
+        """Issues with an unchanged updated timestamp are not rewritten"""
+        assert collector.save_to_cache(sample_issues) == 1
+        assert collector.save_to_cache(sample_issues) == 0
+
+        sample_issues[0].updated = datetime(2024, 3, 1, 12, 30)
+        assert collector.save_to_cache(sample_issues) == 1
+
+    def test_save_to_cache_large_batch_uses_temp_table(self, collector):
+        """Unchanged detection works for batches above the parameter limit"""
+        issues = _template_issues(1200)
+        collector.batch_size = 1200
+
+        assert collector.save_to_cache(issues) == 1200
+
+        issues[7].updated = datetime(2024, 2, 1)
+        assert collector.save_to_cache(issues) == 1
+
+    def test_save_to_cache_many_sources(self, collector):
+        """Issues from several sources are saved in one pipeline"""
+        def page(start):
+            for i in range(start, start + 30):
+                yield JiraIssue(
+                    key=f"PROJ-{i}",
+                    summary=f"Issue {i}",
+                    status="Done",
+                    updated=_UPDATED,
+                )
+
+        saved_count = collector.save_to_cache_many_sources([page(0), page(30), page(60)])
+
+        assert saved_count == 90
+        assert collector.get_collection_stats()["total_issues"] == 90
+
+    def test_save_to_cache_source_reading_the_cache(self, collector):
+        """A source that reads the collector mid-save does not deadlock"""
+        seen = []
+
+        def source():
+            for i in range(120):
+                if i == 60:
+                    # Runs on the producer thread while batches are being written
+                    seen.append(collector.get_cached_issues(limit=1))
+                yield JiraIssue(key=f"PROJ-{i}", summary=f"Issue {i}", status="Done", updated=_UPDATED)
+
+        result = []
+        saver = threading.Thread(target=lambda: result.append(collector.save_to_cache(source())), daemon=True)
+        saver.start()
+        saver.join(timeout=10)
+
+        assert not saver.is_alive(), "save_to_cache deadlocked on a re-entrant source"
+        assert result == [120]
+        assert len(seen) == 1
+
+    def test_save_to_cache_source_error_is_raised(self, collector, sample_issues):
+        """A failing source stops the save and the error propagates"""
+        def failing_source():
+            yield sample_issues[0]
+            raise RuntimeError("fetch failed")
+
+        with pytest.raises(RuntimeError):
+            collector.save_to_cache(failing_source())
+
+    def test_save_to_cache_compresses_raw_data(self, collector, sample_issues):
+        """raw_data is stored as a compressed BLOB"""
+        collector.save_to_cache(sample_issues)
+
+        with sqlite3.connect(collector.db_path) as conn:
+            raw, kind = conn.execute(
+                "SELECT raw_data, typeof(raw_data) FROM jira_issues"
+            ).fetchone()
+
+        assert kind == "blob"
+        assert _decode_raw(raw)["key"] == "PROJ-100"
+
+    def test_legacy_text_raw_data_is_migrated(self, temp_db, sample_issues):
+        """Rows with JSON TEXT raw_data are compressed on open"""
+        collector = JiraCollector(Mock(), temp_db)
+        collector.save_to_cache(sample_issues)
+        collector.close()
+
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("UPDATE jira_issues SET raw_data = ?", (json.dumps({"key": "PROJ-100"}),))
+            conn.execute("PRAGMA user_version = 0")
+
+        collector = JiraCollector(Mock(), temp_db)
+        collector.close()
+
+        with sqlite3.connect(temp_db) as conn:
+            raw, kind = conn.execute(
+                "SELECT raw_data, typeof(raw_data) FROM jira_issues"
+            ).fetchone()
+
+        assert kind == "blob"
+        assert _decode_raw(raw) == {"key": "PROJ-100"}
+
+    def test_readers_do_not_commit_open_transaction(self, collector, sample_issues):
+        """A reader on the shared connection leaves a writer's transaction open"""
+        conn = collector._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(_INSERT_ISSUE_SQL, collector._issue_to_row(sample_issues[0]))
 
-        # Mock to simulate error on one issue
-        with patch.object(collector, '_save_single_issue') as mock_save:
-            # Make second call raise exception
-            mock_save.side_effect = [
-                None,  # Success
-                Exception("Test error"),  # Failure
-                None,  # Success
-                None,  # Success
-                None,  # Success
-            ]
-
-            # Should continue despite error
+        collector.get_last_sync_time()
+        collector.get_cached_issues()
+        collector.get_label_distribution()
+
+        assert conn.in_transaction
+        conn.execute("ROLLBACK")
+        assert collector.get_cached_issues() == []
+
+    def test_save_to_cache_error_handling(self, collector, temp_db):
+        """Errors in one batch don't stop the other batches"""
+        issues = _template_issues(120)
+
+        original_to_row = collector._issue_to_row
+
+        def failing_to_row(issue):
+            if issue.key == "PROJ-60":
+                raise Exception("Test error")
+            return original_to_row(issue)
+
+        # Batch size 50: the second batch (PROJ-50..99) fails and is rolled back
+        with patch.object(collector, '_issue_to_row', side_effect=failing_to_row):
             saved_count = collector.save_to_cache(issues)
 
-            # All issues attempted (errors are logged but don't increment count)
-            assert mock_save.call_count == 5
+        assert saved_count == 70
 
+        conn = sqlite3.connect(temp_db)
+        count = conn.execute("SELECT COUNT(*) FROM jira_issues").fetchone()[0]
+        missing = conn.execute(
+            "SELECT COUNT(*) FROM jira_issues WHERE issue_key = 'PROJ-60'"
+        ).fetchone()[0]
+        conn.close()
 
-class TestJiraCollectorIncrementalUpdate:
-    """Incremental update tests"""
+        assert count == 70
+        assert missing == 0
 
-    @pytest.fixture
-    def temp_db(self):
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
 
-    @pytest.fixture
-    def mock_client(self):
-        return Mock()
+class TestJiraCollectorIncrementalUpdate:
+    """Incremental update tests"""
 
     def test_incremental_update(self, temp_db, mock_client):
         """Incremental update fetches recent issues"""
@@ -339,7 +450,7 @@ class TestJiraCollectorIncrementalUpdate:
                 key="PROJ-10",
                 summary="Recent issue",
                 status="Done",
-                created=datetime(2024, 1, 1),
+                created=_CREATED,
                 updated=datetime.now(),
                 issue_type="Bug",
                 labels=[],
@@ -347,7 +458,7 @@ class TestJiraCollectorIncrementalUpdate:
             )
         ]
 
-        mock_client.search_jira_issues.return_value = recent_issues
+        mock_client.iter_search_jira_issues.return_value = iter(recent_issues)
 
         collector = JiraCollector(mock_client, temp_db)
         issues = collector.incremental_update(since_hours=24)
@@ -355,7 +466,7 @@ class TestJiraCollectorIncrementalUpdate:
         assert len(issues) == 1
 
         # Verify JQL contains time filter
-        call_args = mock_client.search_jira_issues.call_args
+        call_args = mock_client.iter_search_jira_issues.call_args
         jql = call_args.kwargs['jql']
         assert "updated >= -24h" in jql
 
@@ -373,8 +484,8 @@ class TestJiraCollectorIncrementalUpdate:
                 key="PROJ-1",
                 summary="Test",
                 status="Done",
-                created=datetime(2024, 1, 1),
-                updated=datetime(2024, 1, 10),
+                created=_CREATED,
+                updated=_UPDATED,
                 issue_type="Bug",
                 labels=[],
                 components=[]
@@ -387,45 +498,37 @@ class TestJiraCollectorIncrementalUpdate:
         assert last_sync is not None
 
 
-class TestJiraCollectorStats:
-    """Statistics and query tests"""
-
-    @pytest.fixture
-    def temp_db(self):
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
-
-    @pytest.fixture
-    def collector_with_data(self, temp_db):
-        """Collector with test data"""
-        mock_client = Mock()
-        collector = JiraCollector(mock_client, temp_db)
-
-        # Add test data
-        issues = [
+@pytest.fixture(scope="module")
+def stats_template():
+    """In-memory cache with 10 issues, built once and cloned per test via backup()"""
+    with JiraCollector(Mock(), ":memory:") as template:
+        template.save_to_cache([
             JiraIssue(
                 key=f"PROJ-{i}",
                 summary=f"Issue {i}",
                 status="Done" if i % 2 == 0 else "In Progress",
-                created=datetime(2024, 1, i % 28 + 1),
-                updated=datetime(2024, 1, i % 28 + 1),
+                created=_DATES[i % 28],
+                updated=_DATES[i % 28],
                 issue_type="Bug",
                 labels=[],
                 components=[]
             )
             for i in range(10)
-        ]
-        collector.save_to_cache(issues)
+        ])
+        yield template._connect()
 
-        return collector
+
+class TestJiraCollectorStats:
+    """Statistics and query tests"""
+
+    @pytest.fixture
+    def collector_with_data(self, stats_template):
+        """Collector with test data, cloned from the module template"""
+        collector = JiraCollector(Mock(), ":memory:")
+        stats_template.backup(collector._connect())
+
+        yield collector
+        collector.close()
 
     def test_get_collection_stats(self, collector_with_data):
         """Collection statistics are correct"""
@@ -452,6 +555,21 @@ class TestJiraCollectorStats:
         assert len(issues) == 5
         assert all(issue['status'] == 'Done' for issue in issues)
 
+    def test_get_cached_issues_projection(self, collector_with_data):
+        """Default rows skip large columns; fields returns tuples"""
+        issues = collector_with_data.get_cached_issues(limit=1)
+        assert 'raw_data' not in issues[0]
+        assert 'description' not in issues[0]
+
+        rows = collector_with_data.get_cached_issues(
+            status="Done", limit=10, fields=["issue_key", "status"]
+        )
+        assert len(rows) == 5
+        assert all(row[1] == 'Done' for row in rows)
+
+        with pytest.raises(ValueError):
+            collector_with_data.get_cached_issues(fields=["issue_key; DROP TABLE jira_issues"])
+
     def test_clear_cache(self, collector_with_data):
         """Clear cache removes all data"""
         # Verify data exists
@@ -465,23 +583,39 @@ class TestJiraCollectorStats:
         stats = collector_with_data.get_collection_stats()
         assert stats['total_issues'] == 0
 
+    def test_get_label_distribution(self, temp_db):
+        """Labels are counted across issues from the stored JSON arrays"""
+        issues = [
+            JiraIssue(key="PROJ-1", summary="A", status="Done", labels=["login", "api"]),
+            JiraIssue(key="PROJ-2", summary="B", status="Done", labels=["login"]),
+            JiraIssue(key="PROJ-3", summary="C", status="Done", labels=[]),
+        ]
+
+        with JiraCollector(Mock(), temp_db) as collector:
+            collector.save_to_cache(issues)
+            assert collector.get_label_distribution() == {"login": 2, "api": 1}
+            assert collector.get_label_distribution(limit=1) == {"login": 2}
+
+    def test_vacuum_migrates_page_size(self, temp_db):
+        """New caches use 32K pages and vacuum migrates older 4K caches"""
+        with JiraCollector(None, temp_db) as collector:
+            assert collector._connect().execute("PRAGMA page_size").fetchone()[0] == 32768
+
+        legacy_path = temp_db + ".legacy"
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute("PRAGMA page_size=4096")
+            conn.execute("CREATE TABLE legacy (id INTEGER)")
+
+        with JiraCollector(None, legacy_path) as collector:
+            collector.vacuum()
+            conn = collector._connect()
+            assert conn.execute("PRAGMA page_size").fetchone()[0] == 32768
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
 
 class TestJiraCollectorJQLBuilder:
     """JQL query builder tests"""
 
-    @pytest.fixture
-    def temp_db(self):
-        tmpdir = tempfile.mkdtemp()
-        db_path = os.path.join(tmpdir, "test.db")
-        yield db_path
-        import shutil
-        import time
-        time.sleep(0.1)
-        try:
-            shutil.rmtree(tmpdir, ignore_errors=True)
-        except:
-            pass
-
     def test_default_jql(self, temp_db):
         """Default JQL query is generated"""
         mock_client = Mock()
@@ -9,44 +9,66 @@ import time
 from unittest.mock import Mock, patch, MagicMock
 from requests.exceptions import Timeout, ConnectionError, HTTPError
 
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from app.mcp.mcp_client import MCPClient
-from app.mcp.types import MCPResponse, Tool
+from app.mcp.types import MCPResponse, Tool, ToolCallResponse
+
+
+@pytest.fixture
+def make_mock_session():
+    """
+    Patch requests.Session and return a factory for the session mock
+
+    The factory answers every POST with one JSON-RPC envelope (``result`` or
+    ``error``), or raises ``side_effect``, and returns (session, response).
+    """
+    with patch('app.mcp.mcp_client.requests.Session') as session_class:
+        def _make(result=None, error=None, side_effect=None, status=200):
+            body = {"jsonrpc": "2.0", "id": "test-id"}
+            if error is not None:
+                body["error"] = error
+            else:
+                body["result"] = result if result is not None else {}
+
+            mock_response = Mock()
+            mock_response.status_code = status
+            mock_response.headers = {"Content-Type": "application/json"}
+            mock_response.content = json.dumps(body).encode()
+            mock_response.json.return_value = body
+            mock_response.raise_for_status = Mock()
+
+            mock_session = Mock()
+            if side_effect is not None:
+                mock_session.post.side_effect = side_effect
+            else:
+                mock_session.post.return_value = mock_response
+            session_class.return_value = mock_session
+            return mock_session, mock_response
+
+        yield _make
+
 
+def _posted_methods(mock_session):
+    """JSON-RPC method of every request POSTed through the mocked session"""
+    return [json.loads(c.kwargs["data"])["method"] for c in mock_session.post.call_args_list]
 
+
+@pytest.mark.connection
 class TestMCPClientConnection:
     """연결 관련 테스트"""
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_connect_success(self, mock_session_class):
+    def test_connect_success(self, make_mock_session):
         """연결 성공 케이스"""
-        # Mock response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "id": "test-id",
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {},
-                    "resources": {}
-                },
-                "serverInfo": {
-                    "name": "test-server",
-                    "version": "1.0.0"
-                }
+        mock_session, _ = make_mock_session(result={
+            "protocolVersion": "2024-11-05",
+            "capabilities": {
+                "tools": {},
+                "resources": {}
+            },
+            "serverInfo": {
+                "name": "test-server",
+                "version": "1.0.0"
             }
-        }
-        mock_response.raise_for_status = Mock()
-
-        # Mock session
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        })
 
         # Test
         client = MCPClient(host="localhost", port=9000, timeout=30)
@@ -55,16 +77,13 @@ class TestMCPClientConnection:
         assert result is True
         assert client.connected is True
         assert client.server_capabilities is not None
-        mock_session.post.assert_called_once()
+        # initialize 요청 1회 + 초기화 완료 알림
+        assert _posted_methods(mock_session) == ["initialize", "notifications/initialized"]
 
-    @patch('app.mcp.mcp_client.requests.Session')
     @patch('app.mcp.mcp_client.time.sleep')  # Mock sleep to speed up test
-    def test_connect_failure_with_retry(self, mock_sleep, mock_session_class):
+    def test_connect_failure_with_retry(self, mock_sleep, make_mock_session):
         """연결 실패 케이스 - 3회 재시도 후 실패"""
-        # Mock session that always fails
-        mock_session = Mock()
-        mock_session.post.side_effect = ConnectionError("Connection refused")
-        mock_session_class.return_value = mock_session
+        mock_session, _ = make_mock_session(side_effect=ConnectionError("Connection refused"))
 
         # Test
         client = MCPClient(host="localhost", port=9000, timeout=30)
@@ -79,35 +98,23 @@ class TestMCPClientConnection:
         assert mock_session.post.call_count == 3
 
         # Verify sleep was called with correct delays (1s, 2s)
-        assert mock_sleep.call_count == 2
-        mock_sleep.assert_any_call(1)
-        mock_sleep.assert_any_call(2)
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2]
 
-    @patch('app.mcp.mcp_client.requests.Session')
     @patch('app.mcp.mcp_client.time.sleep')
-    def test_connect_success_after_retry(self, mock_sleep, mock_session_class):
+    def test_connect_success_after_retry(self, mock_sleep, make_mock_session):
         """재시도 후 연결 성공 케이스"""
-        # Mock response for successful connection
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "id": "test-id",
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {}
-            }
-        }
-        mock_response.raise_for_status = Mock()
+        mock_session, mock_response = make_mock_session(result={
+            "protocolVersion": "2024-11-05",
+            "capabilities": {}
+        })
 
-        # Mock session: fail twice, then succeed
-        mock_session = Mock()
+        # Fail twice, then succeed
         mock_session.post.side_effect = [
             ConnectionError("Connection refused"),  # 1st attempt
             ConnectionError("Connection refused"),  # 2nd attempt
-            mock_response                           # 3rd attempt (success)
+            mock_response,                          # 3rd attempt (success)
+            mock_response                           # notifications/initialized
         ]
-        mock_session_class.return_value = mock_session
 
         # Test
         client = MCPClient(host="localhost", port=9000, timeout=30)
@@ -115,25 +122,13 @@ class TestMCPClientConnection:
 
         assert result is True
         assert client.connected is True
-        assert mock_session.post.call_count == 3
+        # 3 initialize attempts, then the initialized notification
+        assert _posted_methods(mock_session) == ["initialize"] * 3 + ["notifications/initialized"]
         assert mock_sleep.call_count == 2
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_disconnect(self, mock_session_class):
+    def test_disconnect(self, make_mock_session):
         """안전한 연결 종료 테스트"""
-        # Mock successful connection
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "id": "test-id",
-            "result": {}
-        }
-        mock_response.raise_for_status = Mock()
-
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        mock_session, _ = make_mock_session(result={})
 
         # Test
         client = MCPClient(host="localhost", port=9000)
@@ -150,13 +145,10 @@ class TestMCPClientConnection:
 class TestMCPClientTimeout:
     """타임아웃 관련 테스트"""
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_timeout_during_connect(self, mock_session_class):
+    @patch('app.mcp.mcp_client.time.sleep')
+    def test_timeout_during_connect(self, mock_sleep, make_mock_session):
         """연결 시 타임아웃 발생"""
-        # Mock session that times out
-        mock_session = Mock()
-        mock_session.post.side_effect = Timeout("Request timed out")
-        mock_session_class.return_value = mock_session
+        make_mock_session(side_effect=Timeout("Request timed out"))
 
         # Test
         client = MCPClient(host="localhost", port=9000, timeout=5)
@@ -166,11 +158,9 @@ class TestMCPClientTimeout:
 
         assert "Failed to connect" in str(exc_info.value)
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_timeout_configuration(self, mock_session_class):
+    def test_timeout_configuration(self, make_mock_session):
         """타임아웃 설정 검증"""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
+        make_mock_session()
 
         # Test with custom timeout
         client = MCPClient(host="localhost", port=9000, timeout=10)
@@ -184,43 +174,30 @@ class TestMCPClientTimeout:
 class TestMCPClientToolOperations:
     """Tool 호출 관련 테스트"""
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_list_tools_success(self, mock_session_class):
+    def test_list_tools_success(self, make_mock_session):
         """Tool 목록 조회 성공"""
-        # Mock response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "id": "test-id",
-            "result": {
-                "tools": [
-                    {
-                        "name": "jira_search_issues",
-                        "description": "Search Jira issues",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "jql": {
-                                    "type": "string",
-                                    "description": "JQL query"
-                                },
-                                "maxResults": {
-                                    "type": "number",
-                                    "description": "Max results"
-                                }
+        make_mock_session(result={
+            "tools": [
+                {
+                    "name": "jira_search_issues",
+                    "description": "Search Jira issues",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "jql": {
+                                "type": "string",
+                                "description": "JQL query"
                             },
-                            "required": ["jql"]
-                        }
+                            "maxResults": {
+                                "type": "number",
+                                "description": "Max results"
+                            }
+                        },
+                        "required": ["jql"]
                     }
-                ]
-            }
-        }
-        mock_response.raise_for_status = Mock()
-
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
+                }
+            ]
+        })
 
         # Test
         client = MCPClient(host="localhost", port=9000)
@@ -231,30 +208,58 @@ class TestMCPClientToolOperations:
         assert tools[0].description == "Search Jira issues"
         assert len(tools[0].parameters) == 2
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_call_tool_success(self, mock_session_class):
-        """Tool 호출 성공"""
-        # Mock response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "id": "test-id",
-            "result": {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": '{"key": "PROJ-123", "summary": "Test issue"}'
-                    }
-                ],
-                "isError": False
-            }
-        }
-        mock_response.raise_for_status = Mock()
+    def test_list_tools_cached_per_connection(self):
+        """tools/list is sent once and reused until refresh"""
+        client = MCPClient(host="localhost", port=9000)
+        response = MCPResponse(
+            jsonrpc="2.0",
+            id="test-id",
+            result={"tools": [{"name": "jira_search", "description": "Search"}]}
+        )
+
+        with patch.object(client, '_send_request', return_value=response) as send:
+            assert [t.name for t in client.list_tools()] == ["jira_search"]
+            assert [t.name for t in client.list_tools()] == ["jira_search"]
+            assert send.call_count == 1
+
+            client.list_tools(refresh=True)
+            assert send.call_count == 2
+
+    def test_list_tools_and_resources_batched(self):
+        """tools/list and resources/list go out as one batch, matched by id"""
+        client = MCPClient(host="localhost", port=9000)
+
+        def reply(batch, method, params=None):
+            tools_req, resources_req = batch
+            # Out of order on purpose: responses are matched by id
+            return [
+                {"jsonrpc": "2.0", "id": resources_req["id"], "result": {"resources": []}},
+                {"jsonrpc": "2.0", "id": tools_req["id"],
+                 "result": {"tools": [{"name": "jira_search", "description": "Search"}]}},
+            ]
 
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        with patch.object(client, '_post', side_effect=reply) as post:
+            tools, resources = client.list_tools_and_resources()
+
+            assert post.call_count == 1
+            assert [t.name for t in tools] == ["jira_search"]
+            assert resources == []
+
+            # The batched tools/list also fills the per-connection cache
+            assert [t.name for t in client.list_tools()] == ["jira_search"]
+            assert post.call_count == 1
+
+    def test_call_tool_success(self, make_mock_session):
+        """Tool 호출 성공"""
+        make_mock_session(result={
+            "content": [
+                {
+                    "type": "text",
+                    "text": '{"key": "PROJ-123", "summary": "Test issue"}'
+                }
+            ],
+            "isError": False
+        })
 
         # Test
         client = MCPClient(host="localhost", port=9000)
@@ -264,26 +269,13 @@ class TestMCPClientToolOperations:
         assert len(result.content) == 1
         assert result.content[0]["type"] == "text"
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_call_tool_error(self, mock_session_class):
+    def test_call_tool_error(self, make_mock_session):
         """Tool 호출 실패 - isError=True 반환"""
-        # Mock error response from _send_request
         # call_tool catches exceptions and returns ToolCallResponse with isError=True
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "id": "test-id",
-            "error": {
-                "code": -32602,
-                "message": "Invalid params"
-            }
-        }
-        mock_response.raise_for_status = Mock()
-
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        make_mock_session(error={
+            "code": -32602,
+            "message": "Invalid params"
+        })
 
         # Test - call_tool should catch exception and return error response
         client = MCPClient(host="localhost", port=9000)
@@ -299,22 +291,9 @@ class TestMCPClientToolOperations:
 class TestMCPClientHealthCheck:
     """Health Check 관련 테스트"""
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_health_check_healthy(self, mock_session_class):
+    def test_health_check_healthy(self, make_mock_session):
         """Health check 성공"""
-        # Mock response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "id": "test-id",
-            "result": {"tools": []}
-        }
-        mock_response.raise_for_status = Mock()
-
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        make_mock_session(result={"tools": []})
 
         # Test
         client = MCPClient(host="localhost", port=9000)
@@ -324,13 +303,9 @@ class TestMCPClientHealthCheck:
         assert health["error"] is None
         assert health["response_time_ms"] > 0
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_health_check_unhealthy(self, mock_session_class):
+    def test_health_check_unhealthy(self, make_mock_session):
         """Health check 실패"""
-        # Mock session that fails
-        mock_session = Mock()
-        mock_session.post.side_effect = ConnectionError("Connection refused")
-        mock_session_class.return_value = mock_session
+        make_mock_session(side_effect=ConnectionError("Connection refused"))
 
         # Test
         client = MCPClient(host="localhost", port=9000)
@@ -341,39 +316,18 @@ class TestMCPClientHealthCheck:
         assert "Connection refused" in health["error"]
 
 
+@pytest.mark.retry
 class TestMCPClientRetryLogic:
     """재시도 로직 검증"""
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    @patch('app.mcp.mcp_client.time.sleep')
-    def test_exponential_backoff_delays(self, mock_sleep, mock_session_class):
-        """지수 백오프 지연 시간 검증 (1초, 2초, 4초)"""
-        # Mock session that always fails
-        mock_session = Mock()
-        mock_session.post.side_effect = ConnectionError("Connection refused")
-        mock_session_class.return_value = mock_session
-
-        # Test
-        client = MCPClient(host="localhost", port=9000)
-
-        try:
-            client.connect()
-        except Exception:
-            pass
-
-        # Verify sleep was called with correct delays
-        assert mock_sleep.call_count == 2
-        sleep_calls = [call[0][0] for call in mock_sleep.call_args_list]
-        assert sleep_calls == [1, 2]  # 1초, 2초 (마지막 실패 후에는 sleep 안함)
-
-    @patch('app.mcp.mcp_client.requests.Session')
+    @pytest.mark.parametrize("error", [
+        ConnectionError("Connection refused"),
+        Timeout("Request timed out"),
+    ])
     @patch('app.mcp.mcp_client.time.sleep')
-    def test_max_retry_attempts(self, mock_sleep, mock_session_class):
-        """최대 재시도 횟수 검증 (3회)"""
-        # Mock session that always fails
-        mock_session = Mock()
-        mock_session.post.side_effect = ConnectionError("Connection refused")
-        mock_session_class.return_value = mock_session
+    def test_backoff_delays_and_max_attempts(self, mock_sleep, error, make_mock_session):
+        """지수 백오프 지연 (1초, 2초) 및 최대 재시도 횟수 (3회) 검증"""
+        mock_session, _ = make_mock_session(side_effect=error)
 
         # Test
         client = MCPClient(host="localhost", port=9000)
@@ -384,36 +338,54 @@ class TestMCPClientRetryLogic:
         # Verify exactly 3 attempts
         assert mock_session.post.call_count == 3
 
+        # 1초, 2초 (마지막 실패 후에는 sleep 안함)
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2]
+
 
 class TestMCPClientEnvironmentVariables:
     """환경변수 관련 테스트"""
 
-    @patch.dict(os.environ, {
-        'MCP_SERVER_HOST': 'test.example.com',
-        'MCP_SERVER_PORT': '8080',
-        'MCP_SERVER_PROTOCOL': 'https',
-        'MCP_BASE_PATH': '/api/mcp'
-    })
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_env_var_configuration(self, mock_session_class):
+    def test_env_var_configuration(self, monkeypatch, make_mock_session):
         """환경변수 기반 설정 검증"""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
+        monkeypatch.setenv('MCP_SERVER_HOST', 'test.example.com')
+        monkeypatch.setenv('MCP_SERVER_PORT', '8080')
+        monkeypatch.setenv('MCP_SERVER_PROTOCOL', 'https')
+        monkeypatch.setenv('MCP_BASE_PATH', '/api/mcp')
+        make_mock_session()
 
         client = MCPClient()
 
         assert client.server_url == "https://test.example.com:8080/api/mcp"
 
-    @patch('app.mcp.mcp_client.requests.Session')
-    def test_parameter_override_env_vars(self, mock_session_class):
+    def test_parameter_override_env_vars(self, monkeypatch, make_mock_session):
         """파라미터가 환경변수보다 우선"""
-        mock_session = Mock()
-        mock_session_class.return_value = mock_session
+        monkeypatch.setenv('MCP_SERVER_HOST', 'env.host')
+        monkeypatch.setenv('MCP_SERVER_PORT', '8080')
+        make_mock_session()
 
         client = MCPClient(host="custom.host", port=3000)
 
         assert "custom.host:3000" in client.server_url
 
 
+
+class TestMCPClientJiraSearch:
+    """Jira 검색 결과 파싱 테스트"""
+
+    @patch('app.mcp.mcp_client.requests.Session')
+    def test_iter_search_skips_invalid_issues(self, mock_session_class):
+        """유효하지 않은 이슈만 건너뛰고 나머지는 유지"""
+        issue = {"key": "PROJ-1", "summary": "Issue", "status": "Done"}
+        content = [
+            {"type": "text", "text": json.dumps({"issues": [issue, {"key": "BAD-1"}, dict(issue, key="PROJ-2")]})},
+            {"type": "text", "text": json.dumps(dict(issue, key="PROJ-3"))},
+        ]
+
+        client = MCPClient()
+        with patch.object(client, 'call_tool', return_value=ToolCallResponse(content=content)):
+            issues = client.search_jira_issues(jql="project = PROJ")
+
+        assert [i.key for i in issues] == ["PROJ-1", "PROJ-2", "PROJ-3"]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])